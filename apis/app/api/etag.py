@@ -0,0 +1,34 @@
+"""Conditional GET support - strong ETags and If-None-Match handling."""
+
+import hashlib
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import Request, Response
+
+# Clients may store responses but must revalidate (cheap with If-None-Match) before reuse
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: str | int | datetime | UUID | None) -> str:
+    """Strong ETag over the given version parts (e.g. id + updated_at, or count + max(updated_at))."""
+    raw = "|".join("" if p is None else p.isoformat() if isinstance(p, datetime) else str(p) for p in parts)
+    return '"' + hashlib.sha256(raw.encode()).hexdigest()[:32] + '"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison (RFC 9110 13.1.2): ignore W/ prefixes
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+def conditional(request: Request, response: Response, etag: str) -> Response | None:
+    """Set ETag/Cache-Control on `response`; return a 304 response if the client's copy is current."""
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and _matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
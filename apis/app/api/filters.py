@@ -0,0 +1,35 @@
+"""Query-parameter dependencies shared by the sync and async routers."""
+
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import HTTPException, Query
+
+from app.repositories import LoanFilters
+
+
+def loan_filters(
+    member_id: UUID | None = Query(None, description="Filter by member (e.g. books a member has out)"),
+    book_id: UUID | None = Query(None, description="Filter by book (any of its copies)"),
+    copy_id: UUID | None = Query(None, description="Filter by book copy"),
+    active_only: bool = Query(False, description="Only loans not yet returned"),
+    borrowed_from: datetime | None = Query(None, description="Borrowed at or after this time"),
+    borrowed_to: datetime | None = Query(None, description="Borrowed before this time"),
+    due_from: datetime | None = Query(None, description="Due at or after this time"),
+    due_to: datetime | None = Query(None, description="Due before this time"),
+) -> LoanFilters:
+    """Loan list filters from the query string; date ranges are half-open [from, to)."""
+    if borrowed_from is not None and borrowed_to is not None and borrowed_from > borrowed_to:
+        raise HTTPException(status_code=400, detail="borrowed_from must not be after borrowed_to")
+    if due_from is not None and due_to is not None and due_from > due_to:
+        raise HTTPException(status_code=400, detail="due_from must not be after due_to")
+    return LoanFilters(
+        member_id=member_id,
+        book_id=book_id,
+        copy_id=copy_id,
+        active_only=active_only,
+        borrowed_from=borrowed_from,
+        borrowed_to=borrowed_to,
+        due_from=due_from,
+        due_to=due_to,
+    )
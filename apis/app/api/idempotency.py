@@ -0,0 +1,169 @@
+"""Idempotency-Key support for POST routes - retries replay the first request's response.
+
+The key is claimed on a separate session and committed as pending before the route runs,
+so the route holds only its own connection: its unit of work commits first, then the
+response is stored on the key. A duplicate arriving meanwhile polls the key (up to
+IDEMPOTENCY_WAIT seconds, then 409) and replays the stored response without touching the
+loan tables. Errors below 500 are stored and replayed too; 5xx and unexpected errors
+release the claim so a retry runs again. Reusing a key for a different request is a 422.
+"""
+
+import hashlib
+import json
+import logging
+from collections.abc import AsyncGenerator, Awaitable, Callable, Generator
+from typing import TypeVar, cast
+
+from fastapi import Header, HTTPException, Request, Response
+from pydantic import BaseModel
+
+from app.db.async_session import get_async_sessionmaker
+from app.db.query_trace import budget_exempt
+from app.db.session import SessionLocal
+from app.models import IdempotencyKey
+from app.services import AsyncIdempotencyService, IdempotencyService
+from app.services.idempotency_service import KEY_IN_PROGRESS
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def idempotency_key(
+    key: str | None = Header(
+        None,
+        alias=IDEMPOTENCY_HEADER,
+        min_length=1,
+        max_length=255,
+        description="Client-chosen unique key; retries with the same key replay the first response",
+    ),
+) -> str | None:
+    return key
+
+
+def get_idempotency_service() -> Generator[IdempotencyService, None, None]:
+    db = SessionLocal()
+    try:
+        yield IdempotencyService(db)
+    finally:
+        db.close()
+
+
+async def get_async_idempotency_service() -> AsyncGenerator[AsyncIdempotencyService, None]:
+    async with get_async_sessionmaker()() as db:
+        yield AsyncIdempotencyService(db)
+
+
+def request_hash(request: Request, body: BaseModel | None = None) -> str:
+    """Fingerprint of method, path and (normalized) body."""
+    digest = hashlib.sha256(f"{request.method} {request.url.path}\n".encode())
+    if body is not None:
+        digest.update(body.model_dump_json().encode())
+    return digest.hexdigest()
+
+
+def _rejected(err: str) -> HTTPException:
+    logger.warning("Idempotent request rejected: %s", err)
+    return HTTPException(status_code=409 if err == KEY_IN_PROGRESS else 422, detail=err)
+
+
+def _replay(stored: IdempotencyKey) -> Response:
+    return Response(
+        content=stored.body,
+        # begin() only returns keys whose outcome is stored
+        status_code=cast(int, stored.status_code),
+        media_type="application/json",
+        headers={REPLAYED_HEADER: "true"},
+    )
+
+
+def _stored_error(e: HTTPException) -> str | None:
+    return json.dumps({"detail": e.detail}) if e.status_code < 500 else None
+
+
+def _response(body: str, status_code: int, response: Response) -> Response:
+    out = Response(content=body, status_code=status_code, media_type="application/json")
+    # Keep headers set during the request (e.g. the read-your-writes LSN)
+    out.raw_headers.extend(response.raw_headers)
+    return out
+
+
+def idempotent(
+    service: IdempotencyService,
+    key: str | None,
+    request: Request,
+    response: Response,
+    body: BaseModel | None,
+    run: Callable[[], M],
+    *,
+    status_code: int = 200,
+) -> M | Response:
+    """Call `run` unless `key` already has a stored outcome, which is replayed instead."""
+    if key is None:
+        return run()
+    with budget_exempt():
+        stored, err = service.begin(key, request_hash(request, body))
+    if err is not None:
+        raise _rejected(err)
+    if stored is not None:
+        return _replay(stored)
+    try:
+        result = run()
+    except HTTPException as e:
+        error = _stored_error(e)
+        with budget_exempt():
+            if error is not None:
+                service.finish(e.status_code, error)
+            else:
+                service.abandon()
+        raise
+    except BaseException:
+        with budget_exempt():
+            service.abandon()
+        raise
+    content = result.model_dump_json()
+    with budget_exempt():
+        service.finish(status_code, content)
+    return _response(content, status_code, response)
+
+
+async def async_idempotent(
+    service: AsyncIdempotencyService,
+    key: str | None,
+    request: Request,
+    response: Response,
+    body: BaseModel | None,
+    run: Callable[[], Awaitable[M]],
+    *,
+    status_code: int = 200,
+) -> M | Response:
+    """Await `run` unless `key` already has a stored outcome, which is replayed instead."""
+    if key is None:
+        return await run()
+    with budget_exempt():
+        stored, err = await service.begin(key, request_hash(request, body))
+    if err is not None:
+        raise _rejected(err)
+    if stored is not None:
+        return _replay(stored)
+    try:
+        result = await run()
+    except HTTPException as e:
+        error = _stored_error(e)
+        with budget_exempt():
+            if error is not None:
+                await service.finish(e.status_code, error)
+            else:
+                await service.abandon()
+        raise
+    except BaseException:
+        with budget_exempt():
+            await service.abandon()
+        raise
+    content = result.model_dump_json()
+    with budget_exempt():
+        await service.finish(status_code, content)
+    return _response(content, status_code, response)
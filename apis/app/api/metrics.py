@@ -0,0 +1,200 @@
+"""Prometheus metrics - request latency by route, per-request SQL usage and pool gauges.
+
+`MetricsMiddleware` times every request and records it under its route template (e.g.
+`/api/v1/books/{book_id}`, or `<unmatched>` for 404s that match no route), method and
+status, along with the number of queries it ran and the seconds spent in them. Request
+time minus database time is the time spent in Python (which includes fetching rows from
+the server-side cursors the exports stream from). `render_metrics()` writes these plus
+the connection pool gauges in the Prometheus text format for `GET /metrics`.
+
+Metrics are kept per process: with several uvicorn workers, each scrape sees one worker.
+"""
+
+import threading
+from collections.abc import Iterable, Iterator
+from itertools import accumulate
+from time import perf_counter
+from typing import Any
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.db.pool import WAIT_BUCKETS, pool_status
+from app.db.query_stats import collect_query_stats
+from app.db.session import pool_engines
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+UNMATCHED_ROUTE = "<unmatched>"
+
+# Upper bounds of the histogram buckets
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Iterable[str], values: Iterable[str]) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+
+def _histogram_lines(
+    name: str, labels: str, bounds: Iterable[float], cumulative: Iterable[int], total: float, count: int
+) -> Iterator[str]:
+    prefix = f"{labels}," if labels else ""
+    for bound, running in zip((*bounds, float("inf")), cumulative):
+        le = "+Inf" if bound == float("inf") else str(bound)
+        yield f'{name}_bucket{{{prefix}le="{le}"}} {running}'
+    braces = f"{{{labels}}}" if labels else ""
+    yield f"{name}_sum{braces} {total}"
+    yield f"{name}_count{braces} {count}"
+
+
+class Histogram:
+    """Thread-safe labelled histogram with fixed buckets."""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...], buckets: tuple[float, ...]) -> None:
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        # Per label values: observations per bucket (the last one is +Inf), and their sum
+        self._counts: dict[tuple[str, ...], list[int]] = {}
+        self._sums: dict[tuple[str, ...], float] = {}
+
+    def observe(self, values: tuple[str, ...], amount: float) -> None:
+        index = next((i for i, bound in enumerate(self.buckets) if amount <= bound), len(self.buckets))
+        with self._lock:
+            counts = self._counts.get(values)
+            if counts is None:
+                counts = self._counts[values] = [0] * (len(self.buckets) + 1)
+            counts[index] += 1
+            self._sums[values] = self._sums.get(values, 0.0) + amount
+
+    def render(self) -> Iterator[str]:
+        with self._lock:
+            snapshot = [(values, list(counts), self._sums[values]) for values, counts in self._counts.items()]
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        for values, counts, total in sorted(snapshot):
+            cumulative = list(accumulate(counts))
+            yield from _histogram_lines(
+                self.name, _labels(self.labels, values), self.buckets, cumulative, total, cumulative[-1]
+            )
+
+
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Time from request start to the last response byte.",
+    ("method", "route", "status"),
+    SECONDS_BUCKETS,
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL statements run per request.",
+    ("method", "route"),
+    QUERY_BUCKETS,
+)
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds",
+    "Time per request spent executing SQL statements.",
+    ("method", "route"),
+    SECONDS_BUCKETS,
+)
+
+
+def route_template(scope: Scope) -> str:
+    """The matched route's path template, e.g. `/api/v1/books/{book_id}`.
+
+    Rebuilt from the request path by putting each path parameter back in its placeholder:
+    routes of included routers only know their path relative to the router prefix.
+    """
+    if "route" not in scope:
+        return UNMATCHED_ROUTE
+    template: str = scope["path"]
+    position = 0
+    for name, value in scope.get("path_params", {}).items():
+        text = str(value)
+        index = template.find(text, position)
+        if index < 0:
+            continue
+        placeholder = f"{{{name}}}"
+        template = template[:index] + placeholder + template[index + len(text) :]
+        position = index + len(placeholder)
+    return template
+
+
+class MetricsMiddleware:
+    """Record latency, status and SQL usage of every HTTP request."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = perf_counter()
+        with collect_query_stats() as stats:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                elapsed = perf_counter() - start
+                route = route_template(scope)
+                method = scope["method"]
+                REQUEST_SECONDS.observe((method, route, str(status)), elapsed)
+                REQUEST_QUERIES.observe((method, route), stats.queries)
+                REQUEST_DB_SECONDS.observe((method, route), stats.seconds)
+
+
+def _pool_lines() -> Iterator[str]:
+    statuses = {name: pool_status(engine) for name, engine in pool_engines().items()}
+    yield "# HELP db_pool_connections Connections per pool by state (queue pools only)."
+    yield "# TYPE db_pool_connections gauge"
+    for name, status in statuses.items():
+        for state in ("checked_in", "checked_out", "overflow"):
+            if status.get(state) is not None:
+                yield f'db_pool_connections{{engine="{name}",state="{state}"}} {status[state]}'
+    yield "# HELP db_pool_size Configured persistent connections per pool."
+    yield "# TYPE db_pool_size gauge"
+    for name, status in statuses.items():
+        if status.get("size") is not None:
+            yield f'db_pool_size{{engine="{name}"}} {status["size"]}'
+    yield "# HELP db_pool_checkout_failures_total Checkouts that timed out waiting for a connection."
+    yield "# TYPE db_pool_checkout_failures_total counter"
+    for name, status in statuses.items():
+        yield f'db_pool_checkout_failures_total{{engine="{name}"}} {status.get("checkout_failures", 0)}'
+    yield "# HELP db_pool_checkout_wait_seconds Time spent waiting for a pooled connection."
+    yield "# TYPE db_pool_checkout_wait_seconds histogram"
+    for name, status in statuses.items():
+        buckets: list[dict[str, Any]] = status.get("wait_seconds_buckets", [])
+        if not buckets:
+            continue
+        yield from _histogram_lines(
+            "db_pool_checkout_wait_seconds",
+            f'engine="{name}"',
+            WAIT_BUCKETS,
+            [b["count"] for b in buckets],
+            status["wait_seconds_sum"],
+            buckets[-1]["count"],
+        )
+
+
+def render_metrics() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    lines = [
+        *REQUEST_SECONDS.render(),
+        *REQUEST_QUERIES.render(),
+        *REQUEST_DB_SECONDS.render(),
+        *_pool_lines(),
+    ]
+    return "\n".join(lines) + "\n"
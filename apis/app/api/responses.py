@@ -0,0 +1,39 @@
+"""Response helpers - serialize already-validated data in one pass.
+
+Routes declaring `response_model` and returning models make FastAPI validate every object
+a second time and encode it through `jsonable_encoder` + `json.dumps`. The list routes
+instead build (or receive from the cache) response models once and hand them to
+`json_response`, which serializes with pydantic-core straight to bytes. `response_model`
+stays on the route for the OpenAPI schema.
+"""
+
+from importlib.util import find_spec
+from typing import Any, TypeVar
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+if find_spec("orjson") is not None:
+    import orjson
+
+    class OrjsonResponse(JSONResponse):
+        """JSONResponse rendered by orjson (the optional "fast" extra)."""
+
+        def render(self, content: Any) -> bytes:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+    DefaultResponse: type[JSONResponse] = OrjsonResponse
+else:
+    DefaultResponse = JSONResponse
+
+T = TypeVar("T")
+
+
+def json_response(adapter: TypeAdapter[T], value: T, response: Response | None = None) -> Response:
+    """Serialize `value` with no further validation, keeping headers already set on `response`."""
+    out = Response(content=adapter.dump_json(value), media_type="application/json")
+    if response is not None:
+        # FastAPI only merges the injected Response's headers into responses it builds itself
+        out.raw_headers.extend(response.raw_headers)
+    return out
@@ -1,13 +1,29 @@
 """Route modules."""
 
+from app.api.routes.async_books import router as async_books_router
+from app.api.routes.async_loans import router as async_loans_router
+from app.api.routes.async_members import router as async_members_router
 from app.api.routes.books import router as books_router
+from app.api.routes.exports import router as exports_router
 from app.api.routes.health import router as health_router
+from app.api.routes.imports import router as imports_router
+from app.api.routes.internal import router as internal_router
 from app.api.routes.loans import router as loans_router
 from app.api.routes.members import router as members_router
+from app.api.routes.metrics import router as metrics_router
+from app.api.routes.stats import router as stats_router
 
 __all__ = [
+    "async_books_router",
+    "async_loans_router",
+    "async_members_router",
     "books_router",
+    "exports_router",
     "health_router",
+    "imports_router",
+    "internal_router",
     "loans_router",
     "members_router",
+    "metrics_router",
+    "stats_router",
 ]
@@ -0,0 +1,153 @@
+"""Book and book-copy controllers on the async DB stack - HTTP layer."""
+
+import logging
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.etag import conditional, make_etag
+from app.api.responses import json_response
+from app.api.tracing import query_budget
+from app.db.async_session import get_async_db
+from app.repositories import MAX_PAGE_SIZE, InvalidCursorError
+from app.schemas.book import BookCreate, BookResponse, BookSearchResult, BookUpdate
+from app.schemas.book_copy import BookCopyCreate, BookCopyResponse
+from app.services import AsyncBookService
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/books", tags=["books"])
+
+BOOK_LIST = TypeAdapter(list[BookResponse])
+BOOK_COPY_LIST = TypeAdapter(list[BookCopyResponse])
+
+
+async def get_async_book_service(db: AsyncSession = Depends(get_async_db)) -> AsyncBookService:
+    return AsyncBookService(db)
+
+
+@router.post("", response_model=BookResponse, status_code=201, dependencies=[Depends(query_budget(2))])
+async def create_book(
+    body: BookCreate,
+    service: AsyncBookService = Depends(get_async_book_service),
+) -> BookResponse:
+    """Create a new book (catalog entry)."""
+    book = await service.create_book(
+        title=body.title,
+        author=body.author,
+        description=body.description,
+        isbn=body.isbn,
+    )
+    return BookResponse.model_validate(book)
+
+
+@router.get("", response_model=list[BookResponse], dependencies=[Depends(query_budget(2))])
+async def list_books(
+    request: Request,
+    response: Response,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; omit to list all books"),
+    cursor: str | None = Query(None, description="X-Next-Cursor value from the previous page"),
+    available_only: bool = Query(False, description="Only books with at least one copy not on loan"),
+    service: AsyncBookService = Depends(get_async_book_service),
+) -> Response:
+    """List books by title, with copies_total/copies_available. With `limit`, the next page's cursor is returned in X-Next-Cursor."""
+    version = await service.books_version()
+    not_modified = conditional(request, response, make_etag("books", limit, cursor, available_only, version))
+    if not_modified is not None:
+        return not_modified
+    try:
+        books, next_cursor = await service.list_books(limit=limit, cursor=cursor, available_only=available_only)
+    except InvalidCursorError:
+        logger.warning("List books failed: invalid cursor")
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return json_response(BOOK_LIST, BOOK_LIST.validate_python(books, from_attributes=True), response)
+
+
+@router.get("/search", response_model=list[BookSearchResult], dependencies=[Depends(query_budget(2))])
+async def search_books(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200, description="Words from title, author or description"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="X-Next-Cursor value from the previous page"),
+    service: AsyncBookService = Depends(get_async_book_service),
+) -> list[BookSearchResult]:
+    """Ranked full-text catalog search, falling back to fuzzy (trigram) matching when nothing matches."""
+    try:
+        hits, next_cursor = await service.search_books(q, limit=limit, cursor=cursor)
+    except InvalidCursorError:
+        logger.warning("Search books failed: invalid cursor")
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return [BookSearchResult(**BookResponse.model_validate(b).model_dump(), score=score) for b, score in hits]
+
+
+@router.get("/{book_id}", response_model=BookResponse, dependencies=[Depends(query_budget(1))])
+async def get_book(
+    request: Request,
+    response: Response,
+    book_id: UUID,
+    service: AsyncBookService = Depends(get_async_book_service),
+) -> BookResponse | Response:
+    """Get a book by ID."""
+    book = await service.get_book(book_id)
+    if book is None:
+        logger.warning("Get book failed: book_id=%s not found", book_id)
+        raise HTTPException(status_code=404, detail="Book not found")
+    not_modified = conditional(request, response, make_etag(book.id, book.updated_at))
+    if not_modified is not None:
+        return not_modified
+    return BookResponse.model_validate(book)
+
+
+@router.put("/{book_id}", response_model=BookResponse, dependencies=[Depends(query_budget(3))])
+async def update_book(
+    book_id: UUID,
+    body: BookUpdate,
+    service: AsyncBookService = Depends(get_async_book_service),
+) -> BookResponse:
+    """Update a book (partial)."""
+    book = await service.update_book(
+        book_id,
+        title=body.title,
+        author=body.author,
+        description=body.description,
+        isbn=body.isbn,
+    )
+    if book is None:
+        logger.warning("Update book failed: book_id=%s not found", book_id)
+        raise HTTPException(status_code=404, detail="Book not found")
+    return BookResponse.model_validate(book)
+
+
+# --- Book copies (under /books/{book_id}/copies) ---
+
+
+@router.post(
+    "/{book_id}/copies", response_model=BookCopyResponse, status_code=201,
+    dependencies=[Depends(query_budget(3))],
+)
+async def create_book_copy(
+    book_id: UUID,
+    body: BookCopyCreate,
+    service: AsyncBookService = Depends(get_async_book_service),
+) -> BookCopyResponse:
+    """Add a physical copy of a book."""
+    copy = await service.create_copy(book_id, copy_code=body.copy_code)
+    if copy is None:
+        logger.warning("Create copy failed: book_id=%s not found", book_id)
+        raise HTTPException(status_code=404, detail="Book not found")
+    return BookCopyResponse.model_validate(copy)
+
+
+@router.get("/{book_id}/copies", response_model=list[BookCopyResponse], dependencies=[Depends(query_budget(1))])
+async def list_book_copies(
+    book_id: UUID,
+    service: AsyncBookService = Depends(get_async_book_service),
+) -> Response:
+    """List all copies of a book."""
+    copies = await service.list_copies_for_book(book_id)
+    return json_response(BOOK_COPY_LIST, BOOK_COPY_LIST.validate_python(copies, from_attributes=True))
@@ -0,0 +1,240 @@
+"""Loan controllers on the async DB stack - borrow/return and list."""
+
+import logging
+from dataclasses import astuple
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.etag import conditional, make_etag
+from app.api.filters import loan_filters
+from app.api.idempotency import async_idempotent, get_async_idempotency_service, idempotency_key
+from app.api.responses import json_response
+from app.api.tracing import query_budget
+from app.db.async_session import get_async_db
+from app.repositories import MAX_PAGE_SIZE, InvalidCursorError, LoanFilters
+from app.schemas.loan import (
+    LoanBatchCreate,
+    LoanBatchResponse,
+    LoanBatchReturn,
+    LoanCreate,
+    LoanCreateByBook,
+    LoanResponse,
+    LoanWithDetailsResponse,
+)
+from app.services import AsyncIdempotencyService, AsyncLoanService
+from app.services.loan_service import BORROW_BY_BOOK_STATEMENTS
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/loans", tags=["loans"])
+
+LOAN_DETAILS_LIST = TypeAdapter(list[LoanWithDetailsResponse])
+
+
+async def get_async_loan_service(db: AsyncSession = Depends(get_async_db)) -> AsyncLoanService:
+    return AsyncLoanService(db)
+
+
+@router.post("", response_model=LoanResponse, status_code=201, dependencies=[Depends(query_budget(4))])
+async def borrow_book(
+    request: Request,
+    response: Response,
+    body: LoanCreate,
+    key: str | None = Depends(idempotency_key),
+    idempotency: AsyncIdempotencyService = Depends(get_async_idempotency_service),
+    service: AsyncLoanService = Depends(get_async_loan_service),
+) -> LoanResponse | Response:
+    """Record that a member is borrowing a book copy."""
+
+    async def run() -> LoanResponse:
+        loan, err = await service.borrow(
+            member_id=body.member_id,
+            copy_id=body.copy_id,
+            due_at=body.due_at,
+        )
+        if err is not None:
+            if "not found" in err.lower():
+                logger.warning("Borrow failed (not found): %s", err)
+                raise HTTPException(status_code=404, detail=err)
+            logger.warning("Borrow failed: %s", err)
+            raise HTTPException(status_code=400, detail=err)
+        return LoanResponse.model_validate(loan)
+
+    return await async_idempotent(idempotency, key, request, response, body, run, status_code=201)
+
+
+@router.post(
+    "/by-book",
+    response_model=LoanResponse,
+    status_code=201,
+    dependencies=[Depends(query_budget(BORROW_BY_BOOK_STATEMENTS))],
+)
+async def borrow_book_by_book(
+    request: Request,
+    response: Response,
+    body: LoanCreateByBook,
+    key: str | None = Depends(idempotency_key),
+    idempotency: AsyncIdempotencyService = Depends(get_async_idempotency_service),
+    service: AsyncLoanService = Depends(get_async_loan_service),
+) -> LoanResponse | Response:
+    """Borrow any available copy of a book. A copy is assigned automatically."""
+
+    async def run() -> LoanResponse:
+        loan, err = await service.borrow_by_book(
+            member_id=body.member_id,
+            book_id=body.book_id,
+            due_at=body.due_at,
+        )
+        if err is not None:
+            if "not found" in err.lower():
+                logger.warning("Borrow by book failed (not found): %s", err)
+                raise HTTPException(status_code=404, detail=err)
+            logger.warning("Borrow by book failed: %s", err)
+            raise HTTPException(status_code=400, detail=err)
+        return LoanResponse.model_validate(loan)
+
+    return await async_idempotent(idempotency, key, request, response, body, run, status_code=201)
+
+
+@router.post("/batch", response_model=LoanBatchResponse, dependencies=[Depends(query_budget(5))])
+async def borrow_batch(
+    request: Request,
+    response: Response,
+    body: LoanBatchCreate,
+    key: str | None = Depends(idempotency_key),
+    idempotency: AsyncIdempotencyService = Depends(get_async_idempotency_service),
+    service: AsyncLoanService = Depends(get_async_loan_service),
+) -> LoanBatchResponse | Response:
+    """Borrow several copies for one member in one transaction; reports each copy as ok, conflict or not_found."""
+
+    async def run() -> LoanBatchResponse:
+        result, err = await service.borrow_many(
+            member_id=body.member_id,
+            copy_ids=body.copy_ids,
+            due_at=body.due_at,
+        )
+        if result is None:
+            if err is not None and "not found" in err.lower():
+                logger.warning("Batch borrow failed (not found): %s", err)
+                raise HTTPException(status_code=404, detail=err)
+            logger.warning("Batch borrow failed: %s", err)
+            raise HTTPException(status_code=400, detail=err)
+        return result
+
+    return await async_idempotent(idempotency, key, request, response, body, run)
+
+
+@router.post("/batch-return", response_model=LoanBatchResponse, dependencies=[Depends(query_budget(4))])
+async def return_batch(
+    request: Request,
+    response: Response,
+    body: LoanBatchReturn,
+    key: str | None = Depends(idempotency_key),
+    idempotency: AsyncIdempotencyService = Depends(get_async_idempotency_service),
+    service: AsyncLoanService = Depends(get_async_loan_service),
+) -> LoanBatchResponse | Response:
+    """Return several loans in one transaction; reports each loan as ok, conflict or not_found."""
+
+    async def run() -> LoanBatchResponse:
+        result, err = await service.return_many(body.loan_ids)
+        if result is None:
+            logger.warning("Batch return failed: %s", err)
+            raise HTTPException(status_code=400, detail=err)
+        return result
+
+    return await async_idempotent(idempotency, key, request, response, body, run)
+
+
+@router.post("/{loan_id}/return", response_model=LoanResponse, dependencies=[Depends(query_budget(4))])
+async def return_book(
+    request: Request,
+    response: Response,
+    loan_id: UUID,
+    key: str | None = Depends(idempotency_key),
+    idempotency: AsyncIdempotencyService = Depends(get_async_idempotency_service),
+    service: AsyncLoanService = Depends(get_async_loan_service),
+) -> LoanResponse | Response:
+    """Record that a borrowed book has been returned."""
+
+    async def run() -> LoanResponse:
+        loan, err = await service.return_loan(loan_id)
+        if err is not None:
+            if "not found" in err.lower():
+                logger.warning("Return failed (not found): %s", err)
+                raise HTTPException(status_code=404, detail=err)
+            logger.warning("Return failed: %s", err)
+            raise HTTPException(status_code=400, detail=err)
+        return LoanResponse.model_validate(loan)
+
+    return await async_idempotent(idempotency, key, request, response, None, run)
+
+
+@router.get("", response_model=list[LoanWithDetailsResponse], dependencies=[Depends(query_budget(2))])
+async def list_loans(
+    request: Request,
+    response: Response,
+    filters: LoanFilters = Depends(loan_filters),
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; omit to list all loans"),
+    cursor: str | None = Query(None, description="X-Next-Cursor value from the previous page"),
+    service: AsyncLoanService = Depends(get_async_loan_service),
+) -> Response:
+    """List loans, newest first; filter by member, book, copy, active only and borrowed/due date ranges.
+
+    With `limit`, the next page's cursor is returned in X-Next-Cursor.
+    """
+    version = await service.loans_version()
+    not_modified = conditional(request, response, make_etag("loans", *astuple(filters), limit, cursor, version))
+    if not_modified is not None:
+        return not_modified
+    try:
+        rows, next_cursor = await service.list_loans(filters, limit=limit, cursor=cursor)
+    except InvalidCursorError:
+        logger.warning("List loans failed: invalid cursor")
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    # Rows are projected to exactly the response fields from typed columns: construct without re-validating
+    result = [LoanWithDetailsResponse.model_construct(**row) for row in rows]
+    return json_response(LOAN_DETAILS_LIST, result, response)
+
+
+@router.get("/overdue", response_model=list[LoanWithDetailsResponse], dependencies=[Depends(query_budget(1))])
+async def list_overdue_loans(
+    response: Response,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    cursor: str | None = Query(None, description="X-Next-Cursor value from the previous page"),
+    service: AsyncLoanService = Depends(get_async_loan_service),
+) -> Response:
+    """List loans past their due date and not returned, longest overdue first.
+
+    The next page's cursor is returned in X-Next-Cursor.
+    """
+    try:
+        rows, next_cursor = await service.list_overdue(limit=limit, cursor=cursor)
+    except InvalidCursorError:
+        logger.warning("List overdue loans failed: invalid cursor")
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    result = [LoanWithDetailsResponse.model_construct(**row) for row in rows]
+    return json_response(LOAN_DETAILS_LIST, result, response)
+
+
+@router.get("/{loan_id}", response_model=LoanResponse, dependencies=[Depends(query_budget(1))])
+async def get_loan(
+    request: Request,
+    response: Response,
+    loan_id: UUID,
+    service: AsyncLoanService = Depends(get_async_loan_service),
+) -> LoanResponse | Response:
+    """Get a loan by ID."""
+    loan = await service.get_loan(loan_id)
+    if loan is None:
+        logger.warning("Get loan failed: loan_id=%s not found", loan_id)
+        raise HTTPException(status_code=404, detail="Loan not found")
+    not_modified = conditional(request, response, make_etag(loan.id, loan.updated_at))
+    if not_modified is not None:
+        return not_modified
+    return LoanResponse.model_validate(loan)
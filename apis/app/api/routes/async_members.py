@@ -0,0 +1,113 @@
+"""Member controllers on the async DB stack - HTTP layer."""
+
+import logging
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.etag import conditional, make_etag
+from app.api.responses import json_response
+from app.api.tracing import query_budget
+from app.db.async_session import get_async_db
+from app.repositories import MAX_PAGE_SIZE, InvalidCursorError
+from app.schemas.member import MAX_SUMMARY_LOANS, MemberCreate, MemberResponse, MemberSummaryResponse, MemberUpdate
+from app.services import AsyncMemberService
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/members", tags=["members"])
+
+MEMBER_LIST = TypeAdapter(list[MemberResponse])
+
+
+async def get_async_member_service(db: AsyncSession = Depends(get_async_db)) -> AsyncMemberService:
+    return AsyncMemberService(db)
+
+
+@router.post("", response_model=MemberResponse, status_code=201, dependencies=[Depends(query_budget(1))])
+async def create_member(
+    body: MemberCreate,
+    service: AsyncMemberService = Depends(get_async_member_service),
+) -> MemberResponse:
+    """Create a new member."""
+    member = await service.create_member(
+        name=body.name,
+        email=body.email,
+        phone=body.phone,
+    )
+    return MemberResponse.model_validate(member)
+
+
+@router.get("", response_model=list[MemberResponse], dependencies=[Depends(query_budget(2))])
+async def list_members(
+    request: Request,
+    response: Response,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; omit to list all members"),
+    cursor: str | None = Query(None, description="X-Next-Cursor value from the previous page"),
+    service: AsyncMemberService = Depends(get_async_member_service),
+) -> Response:
+    """List members by name. With `limit`, the next page's cursor is returned in X-Next-Cursor."""
+    version = await service.members_version()
+    not_modified = conditional(request, response, make_etag("members", limit, cursor, version))
+    if not_modified is not None:
+        return not_modified
+    try:
+        members, next_cursor = await service.list_members(limit=limit, cursor=cursor)
+    except InvalidCursorError:
+        logger.warning("List members failed: invalid cursor")
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return json_response(MEMBER_LIST, MEMBER_LIST.validate_python(members, from_attributes=True), response)
+
+
+@router.get("/{member_id}", response_model=MemberResponse, dependencies=[Depends(query_budget(1))])
+async def get_member(
+    request: Request,
+    response: Response,
+    member_id: UUID,
+    service: AsyncMemberService = Depends(get_async_member_service),
+) -> MemberResponse | Response:
+    """Get a member by ID."""
+    member = await service.get_member(member_id)
+    if member is None:
+        logger.warning("Get member failed: member_id=%s not found", member_id)
+        raise HTTPException(status_code=404, detail="Member not found")
+    not_modified = conditional(request, response, make_etag(member.id, member.updated_at))
+    if not_modified is not None:
+        return not_modified
+    return MemberResponse.model_validate(member)
+
+
+@router.get("/{member_id}/summary", response_model=MemberSummaryResponse, dependencies=[Depends(query_budget(1))])
+async def get_member_summary(
+    member_id: UUID,
+    recent: int = Query(5, ge=0, le=MAX_SUMMARY_LOANS, description="How many of the newest active loans to include"),
+    service: AsyncMemberService = Depends(get_async_member_service),
+) -> MemberSummaryResponse:
+    """Active, overdue and lifetime loan counts, next due date and the newest active loans of a member."""
+    summary = await service.get_summary(member_id, recent=recent)
+    if summary is None:
+        logger.warning("Get member summary failed: member_id=%s not found", member_id)
+        raise HTTPException(status_code=404, detail="Member not found")
+    return summary
+
+
+@router.put("/{member_id}", response_model=MemberResponse, dependencies=[Depends(query_budget(2))])
+async def update_member(
+    member_id: UUID,
+    body: MemberUpdate,
+    service: AsyncMemberService = Depends(get_async_member_service),
+) -> MemberResponse:
+    """Update a member (partial)."""
+    member = await service.update_member(
+        member_id,
+        name=body.name,
+        email=body.email,
+        phone=body.phone,
+    )
+    if member is None:
+        logger.warning("Update member failed: member_id=%s not found", member_id)
+        raise HTTPException(status_code=404, detail="Member not found")
+    return MemberResponse.model_validate(member)
@@ -0,0 +1,75 @@
+"""Export controllers - stream whole tables as NDJSON or CSV."""
+
+import logging
+from collections.abc import Callable, Iterator
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.api.tracing import query_budget
+from app.db.session import SessionLocal
+from app.schemas.export import ExportFormat
+from app.services import ExportService
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/exports", tags=["exports"])
+
+SINCE = Query(None, description="Inclusive lower bound (ISO 8601)")
+UNTIL = Query(None, description="Exclusive upper bound (ISO 8601)")
+
+
+def _check_range(since: datetime | None, until: datetime | None) -> None:
+    # Checked before streaming starts: once the body is running the status is already sent
+    if since is not None and until is not None and since > until:
+        logger.warning("Export failed: since=%s after until=%s", since, until)
+        raise HTTPException(status_code=400, detail="since must not be after until")
+
+
+def _stream(name: str, fmt: ExportFormat, produce: Callable[[ExportService], Iterator[str]]) -> StreamingResponse:
+    def body() -> Iterator[str]:
+        # The session is owned by the body, not get_db: it must stay open until the last row is sent.
+        db = SessionLocal()
+        try:
+            yield from produce(ExportService(db))
+        finally:
+            db.close()
+
+    return StreamingResponse(
+        body(),
+        media_type=fmt.media_type,
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt.value}"'},
+    )
+
+
+@router.get("/loans.{fmt}", response_class=StreamingResponse, dependencies=[Depends(query_budget(1))])
+def export_loans(
+    fmt: ExportFormat,
+    since: datetime | None = SINCE,
+    until: datetime | None = UNTIL,
+) -> StreamingResponse:
+    """Export loans with member and book details, filtered on borrowed_at."""
+    _check_range(since, until)
+    return _stream("loans", fmt, lambda s: s.export_loans(fmt, since=since, until=until))
+
+
+@router.get("/books.{fmt}", response_class=StreamingResponse, dependencies=[Depends(query_budget(1))])
+def export_books(
+    fmt: ExportFormat,
+    since: datetime | None = SINCE,
+    until: datetime | None = UNTIL,
+) -> StreamingResponse:
+    """Export the book catalog, filtered on created_at."""
+    _check_range(since, until)
+    return _stream("books", fmt, lambda s: s.export_books(fmt, since=since, until=until))
+
+
+@router.get("/members.{fmt}", response_class=StreamingResponse, dependencies=[Depends(query_budget(1))])
+def export_members(
+    fmt: ExportFormat,
+    since: datetime | None = SINCE,
+    until: datetime | None = UNTIL,
+) -> StreamingResponse:
+    """Export members, filtered on created_at."""
+    _check_range(since, until)
+    return _stream("members", fmt, lambda s: s.export_members(fmt, since=since, until=until))
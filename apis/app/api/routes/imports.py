@@ -0,0 +1,83 @@
+"""Import controllers - bulk upsert books, members and copies from JSON, NDJSON or CSV."""
+
+import logging
+from collections.abc import Callable
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db
+from app.schemas.imports import ImportFormat, ImportResponse
+from app.services import ImportService
+from app.services.catalog_cache import catalog_cache
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/imports", tags=["imports"])
+
+BODY_DOC = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {"schema": {"type": "array", "items": {"type": "object"}}},
+            "application/x-ndjson": {"schema": {"type": "string"}},
+            "text/csv": {"schema": {"type": "string"}},
+        },
+    }
+}
+
+
+def get_import_service(db: Session = Depends(get_db)) -> ImportService:
+    return ImportService(db, cache=catalog_cache)
+
+
+async def read_body(request: Request) -> bytes:
+    return await request.body()
+
+
+def _run(
+    name: str,
+    content_type: str | None,
+    body: bytes,
+    load: Callable[[ImportFormat, bytes], tuple[ImportResponse | None, str | None]],
+) -> ImportResponse:
+    fmt = ImportFormat.from_content_type(content_type)
+    if fmt is None:
+        logger.warning("Import %s failed: unsupported content type %s", name, content_type)
+        raise HTTPException(
+            status_code=415, detail="Send application/json (array), application/x-ndjson or text/csv"
+        )
+    result, err = load(fmt, body)
+    if result is None:
+        logger.warning("Import %s failed: %s", name, err)
+        raise HTTPException(status_code=400, detail=err)
+    return result
+
+
+@router.post("/books", response_model=ImportResponse, openapi_extra=BODY_DOC)
+def import_books(
+    content_type: str | None = Header(None),
+    body: bytes = Depends(read_body),
+    service: ImportService = Depends(get_import_service),
+) -> ImportResponse:
+    """Upsert books on isbn. Fields as for POST /books; returns an outcome per row."""
+    return _run("books", content_type, body, service.import_books)
+
+
+@router.post("/members", response_model=ImportResponse, openapi_extra=BODY_DOC)
+def import_members(
+    content_type: str | None = Header(None),
+    body: bytes = Depends(read_body),
+    service: ImportService = Depends(get_import_service),
+) -> ImportResponse:
+    """Upsert members on email. Fields as for POST /members; returns an outcome per row."""
+    return _run("members", content_type, body, service.import_members)
+
+
+@router.post("/copies", response_model=ImportResponse, openapi_extra=BODY_DOC)
+def import_copies(
+    content_type: str | None = Header(None),
+    body: bytes = Depends(read_body),
+    service: ImportService = Depends(get_import_service),
+) -> ImportResponse:
+    """Upsert copies on copy_code (fields: copy_code, and book_id or isbn); returns an outcome per row."""
+    return _run("copies", content_type, body, service.import_copies)
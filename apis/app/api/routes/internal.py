@@ -0,0 +1,25 @@
+"""Internal operational routes - not meant for public clients."""
+
+from fastapi import APIRouter
+
+from app.db.pool import pool_status
+from app.db.session import pool_engines
+from app.schemas.cache import CacheStatsResponse
+from app.schemas.pool import PoolStats, PoolStatsResponse
+from app.services.catalog_cache import catalog_cache
+
+router = APIRouter(prefix="/internal", tags=["internal"])
+
+
+@router.get("/pool", response_model=PoolStatsResponse)
+def get_pool_stats() -> PoolStatsResponse:
+    """Connection pool gauges, checkout wait-time histogram and checkout failures."""
+    return PoolStatsResponse(
+        engines={name: PoolStats.model_validate(pool_status(e)) for name, e in pool_engines().items()}
+    )
+
+
+@router.get("/cache", response_model=CacheStatsResponse)
+def get_cache_stats() -> CacheStatsResponse:
+    """Catalog cache size and hit/miss/eviction/invalidation counters for this worker."""
+    return CacheStatsResponse.model_validate(catalog_cache.stats())
@@ -1,115 +1,241 @@
 """Loan controllers - borrow/return and list."""
 
 import logging
+from dataclasses import astuple
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
+from app.api.etag import conditional, make_etag
+from app.api.filters import loan_filters
+from app.api.idempotency import idempotent, get_idempotency_service, idempotency_key
+from app.api.responses import json_response
+from app.api.tracing import query_budget
 from app.db.session import get_db
-from app.schemas.loan import LoanCreate, LoanCreateByBook, LoanResponse, LoanWithDetailsResponse
-from app.services import LoanService
+from app.repositories import MAX_PAGE_SIZE, InvalidCursorError, LoanFilters
+from app.schemas.loan import (
+    LoanBatchCreate,
+    LoanBatchResponse,
+    LoanBatchReturn,
+    LoanCreate,
+    LoanCreateByBook,
+    LoanResponse,
+    LoanWithDetailsResponse,
+)
+from app.services import IdempotencyService, LoanService
+from app.services.catalog_cache import catalog_cache
+from app.services.loan_service import BORROW_BY_BOOK_STATEMENTS
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/loans", tags=["loans"])
 
+LOAN_DETAILS_LIST = TypeAdapter(list[LoanWithDetailsResponse])
+
 
 def get_loan_service(db: Session = Depends(get_db)) -> LoanService:
-    return LoanService(db)
+    return LoanService(db, cache=catalog_cache)
 
 
-@router.post("", response_model=LoanResponse, status_code=201)
+@router.post("", response_model=LoanResponse, status_code=201, dependencies=[Depends(query_budget(4))])
 def borrow_book(
+    request: Request,
+    response: Response,
     body: LoanCreate,
+    key: str | None = Depends(idempotency_key),
+    idempotency: IdempotencyService = Depends(get_idempotency_service),
     service: LoanService = Depends(get_loan_service),
-) -> LoanResponse:
+) -> LoanResponse | Response:
     """Record that a member is borrowing a book copy."""
-    loan, err = service.borrow(
-        member_id=body.member_id,
-        copy_id=body.copy_id,
-        due_at=body.due_at,
-    )
-    if err is not None:
-        if "not found" in err.lower():
-            logger.warning("Borrow failed (not found): %s", err)
-            raise HTTPException(status_code=404, detail=err)
-        logger.warning("Borrow failed: %s", err)
-        raise HTTPException(status_code=400, detail=err)
-    return LoanResponse.model_validate(loan)
-
 
-@router.post("/by-book", response_model=LoanResponse, status_code=201)
+    def run() -> LoanResponse:
+        loan, err = service.borrow(
+            member_id=body.member_id,
+            copy_id=body.copy_id,
+            due_at=body.due_at,
+        )
+        if err is not None:
+            if "not found" in err.lower():
+                logger.warning("Borrow failed (not found): %s", err)
+                raise HTTPException(status_code=404, detail=err)
+            logger.warning("Borrow failed: %s", err)
+            raise HTTPException(status_code=400, detail=err)
+        return LoanResponse.model_validate(loan)
+
+    return idempotent(idempotency, key, request, response, body, run, status_code=201)
+
+
+@router.post(
+    "/by-book",
+    response_model=LoanResponse,
+    status_code=201,
+    dependencies=[Depends(query_budget(BORROW_BY_BOOK_STATEMENTS))],
+)
 def borrow_book_by_book(
+    request: Request,
+    response: Response,
     body: LoanCreateByBook,
+    key: str | None = Depends(idempotency_key),
+    idempotency: IdempotencyService = Depends(get_idempotency_service),
     service: LoanService = Depends(get_loan_service),
-) -> LoanResponse:
+) -> LoanResponse | Response:
     """Borrow any available copy of a book. A copy is assigned automatically."""
-    loan, err = service.borrow_by_book(
-        member_id=body.member_id,
-        book_id=body.book_id,
-        due_at=body.due_at,
-    )
-    if err is not None:
-        if "not found" in err.lower():
-            logger.warning("Borrow by book failed (not found): %s", err)
-            raise HTTPException(status_code=404, detail=err)
-        logger.warning("Borrow by book failed: %s", err)
-        raise HTTPException(status_code=400, detail=err)
-    return LoanResponse.model_validate(loan)
 
+    def run() -> LoanResponse:
+        loan, err = service.borrow_by_book(
+            member_id=body.member_id,
+            book_id=body.book_id,
+            due_at=body.due_at,
+        )
+        if err is not None:
+            if "not found" in err.lower():
+                logger.warning("Borrow by book failed (not found): %s", err)
+                raise HTTPException(status_code=404, detail=err)
+            logger.warning("Borrow by book failed: %s", err)
+            raise HTTPException(status_code=400, detail=err)
+        return LoanResponse.model_validate(loan)
+
+    return idempotent(idempotency, key, request, response, body, run, status_code=201)
+
+
+@router.post("/batch", response_model=LoanBatchResponse, dependencies=[Depends(query_budget(5))])
+def borrow_batch(
+    request: Request,
+    response: Response,
+    body: LoanBatchCreate,
+    key: str | None = Depends(idempotency_key),
+    idempotency: IdempotencyService = Depends(get_idempotency_service),
+    service: LoanService = Depends(get_loan_service),
+) -> LoanBatchResponse | Response:
+    """Borrow several copies for one member in one transaction; reports each copy as ok, conflict or not_found."""
+
+    def run() -> LoanBatchResponse:
+        result, err = service.borrow_many(
+            member_id=body.member_id,
+            copy_ids=body.copy_ids,
+            due_at=body.due_at,
+        )
+        if result is None:
+            if err is not None and "not found" in err.lower():
+                logger.warning("Batch borrow failed (not found): %s", err)
+                raise HTTPException(status_code=404, detail=err)
+            logger.warning("Batch borrow failed: %s", err)
+            raise HTTPException(status_code=400, detail=err)
+        return result
+
+    return idempotent(idempotency, key, request, response, body, run)
+
+
+@router.post("/batch-return", response_model=LoanBatchResponse, dependencies=[Depends(query_budget(4))])
+def return_batch(
+    request: Request,
+    response: Response,
+    body: LoanBatchReturn,
+    key: str | None = Depends(idempotency_key),
+    idempotency: IdempotencyService = Depends(get_idempotency_service),
+    service: LoanService = Depends(get_loan_service),
+) -> LoanBatchResponse | Response:
+    """Return several loans in one transaction; reports each loan as ok, conflict or not_found."""
+
+    def run() -> LoanBatchResponse:
+        result, err = service.return_many(body.loan_ids)
+        if result is None:
+            logger.warning("Batch return failed: %s", err)
+            raise HTTPException(status_code=400, detail=err)
+        return result
 
-@router.post("/{loan_id}/return", response_model=LoanResponse)
+    return idempotent(idempotency, key, request, response, body, run)
+
+
+@router.post("/{loan_id}/return", response_model=LoanResponse, dependencies=[Depends(query_budget(4))])
 def return_book(
+    request: Request,
+    response: Response,
     loan_id: UUID,
+    key: str | None = Depends(idempotency_key),
+    idempotency: IdempotencyService = Depends(get_idempotency_service),
     service: LoanService = Depends(get_loan_service),
-) -> LoanResponse:
+) -> LoanResponse | Response:
     """Record that a borrowed book has been returned."""
-    loan, err = service.return_loan(loan_id)
-    if err is not None:
-        if "not found" in err.lower():
-            logger.warning("Return failed (not found): %s", err)
-            raise HTTPException(status_code=404, detail=err)
-        logger.warning("Return failed: %s", err)
-        raise HTTPException(status_code=400, detail=err)
-    return LoanResponse.model_validate(loan)
 
+    def run() -> LoanResponse:
+        loan, err = service.return_loan(loan_id)
+        if err is not None:
+            if "not found" in err.lower():
+                logger.warning("Return failed (not found): %s", err)
+                raise HTTPException(status_code=404, detail=err)
+            logger.warning("Return failed: %s", err)
+            raise HTTPException(status_code=400, detail=err)
+        return LoanResponse.model_validate(loan)
 
-@router.get("", response_model=list[LoanWithDetailsResponse])
-def list_loans(
-    member_id: UUID | None = Query(None, description="Filter by member (e.g. books a member has out)"),
-    active_only: bool = Query(False, description="Only loans not yet returned"),
-    service: LoanService = Depends(get_loan_service),
-) -> list[LoanWithDetailsResponse]:
-    """List loans; optionally filter by member and/or active only."""
-    loans = service.list_loans(member_id=member_id, active_only=active_only)
-    result: list[LoanWithDetailsResponse] = []
-    for loan in loans:
-        result.append(
-            LoanWithDetailsResponse(
-                id=loan.id,
-                member_id=loan.member_id,
-                member_name=loan.member.name,
-                copy_id=loan.copy_id,
-                copy_code=loan.copy.copy_code,
-                book_id=loan.copy.book_id,
-                book_title=loan.copy.book.title,
-                book_author=loan.copy.book.author,
-                borrowed_at=loan.borrowed_at,
-                due_at=loan.due_at,
-                returned_at=loan.returned_at,
-            )
-        )
-    return result
+    return idempotent(idempotency, key, request, response, None, run)
 
 
-@router.get("/{loan_id}", response_model=LoanResponse)
+@router.get("", response_model=list[LoanWithDetailsResponse], dependencies=[Depends(query_budget(2))])
+def list_loans(
+    request: Request,
+    response: Response,
+    filters: LoanFilters = Depends(loan_filters),
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; omit to list all loans"),
+    cursor: str | None = Query(None, description="X-Next-Cursor value from the previous page"),
+    service: LoanService = Depends(get_loan_service),
+) -> Response:
+    """List loans, newest first; filter by member, book, copy, active only and borrowed/due date ranges.
+
+    With `limit`, the next page's cursor is returned in X-Next-Cursor.
+    """
+    version = service.loans_version()
+    not_modified = conditional(request, response, make_etag("loans", *astuple(filters), limit, cursor, version))
+    if not_modified is not None:
+        return not_modified
+    try:
+        rows, next_cursor = service.list_loans(filters, limit=limit, cursor=cursor)
+    except InvalidCursorError:
+        logger.warning("List loans failed: invalid cursor")
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    # Rows are projected to exactly the response fields from typed columns: construct without re-validating
+    result = [LoanWithDetailsResponse.model_construct(**row) for row in rows]
+    return json_response(LOAN_DETAILS_LIST, result, response)
+
+
+@router.get("/overdue", response_model=list[LoanWithDetailsResponse], dependencies=[Depends(query_budget(1))])
+def list_overdue_loans(
+    response: Response,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    cursor: str | None = Query(None, description="X-Next-Cursor value from the previous page"),
+    service: LoanService = Depends(get_loan_service),
+) -> Response:
+    """List loans past their due date and not returned, longest overdue first.
+
+    The next page's cursor is returned in X-Next-Cursor.
+    """
+    try:
+        rows, next_cursor = service.list_overdue(limit=limit, cursor=cursor)
+    except InvalidCursorError:
+        logger.warning("List overdue loans failed: invalid cursor")
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    result = [LoanWithDetailsResponse.model_construct(**row) for row in rows]
+    return json_response(LOAN_DETAILS_LIST, result, response)
+
+
+@router.get("/{loan_id}", response_model=LoanResponse, dependencies=[Depends(query_budget(1))])
 def get_loan(
+    request: Request,
+    response: Response,
     loan_id: UUID,
     service: LoanService = Depends(get_loan_service),
-) -> LoanResponse:
+) -> LoanResponse | Response:
     """Get a loan by ID."""
     loan = service.get_loan(loan_id)
     if loan is None:
         logger.warning("Get loan failed: loan_id=%s not found", loan_id)
         raise HTTPException(status_code=404, detail="Loan not found")
+    not_modified = conditional(request, response, make_etag(loan.id, loan.updated_at))
+    if not_modified is not None:
+        return not_modified
     return LoanResponse.model_validate(loan)
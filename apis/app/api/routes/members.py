@@ -3,22 +3,29 @@
 import logging
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
+from app.api.etag import conditional, make_etag
+from app.api.responses import json_response
+from app.api.tracing import query_budget
 from app.db.session import get_db
-from app.schemas.member import MemberCreate, MemberResponse, MemberUpdate
+from app.repositories import MAX_PAGE_SIZE, InvalidCursorError
+from app.schemas.member import MAX_SUMMARY_LOANS, MemberCreate, MemberResponse, MemberSummaryResponse, MemberUpdate
 from app.services import MemberService
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/members", tags=["members"])
 
+MEMBER_LIST = TypeAdapter(list[MemberResponse])
+
 
 def get_member_service(db: Session = Depends(get_db)) -> MemberService:
     return MemberService(db)
 
 
-@router.post("", response_model=MemberResponse, status_code=201)
+@router.post("", response_model=MemberResponse, status_code=201, dependencies=[Depends(query_budget(1))])
 def create_member(
     body: MemberCreate,
     service: MemberService = Depends(get_member_service),
@@ -32,27 +39,62 @@ def create_member(
     return MemberResponse.model_validate(member)
 
 
-@router.get("", response_model=list[MemberResponse])
-def list_members(service: MemberService = Depends(get_member_service)) -> list[MemberResponse]:
-    """List all members."""
-    members = service.list_members()
-    return [MemberResponse.model_validate(m) for m in members]
+@router.get("", response_model=list[MemberResponse], dependencies=[Depends(query_budget(2))])
+def list_members(
+    request: Request,
+    response: Response,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; omit to list all members"),
+    cursor: str | None = Query(None, description="X-Next-Cursor value from the previous page"),
+    service: MemberService = Depends(get_member_service),
+) -> Response:
+    """List members by name. With `limit`, the next page's cursor is returned in X-Next-Cursor."""
+    version = service.members_version()
+    not_modified = conditional(request, response, make_etag("members", limit, cursor, version))
+    if not_modified is not None:
+        return not_modified
+    try:
+        members, next_cursor = service.list_members(limit=limit, cursor=cursor)
+    except InvalidCursorError:
+        logger.warning("List members failed: invalid cursor")
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return json_response(MEMBER_LIST, MEMBER_LIST.validate_python(members, from_attributes=True), response)
 
 
-@router.get("/{member_id}", response_model=MemberResponse)
+@router.get("/{member_id}", response_model=MemberResponse, dependencies=[Depends(query_budget(1))])
 def get_member(
+    request: Request,
+    response: Response,
     member_id: UUID,
     service: MemberService = Depends(get_member_service),
-) -> MemberResponse:
+) -> MemberResponse | Response:
     """Get a member by ID."""
     member = service.get_member(member_id)
     if member is None:
         logger.warning("Get member failed: member_id=%s not found", member_id)
         raise HTTPException(status_code=404, detail="Member not found")
+    not_modified = conditional(request, response, make_etag(member.id, member.updated_at))
+    if not_modified is not None:
+        return not_modified
     return MemberResponse.model_validate(member)
 
 
-@router.put("/{member_id}", response_model=MemberResponse)
+@router.get("/{member_id}/summary", response_model=MemberSummaryResponse, dependencies=[Depends(query_budget(1))])
+def get_member_summary(
+    member_id: UUID,
+    recent: int = Query(5, ge=0, le=MAX_SUMMARY_LOANS, description="How many of the newest active loans to include"),
+    service: MemberService = Depends(get_member_service),
+) -> MemberSummaryResponse:
+    """Active, overdue and lifetime loan counts, next due date and the newest active loans of a member."""
+    summary = service.get_summary(member_id, recent=recent)
+    if summary is None:
+        logger.warning("Get member summary failed: member_id=%s not found", member_id)
+        raise HTTPException(status_code=404, detail="Member not found")
+    return summary
+
+
+@router.put("/{member_id}", response_model=MemberResponse, dependencies=[Depends(query_budget(2))])
 def update_member(
     member_id: UUID,
     body: MemberUpdate,
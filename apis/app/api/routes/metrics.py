@@ -0,0 +1,13 @@
+"""Prometheus scrape endpoint."""
+
+from fastapi import APIRouter, Response
+
+from app.api.metrics import CONTENT_TYPE, render_metrics
+
+router = APIRouter(tags=["internal"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def get_metrics() -> Response:
+    """Request latency, per-request SQL and pool metrics of this worker, in the Prometheus text format."""
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE)
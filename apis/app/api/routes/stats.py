@@ -0,0 +1,69 @@
+"""Circulation statistics controllers - read from materialized views refreshed by scripts/refresh_stats.py."""
+
+import logging
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session
+
+from app.api.responses import json_response
+from app.api.tracing import query_budget
+from app.db.session import get_db
+from app.schemas.stats import MAX_STATS_ROWS, BookLoanStats, LoanDurationStats, MemberActivityStats, MonthlyLoanStats
+from app.services import StatsService
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+BOOK_STATS_LIST = TypeAdapter(list[BookLoanStats])
+MONTHLY_STATS_LIST = TypeAdapter(list[MonthlyLoanStats])
+MEMBER_STATS_LIST = TypeAdapter(list[MemberActivityStats])
+
+LIMIT = Query(10, ge=1, le=MAX_STATS_ROWS, description="Number of rows")
+SINCE = Query(None, description="First month to include (any day of it)")
+UNTIL = Query(None, description="First month to exclude (any day of it)")
+
+
+def get_stats_service(db: Session = Depends(get_db)) -> StatsService:
+    return StatsService(db)
+
+
+def _check_range(since: date | None, until: date | None) -> None:
+    if since is not None and until is not None and since > until:
+        logger.warning("Stats query failed: since=%s after until=%s", since, until)
+        raise HTTPException(status_code=400, detail="since must not be after until")
+
+
+@router.get("/top-books", response_model=list[BookLoanStats], dependencies=[Depends(query_budget(1))])
+def top_books(limit: int = LIMIT, service: StatsService = Depends(get_stats_service)) -> Response:
+    """Most borrowed books, most loans first."""
+    return json_response(BOOK_STATS_LIST, service.top_books(limit))
+
+
+@router.get("/loans-per-month", response_model=list[MonthlyLoanStats], dependencies=[Depends(query_budget(1))])
+def loans_per_month(
+    since: date | None = SINCE,
+    until: date | None = UNTIL,
+    service: StatsService = Depends(get_stats_service),
+) -> Response:
+    """Loans borrowed per UTC calendar month, oldest month first, with their average duration."""
+    _check_range(since, until)
+    return json_response(MONTHLY_STATS_LIST, service.loans_per_month(since=since, until=until))
+
+
+@router.get("/loan-duration", response_model=LoanDurationStats, dependencies=[Depends(query_budget(1))])
+def loan_duration(
+    since: date | None = SINCE,
+    until: date | None = UNTIL,
+    service: StatsService = Depends(get_stats_service),
+) -> LoanDurationStats:
+    """Average days from borrow to return, over returned loans borrowed in the month range."""
+    _check_range(since, until)
+    return service.loan_duration(since=since, until=until)
+
+
+@router.get("/top-members", response_model=list[MemberActivityStats], dependencies=[Depends(query_budget(1))])
+def top_members(limit: int = LIMIT, service: StatsService = Depends(get_stats_service)) -> Response:
+    """Most active members by loans taken, most first."""
+    return json_response(MEMBER_STATS_LIST, service.top_members(limit))
@@ -0,0 +1,46 @@
+"""SQL tracing for HTTP requests - the per-request trace scope and route query budgets."""
+
+from collections.abc import Awaitable, Callable
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.api.metrics import route_template
+from app.db.config import TraceSettings
+from app.db.query_trace import set_query_budget, trace_queries
+
+
+class QueryTraceMiddleware:
+    """Open a SQL trace for every HTTP request; it is reported under the route template."""
+
+    def __init__(self, app: ASGIApp, settings: TraceSettings) -> None:
+        self.app = app
+        self.settings = settings
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with trace_queries(f"{scope['method']} {scope['path']}", self.settings) as trace:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                trace.label = f"{scope['method']} {route_template(scope)}"
+
+
+def query_budget(limit: int) -> Callable[[], Awaitable[None]]:
+    """Route dependency declaring how many SQL statements a request may run, e.g.
+    `dependencies=[Depends(query_budget(2))]`. Only checked while the SQL tracer is on.
+    """
+
+    async def declare() -> None:
+        set_query_budget(limit)
+
+    return declare
+
+
+async def query_budget_exceeded_handler(request: Request, exc: Exception) -> JSONResponse:
+    """500 naming the route, its budget and the statement that went over."""
+    return JSONResponse(status_code=500, content={"detail": str(exc)})
+
@@ -1,6 +1,14 @@
 """Database package - base and configuration."""
 
 from app.db.base import Base
-from app.db.config import get_database_url
+from app.db.config import get_async_database_url, get_database_url, use_async_db
+from app.db.unit_of_work import async_unit_of_work, unit_of_work
 
-__all__ = ["Base", "get_database_url"]
+__all__ = [
+    "Base",
+    "async_unit_of_work",
+    "get_async_database_url",
+    "get_database_url",
+    "unit_of_work",
+    "use_async_db",
+]
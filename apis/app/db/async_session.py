@@ -0,0 +1,41 @@
+"""Async database session - asyncpg engine, session factory, and FastAPI dependency.
+
+The engine is created on first use so the sync stack never needs asyncpg installed.
+"""
+
+from collections.abc import AsyncGenerator
+from functools import lru_cache
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.db.config import get_async_database_url, get_pool_settings
+from app.db.pool import engine_options
+
+
+@lru_cache(maxsize=1)
+def get_async_engine() -> AsyncEngine:
+    return create_async_engine(
+        get_async_database_url(),
+        echo=False,
+        **engine_options(get_pool_settings(), is_async=True),
+    )
+
+
+def async_engine_created() -> bool:
+    return get_async_engine.cache_info().currsize > 0
+
+
+@lru_cache(maxsize=1)
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    # expire_on_commit=False: expired attributes would need an implicit (sync) reload
+    return async_sessionmaker(
+        bind=get_async_engine(),
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Yield an async DB session for the request; closed when request ends."""
+    async with get_async_sessionmaker()() as db:
+        yield db
@@ -6,4 +6,6 @@ from sqlalchemy.orm import DeclarativeBase
 class Base(DeclarativeBase):
     """Base class for all ORM models."""
 
-    pass
+    # Flushes fetch server-generated columns (created_at, updated_at, borrowed_at, ...) via
+    # INSERT/UPDATE ... RETURNING, so repositories never need a refresh SELECT after writing
+    __mapper_args__ = {"eager_defaults": True}
@@ -0,0 +1,125 @@
+"""Instrumented connection pools - checkout wait times, failures and live gauges."""
+
+import threading
+from time import perf_counter
+from typing import Any, TypeVar
+
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, NullPool, Pool, QueuePool
+
+from app.db.config import PoolSettings
+
+# Upper bounds (seconds) of the checkout wait-time histogram buckets
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_P = TypeVar("_P", bound=Pool)
+
+
+class PoolMetrics:
+    """Thread-safe checkout counters and a cumulative wait-time histogram."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.failures = 0
+        self.wait_sum = 0.0
+        self._bucket_counts = [0] * (len(WAIT_BUCKETS) + 1)
+
+    def observe(self, seconds: float, *, failed: bool) -> None:
+        index = next((i for i, bound in enumerate(WAIT_BUCKETS) if seconds <= bound), len(WAIT_BUCKETS))
+        with self._lock:
+            if failed:
+                self.failures += 1
+            else:
+                self.checkouts += 1
+            self.wait_sum += seconds
+            self._bucket_counts[index] += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            counts = list(self._bucket_counts)
+            checkouts, failures, wait_sum = self.checkouts, self.failures, self.wait_sum
+        buckets = []
+        running = 0
+        for bound, count in zip((*WAIT_BUCKETS, float("inf")), counts):
+            running += count
+            buckets.append({"le": "+Inf" if bound == float("inf") else str(bound), "count": running})
+        return {
+            "checkouts": checkouts,
+            "checkout_failures": failures,
+            "wait_seconds_sum": wait_sum,
+            "wait_seconds_buckets": buckets,
+        }
+
+
+class _InstrumentedPool(Pool):
+    """Times every checkout (including time spent queued for a free connection)."""
+
+    metrics: PoolMetrics
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _keep_metrics(self, pool: _P) -> _P:
+        # engine.dispose() swaps in a fresh pool; keep counting into the same metrics
+        if isinstance(pool, _InstrumentedPool):
+            pool.metrics = self.metrics
+        return pool
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = perf_counter()
+        try:
+            entry = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.observe(perf_counter() - start, failed=True)
+            raise
+        self.metrics.observe(perf_counter() - start, failed=False)
+        return entry
+
+
+class InstrumentedQueuePool(_InstrumentedPool, QueuePool):
+    def recreate(self) -> QueuePool:
+        return self._keep_metrics(super().recreate())
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPool, AsyncAdaptedQueuePool):
+    def recreate(self) -> QueuePool:
+        return self._keep_metrics(super().recreate())
+
+
+class InstrumentedNullPool(_InstrumentedPool, NullPool):
+    def recreate(self) -> NullPool:
+        return self._keep_metrics(super().recreate())
+
+
+def engine_options(settings: PoolSettings, *, is_async: bool = False) -> dict[str, Any]:
+    """create_engine / create_async_engine keyword arguments for the given pool settings."""
+    options: dict[str, Any] = {"pool_pre_ping": settings.pre_ping, "pool_recycle": settings.recycle}
+    if settings.null_pool:
+        options["poolclass"] = InstrumentedNullPool
+        return options
+    options.update(
+        poolclass=InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        pool_size=settings.size,
+        max_overflow=settings.max_overflow,
+        pool_timeout=settings.timeout,
+    )
+    return options
+
+
+def pool_status(engine: Engine) -> dict[str, Any]:
+    """Live gauges and accumulated checkout metrics for an engine's pool."""
+    pool = engine.pool
+    status: dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+        )
+    if isinstance(pool, _InstrumentedPool):
+        status.update(pool.metrics.snapshot())
+    return status
@@ -0,0 +1,66 @@
+"""Per-request SQL accounting - query count and time spent in the database.
+
+`collect_query_stats()` opens a scope (one per HTTP request, set up by the metrics
+middleware); cursor events on every engine add to the innermost open scope. Sync routes
+run in the threadpool and async routes on asyncpg greenlets, and both inherit the
+request's context, so their queries land in the right scope. Queries outside a scope
+(scripts, the catalog cache listener) are not counted.
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryStats:
+    """Queries run and seconds spent in them within one scope."""
+
+    __slots__ = ("queries", "seconds", "_started")
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.seconds = 0.0
+        self._started: float | None = None
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def collect_query_stats() -> Iterator[QueryStats]:
+    """Count the queries run in this context (and threads/greenlets it hands work to)."""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def _before_cursor_execute(*args: Any) -> None:
+    stats = _current.get()
+    if stats is not None:
+        stats._started = perf_counter()
+
+
+def _after_cursor_execute(*args: Any) -> None:
+    # Also the handle_error listener, so failed statements count too
+    stats = _current.get()
+    if stats is not None and stats._started is not None:
+        stats.queries += 1
+        stats.seconds += perf_counter() - stats._started
+        stats._started = None
+
+
+def install_query_stats() -> None:
+    """Listen to cursor events on all engines (idempotent)."""
+    if event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _after_cursor_execute)
@@ -0,0 +1,200 @@
+"""Opt-in SQL tracer - statement shapes per request, N+1 detection, slow-query EXPLAINs, query budgets.
+
+Enabled with SQL_TRACE=1. Each request gets a trace (opened by the tracing middleware);
+cursor events on every engine add the normalized shape of each statement (literals and
+bind parameters replaced by `?`, IN lists collapsed) and its duration. When the request
+ends, shapes run SQL_TRACE_REPEAT times or more are logged as likely N+1 queries, and the
+full list is logged at DEBUG. Statements slower than SQL_TRACE_SLOW_MS are logged with
+their EXPLAIN plan as soon as they finish.
+
+Routes declare how many statements they may run with the `query_budget` dependency. Going
+over is logged; with SQL_TRACE_ENFORCE=1 (test runs) the statement that would exceed the
+budget raises QueryBudgetExceeded instead, failing the request. Bookkeeping whose cost does
+not depend on the route (idempotency keys, read-your-writes LSN checks) runs inside
+`budget_exempt()`: traced, but not counted against the budget.
+"""
+
+import logging
+import re
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine, ExceptionContext
+
+from app.db.config import TraceSettings
+
+logger = logging.getLogger(__name__)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?(?![\w$])")
+# psycopg2 (%(name)s, %s) and asyncpg ($1) bind parameters
+_PARAM = re.compile(r"%\(\w+\)s|%s|\$\d+")
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE = re.compile(r"\s+")
+_EXPLAINABLE = re.compile(r"^\s*(?:SELECT|WITH)\b", re.IGNORECASE)
+
+
+def normalize(statement: str) -> str:
+    """Statement shape: literals and parameters as `?`, `(?, ?, ...)` lists as `(?...)`, whitespace collapsed."""
+    shape = _STRING.sub("?", statement)
+    shape = _PARAM.sub("?", shape)
+    shape = _NUMBER.sub("?", shape)
+    shape = _LIST.sub("(?...)", shape)
+    return _SPACE.sub(" ", shape).strip()
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """A request ran more statements than its route's query budget (SQL_TRACE_ENFORCE=1 only)."""
+
+
+class RequestTrace:
+    """Statements of one request: (shape, seconds) in execution order."""
+
+    def __init__(self, label: str, settings: TraceSettings) -> None:
+        self.label = label
+        self.settings = settings
+        self.budget: int | None = None
+        self.statements: list[tuple[str, float]] = []
+        self.exempt = 0  # statements run inside budget_exempt()
+        self._exempting = False
+        self._started: float | None = None
+
+    @property
+    def counted(self) -> int:
+        """Statements that count against the budget."""
+        return len(self.statements) - self.exempt
+
+    def add(self, shape: str, seconds: float) -> None:
+        self.statements.append((shape, seconds))
+        if self._exempting:
+            self.exempt += 1
+
+    def repeated(self) -> list[tuple[str, int]]:
+        """Shapes run at least SQL_TRACE_REPEAT times, most frequent first."""
+        counts = Counter(shape for shape, _ in self.statements)
+        return [(shape, n) for shape, n in counts.most_common() if n >= self.settings.repeat_threshold]
+
+    def report(self) -> None:
+        total = sum(seconds for _, seconds in self.statements)
+        for shape, n in self.repeated():
+            logger.warning("Possible N+1 in %s: same statement %d times: %s", self.label, n, shape)
+        if self.budget is not None and self.counted > self.budget:
+            logger.warning("%s ran %d statements, over its query budget of %d", self.label, self.counted, self.budget)
+        if logger.isEnabledFor(logging.DEBUG):
+            lines = "".join(f"\n  {seconds * 1000:8.2f} ms  {shape}" for shape, seconds in self.statements)
+            logger.debug("%s: %d statements, %.2f ms%s", self.label, len(self.statements), total * 1000, lines)
+
+
+_current: ContextVar[RequestTrace | None] = ContextVar("query_trace", default=None)
+
+
+@contextmanager
+def trace_queries(label: str, settings: TraceSettings) -> Iterator[RequestTrace]:
+    """Trace the statements run in this context (and threads/greenlets it hands work to); report at exit."""
+    trace = RequestTrace(label, settings)
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
+        trace.report()
+
+
+def set_query_budget(limit: int) -> None:
+    """Declare the statement budget of the current request (no-op when not tracing)."""
+    trace = _current.get()
+    if trace is not None:
+        trace.budget = limit
+
+
+@contextmanager
+def budget_exempt() -> Iterator[None]:
+    """Statements run in this context are traced but not counted against the query budget."""
+    trace = _current.get()
+    if trace is None or trace._exempting:
+        yield
+        return
+    trace._exempting = True
+    try:
+        yield
+    finally:
+        trace._exempting = False
+
+
+def _explain(conn: Connection, statement: str, parameters: Any) -> str:
+    """EXPLAIN of an already-run read, on a raw cursor so it is neither traced nor counted.
+
+    Runs under a savepoint: an EXPLAIN that fails must not abort the request's transaction.
+    """
+    cursor = conn.connection.dbapi_connection.cursor()  # type: ignore[union-attr]
+    try:
+        cursor.execute("SAVEPOINT query_trace_explain")
+        try:
+            cursor.execute(f"EXPLAIN {statement}", parameters)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+        except Exception:
+            cursor.execute("ROLLBACK TO SAVEPOINT query_trace_explain")
+            raise
+        cursor.execute("RELEASE SAVEPOINT query_trace_explain")
+        return plan
+    finally:
+        cursor.close()
+
+
+def _before_cursor_execute(conn: Connection, cursor: Any, statement: str, *args: Any) -> None:
+    trace = _current.get()
+    if trace is None:
+        return
+    if (
+        trace.settings.enforce
+        and trace.budget is not None
+        and not trace._exempting
+        and trace.counted >= trace.budget
+    ):
+        raise QueryBudgetExceeded(
+            f"{trace.label} is about to run statement {trace.counted + 1}, "
+            f"over its query budget of {trace.budget}: {normalize(statement)}"
+        )
+    trace._started = perf_counter()
+
+
+def _after_cursor_execute(
+    conn: Connection, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    trace = _current.get()
+    if trace is None or trace._started is None:
+        return
+    seconds = perf_counter() - trace._started
+    trace._started = None
+    shape = normalize(statement)
+    trace.add(shape, seconds)
+    if seconds * 1000 < trace.settings.slow_ms:
+        return
+    plan = "(not a read)"
+    if not executemany and _EXPLAINABLE.match(statement):
+        try:
+            plan = _explain(conn, statement, parameters)
+        except Exception as e:  # the plan is a diagnostic, never fail the request for it
+            plan = f"(EXPLAIN failed: {e})"
+    logger.warning("Slow statement (%.1f ms) in %s: %s\n%s", seconds * 1000, trace.label, shape, plan)
+
+
+def _handle_error(context: ExceptionContext) -> None:
+    trace = _current.get()
+    if trace is not None and trace._started is not None and context.statement is not None:
+        trace.add(normalize(context.statement), perf_counter() - trace._started)
+        trace._started = None
+
+
+def install_query_trace() -> None:
+    """Listen to cursor events on all engines (idempotent)."""
+    if event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _handle_error)
@@ -0,0 +1,304 @@
+"""Idempotent DDL that create_all cannot express or apply to existing tables."""
+
+from datetime import date
+
+from app.models.book import SEARCH_VECTOR_SQL
+
+# A loans table created before partitioning becomes the hot partition: free its table,
+# constraint and index names for the partitioned parent and drop what a partition cannot
+# keep (transition-table triggers; the overdue_notices FK, which would cascade when a loan
+# moves to the archive). Indexes that match the parent's are reused when it is attached.
+PARTITION_LEGACY_LOANS = r"""
+DO $$
+DECLARE
+    ix record;
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_class
+        WHERE relname = 'loans' AND relkind = 'r' AND relnamespace = current_schema()::regnamespace
+    ) THEN
+        RETURN;
+    END IF;
+    ALTER TABLE IF EXISTS overdue_notices DROP CONSTRAINT IF EXISTS overdue_notices_loan_id_fkey;
+    DROP TRIGGER IF EXISTS loans_counts_insert ON loans;
+    DROP TRIGGER IF EXISTS loans_counts_update ON loans;
+    DROP TRIGGER IF EXISTS loans_counts_delete ON loans;
+    DROP INDEX IF EXISTS ix_loans_member_id;
+    ALTER TABLE loans ADD COLUMN IF NOT EXISTS archived boolean NOT NULL DEFAULT false;
+    ALTER TABLE loans RENAME CONSTRAINT loans_pkey TO loans_hot_pkey;
+    ALTER TABLE loans RENAME CONSTRAINT loans_member_id_fkey TO loans_hot_member_id_fkey;
+    ALTER TABLE loans RENAME CONSTRAINT loans_copy_id_fkey TO loans_hot_copy_id_fkey;
+    FOR ix IN
+        SELECT indexname FROM pg_indexes
+        WHERE schemaname = current_schema() AND tablename = 'loans'
+            AND indexname LIKE 'ix\_loans\_%' AND indexname <> 'ix_loans_active_copy'
+    LOOP
+        EXECUTE format('ALTER INDEX %I RENAME TO %I', ix.indexname, 'ix_loans_hot_' || substr(ix.indexname, 10));
+    END LOOP;
+    ALTER TABLE loans RENAME TO loans_hot;
+END
+$$"""
+
+# Run before create_all: objects the model DDL depends on
+PRE_CREATE_DDL: list[str] = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    PARTITION_LEGACY_LOANS,
+]
+
+# loans is LIST-partitioned on archived: the hot partition takes every write, the archive is
+# split by borrowed_at month (partitions made by the archival job, see archive_partition_ddl)
+LOAN_PARTITIONS_DDL: list[str] = [
+    """
+DO $$
+BEGIN
+    IF to_regclass('loans_hot') IS NULL THEN
+        CREATE TABLE loans_hot PARTITION OF loans FOR VALUES IN (false);
+        ALTER TABLE loans_hot ADD CONSTRAINT loans_hot_pkey PRIMARY KEY (id);
+    ELSIF NOT (SELECT relispartition FROM pg_class WHERE oid = to_regclass('loans_hot')) THEN
+        ALTER TABLE loans ATTACH PARTITION loans_hot FOR VALUES IN (false);
+    END IF;
+END
+$$""",
+    # Active loans are never archived, so this is one active loan per copy across all of loans
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_loans_active_copy ON loans_hot (copy_id) WHERE returned_at IS NULL",
+    # Only returned loans are archived. The check also lets the planner skip every archive
+    # partition for `returned_at IS NULL` queries (constraint_exclusion = partition).
+    (
+        "CREATE TABLE IF NOT EXISTS loans_archive PARTITION OF loans "
+        "(CONSTRAINT ck_loans_archive_returned CHECK (returned_at IS NOT NULL)) "
+        "FOR VALUES IN (true) PARTITION BY RANGE (borrowed_at)"
+    ),
+    # Catches rows archived outside the job; a month cannot get its partition while it holds rows for it
+    "CREATE TABLE IF NOT EXISTS loans_archive_default PARTITION OF loans_archive DEFAULT",
+    # Lookups by id (GET /loans/{id}); loans_hot has its primary key
+    "CREATE INDEX IF NOT EXISTS ix_loans_archive_id ON loans_archive (id)",
+]
+
+
+def archive_partition_name(month: date) -> str:
+    return f"loans_archive_{month:%Y_%m}"
+
+
+def archive_partition_ddl(month: date) -> str:
+    """Partition of loans_archive for loans borrowed in the (UTC) calendar month starting `month`."""
+    month = month.replace(day=1)
+    end = date(month.year + month.month // 12, month.month % 12 + 1, 1)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {archive_partition_name(month)} PARTITION OF loans_archive "
+        f"FOR VALUES FROM ('{month.isoformat()} UTC') TO ('{end.isoformat()} UTC')"
+    )
+
+
+def _apply_count_deltas(deltas: str) -> str:
+    """Add per-book (total, available) deltas to books, one atomic UPDATE per book in id order.
+
+    `deltas` selects (book_id, total, available) rows from the trigger's transition tables.
+    No row is locked ahead of its UPDATE: a borrow holds its book's row only from its own
+    increment to commit, which any counter kept in books costs. Visiting books in id order
+    keeps concurrent multi-book statements (batch checkouts, imports) from deadlocking;
+    bumping updated_at changes the books' ETags.
+    """
+    return f"""
+        FOR d IN
+            SELECT book_id, sum(total) AS total, sum(available) AS available
+            FROM ({deltas}) AS changes
+            GROUP BY book_id
+            HAVING sum(total) <> 0 OR sum(available) <> 0
+            ORDER BY book_id
+        LOOP
+            UPDATE books
+            SET copies_total = copies_total + d.total,
+                copies_available = copies_available + d.available,
+                updated_at = now()
+            WHERE id = d.book_id;
+        END LOOP;"""
+
+
+def _count_trigger_function(name: str, *, insert: str, update: str, delete: str) -> str:
+    return f"""
+CREATE OR REPLACE FUNCTION {name}() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    d record;
+BEGIN
+    IF TG_OP = 'INSERT' THEN{_apply_count_deltas(insert)}
+    ELSIF TG_OP = 'UPDATE' THEN{_apply_count_deltas(update)}
+    ELSE{_apply_count_deltas(delete)}
+    END IF;
+    RETURN NULL;
+END
+$$"""
+
+
+def _count_triggers(table: str, function: str) -> list[str]:
+    """Statement-level triggers (one books update per statement, not per row) for each write event."""
+    return [
+        f"CREATE OR REPLACE TRIGGER {table}_counts_insert AFTER INSERT ON {table} "
+        f"REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION {function}()",
+        f"CREATE OR REPLACE TRIGGER {table}_counts_update AFTER UPDATE ON {table} "
+        f"REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION {function}()",
+        f"CREATE OR REPLACE TRIGGER {table}_counts_delete AFTER DELETE ON {table} "
+        f"REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION {function}()",
+    ]
+
+
+_COPY_FREE = "CASE WHEN EXISTS (SELECT 1 FROM loans l WHERE l.copy_id = {c}.id AND l.returned_at IS NULL) THEN 0 ELSE 1 END"
+
+# New copies have no loans; a copy with any loan cannot be deleted (FK RESTRICT).
+# An update only counts when it moves the copy to another book.
+BOOK_COPIES_COUNTS_FUNCTION = _count_trigger_function(
+    "book_copies_counts",
+    insert="SELECT n.book_id, 1 AS total, 1 AS available FROM new_rows n",
+    update=(
+        f"SELECT n.book_id, 1 AS total, {_COPY_FREE.format(c='n')} AS available "
+        "FROM new_rows n JOIN old_rows o ON o.id = n.id WHERE o.book_id <> n.book_id "
+        f"UNION ALL SELECT o.book_id, -1, -{_COPY_FREE.format(c='o')} "
+        "FROM new_rows n JOIN old_rows o ON o.id = n.id WHERE o.book_id <> n.book_id"
+    ),
+    delete="SELECT o.book_id, -1 AS total, -1 AS available FROM old_rows o",
+)
+
+# A loan takes its copy off the shelf while returned_at IS NULL
+LOANS_COUNTS_FUNCTION = _count_trigger_function(
+    "loans_counts",
+    insert=(
+        "SELECT c.book_id, 0 AS total, -1 AS available "
+        "FROM new_rows n JOIN book_copies c ON c.id = n.copy_id WHERE n.returned_at IS NULL"
+    ),
+    update=(
+        "SELECT c.book_id, 0 AS total, 1 AS available "
+        "FROM old_rows o JOIN new_rows n ON n.id = o.id JOIN book_copies c ON c.id = o.copy_id "
+        "WHERE o.returned_at IS NULL AND (n.returned_at IS NOT NULL OR n.copy_id <> o.copy_id) "
+        "UNION ALL SELECT c.book_id, 0, -1 "
+        "FROM old_rows o JOIN new_rows n ON n.id = o.id JOIN book_copies c ON c.id = n.copy_id "
+        "WHERE n.returned_at IS NULL AND (o.returned_at IS NOT NULL OR n.copy_id <> o.copy_id)"
+    ),
+    delete=(
+        "SELECT c.book_id, 0 AS total, 1 AS available "
+        "FROM old_rows o JOIN book_copies c ON c.id = o.copy_id WHERE o.returned_at IS NULL"
+    ),
+)
+
+# Reconcile the counters with the rows they summarize: backfills existing databases and
+# repairs any drift (e.g. rows loaded with triggers disabled). Touches only books that differ.
+RECOUNT_BOOK_COPIES = """
+UPDATE books b
+SET copies_total = c.total, copies_available = c.available, updated_at = now()
+FROM (
+    SELECT bk.id, count(bc.id) AS total, count(bc.id) - count(l.id) AS available
+    FROM books bk
+    LEFT JOIN book_copies bc ON bc.book_id = bk.id
+    LEFT JOIN loans l ON l.copy_id = bc.id AND l.returned_at IS NULL
+    GROUP BY bk.id
+) AS c
+WHERE b.id = c.id AND (b.copies_total, b.copies_available) IS DISTINCT FROM (c.total, c.available)
+"""
+
+CHANGE_COUNTER_SLOTS = 16
+
+# Adds one to the change counter named by the trigger argument, in this backend's slot (see
+# ChangeCounter). The slot row stays locked until commit, so readers see the new count exactly
+# when they can see the write it counts, and only writers sharing a slot wait on each other.
+BUMP_CHANGE_COUNTER_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION bump_change_counter() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO change_counters (name, slot, version)
+    VALUES (TG_ARGV[0], pg_backend_pid() % {CHANGE_COUNTER_SLOTS}, 1)
+    ON CONFLICT (name, slot) DO UPDATE SET version = change_counters.version + 1;
+    RETURN NULL;
+END
+$$"""
+
+# The "loans" counter versions the loan list: writes to loans and to the member, copy and
+# book columns a listed loan shows. Statement-level, so a batch bumps it once.
+LOANS_CHANGE_TRIGGERS: list[str] = [
+    (
+        "CREATE OR REPLACE TRIGGER loans_changed AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON loans "
+        "FOR EACH STATEMENT EXECUTE FUNCTION bump_change_counter('loans')"
+    ),
+    (
+        "CREATE OR REPLACE TRIGGER members_loans_changed AFTER UPDATE OF name ON members "
+        "FOR EACH STATEMENT EXECUTE FUNCTION bump_change_counter('loans')"
+    ),
+    (
+        "CREATE OR REPLACE TRIGGER book_copies_loans_changed AFTER UPDATE OF book_id, copy_code ON book_copies "
+        "FOR EACH STATEMENT EXECUTE FUNCTION bump_change_counter('loans')"
+    ),
+    (
+        "CREATE OR REPLACE TRIGGER books_loans_changed AFTER UPDATE OF title, author ON books "
+        "FOR EACH STATEMENT EXECUTE FUNCTION bump_change_counter('loans')"
+    ),
+]
+
+# The "books" and "members" counters version those lists. The copy and loan count triggers
+# write copies_total/copies_available to books, so circulation bumps "books" as well.
+LIST_CHANGE_TRIGGERS: list[str] = [
+    (
+        f"CREATE OR REPLACE TRIGGER {table}_changed AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table} "
+        f"FOR EACH STATEMENT EXECUTE FUNCTION bump_change_counter('{table}')"
+    )
+    for table in ("books", "members")
+]
+
+# Circulation statistics over the whole loan history (hot and archive), refreshed by
+# scripts/refresh_stats.py. Each has the unique index REFRESH ... CONCURRENTLY requires
+# and, where a dashboard reads a top-N, an index in rank order so it reads only N rows.
+STATS_VIEWS: dict[str, list[str]] = {
+    "stats_book_loans": [
+        """
+CREATE MATERIALIZED VIEW IF NOT EXISTS stats_book_loans AS
+SELECT c.book_id, count(*) AS loans, max(l.borrowed_at) AS last_borrowed_at
+FROM loans l
+JOIN book_copies c ON c.id = l.copy_id
+GROUP BY c.book_id""",
+        "CREATE UNIQUE INDEX IF NOT EXISTS ux_stats_book_loans_book_id ON stats_book_loans (book_id)",
+        "CREATE INDEX IF NOT EXISTS ix_stats_book_loans_rank ON stats_book_loans (loans DESC, book_id)",
+    ],
+    # Months are UTC calendar months of borrowed_at; durations cover returned loans only
+    "stats_loans_monthly": [
+        """
+CREATE MATERIALIZED VIEW IF NOT EXISTS stats_loans_monthly AS
+SELECT date_trunc('month', borrowed_at AT TIME ZONE 'UTC')::date AS month,
+       count(*) AS loans,
+       count(returned_at) AS returned,
+       coalesce(sum(extract(epoch FROM returned_at - borrowed_at)), 0)::double precision AS returned_seconds
+FROM loans
+GROUP BY 1""",
+        "CREATE UNIQUE INDEX IF NOT EXISTS ux_stats_loans_monthly_month ON stats_loans_monthly (month)",
+    ],
+    "stats_member_activity": [
+        """
+CREATE MATERIALIZED VIEW IF NOT EXISTS stats_member_activity AS
+SELECT member_id,
+       count(*) AS loans,
+       count(*) FILTER (WHERE returned_at IS NULL) AS active_loans,
+       max(borrowed_at) AS last_borrowed_at
+FROM loans
+GROUP BY member_id""",
+        "CREATE UNIQUE INDEX IF NOT EXISTS ux_stats_member_activity_member_id ON stats_member_activity (member_id)",
+        "CREATE INDEX IF NOT EXISTS ix_stats_member_activity_rank ON stats_member_activity (loans DESC, member_id)",
+    ],
+}
+
+# Run by migrate.py --clean before drop_all: the views depend on the tables it drops
+PRE_DROP_DDL: list[str] = [f"DROP MATERIALIZED VIEW IF EXISTS {name}" for name in STATS_VIEWS]
+
+# Run after create_all: columns added to tables that may predate them, indexes since superseded,
+# partitions and triggers (statement triggers on a partitioned table fire from the parent only)
+UPGRADE_DDL: list[str] = [
+    f"ALTER TABLE books ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED",
+    # member_id now leads ix_loans_member_borrowed_at
+    "DROP INDEX IF EXISTS ix_loans_member_id",
+    "ALTER TABLE books ADD COLUMN IF NOT EXISTS copies_total integer NOT NULL DEFAULT 0",
+    "ALTER TABLE books ADD COLUMN IF NOT EXISTS copies_available integer NOT NULL DEFAULT 0",
+    "ALTER TABLE idempotency_keys ADD COLUMN IF NOT EXISTS locked_until timestamptz",
+    *LOAN_PARTITIONS_DDL,
+    BOOK_COPIES_COUNTS_FUNCTION,
+    LOANS_COUNTS_FUNCTION,
+    *_count_triggers("book_copies", "book_copies_counts"),
+    *_count_triggers("loans", "loans_counts"),
+    RECOUNT_BOOK_COPIES,
+    BUMP_CHANGE_COUNTER_FUNCTION,
+    *LOANS_CHANGE_TRIGGERS,
+    *LIST_CHANGE_TRIGGERS,
+    *(ddl for view in STATS_VIEWS.values() for ddl in view),
+]
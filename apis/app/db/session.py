@@ -1,28 +1,118 @@
-"""Database session - engine, session factory, and FastAPI dependency."""
+"""Database session - engine, session factory, and FastAPI dependency.
 
+With DATABASE_REPLICA_URLS set, GET/HEAD requests read from a replica. Every commit
+stamps the response with the primary's WAL position (X-DB-LSN header and db_lsn cookie);
+a read that sends it back is served by a replica only once that replica has replayed
+up to it, otherwise by the primary, so clients always see their own writes.
+"""
+
+import itertools
+import re
 from collections.abc import Generator
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
+from fastapi import Request, Response
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session, SessionTransaction, sessionmaker
+
+from app.db.async_session import async_engine_created, get_async_engine
+from app.db.config import get_database_url, get_pool_settings, get_replica_urls
+from app.db.pool import engine_options
+from app.db.query_trace import budget_exempt
 
-from app.db.base import Base
-from app.db.config import get_database_url
+LSN_HEADER = "X-DB-LSN"
+LSN_COOKIE = "db_lsn"
+LSN_COOKIE_MAX_AGE = 300
+READ_METHODS = frozenset({"GET", "HEAD"})
+_LSN_RE = re.compile(r"^[0-9A-Fa-f]{1,8}/[0-9A-Fa-f]{1,8}$")
 
 engine = create_engine(
     get_database_url(),
-    pool_pre_ping=True,
     echo=False,
+    **engine_options(get_pool_settings()),
 )
+replica_engines: list[Engine] = [
+    create_engine(url, echo=False, **engine_options(get_pool_settings())) for url in get_replica_urls()
+]
+_replica_cycle = itertools.cycle(replica_engines) if replica_engines else None
+
+# expire_on_commit=False: objects flushed with RETURNING stay loaded after the service commits
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
+    expire_on_commit=False,
     bind=engine,
 )
 
 
-def get_db() -> Generator[Session, None, None]:
-    """Yield a DB session for the request; closed when request ends."""
-    db = SessionLocal()
+@event.listens_for(SessionLocal, "after_begin")
+def _remember_connection(session: Session, transaction: SessionTransaction, connection: Connection) -> None:
+    if session.info.get("response") is not None and replica_engines:
+        session.info["connection"] = connection
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _stamp_commit_lsn(session: Session) -> None:
+    """Hand the post-commit primary WAL position to the client as its read-your-writes token.
+
+    Read on the session's own connection, which stays checked out until the session closes
+    it right after this hook (rolling back the transaction this query opens).
+    """
+    response = session.info.get("response")
+    conn: Connection | None = session.info.pop("connection", None)
+    if response is None or conn is None:
+        return
+    with budget_exempt():
+        lsn = conn.scalar(text("SELECT pg_current_wal_lsn()::text"))
+    if lsn:
+        response.headers[LSN_HEADER] = lsn
+        response.set_cookie(LSN_COOKIE, lsn, max_age=LSN_COOKIE_MAX_AGE, httponly=True, samesite="lax")
+
+
+def pool_engines() -> dict[str, Engine]:
+    """Engines by name for pool monitoring: `primary`, `replica-N` and, once created, `async`."""
+    engines = {"primary": engine}
+    for i, replica in enumerate(replica_engines):
+        engines[f"replica-{i}"] = replica
+    if async_engine_created():
+        engines["async"] = get_async_engine().sync_engine
+    return engines
+
+
+def _replica_session(min_lsn: str | None) -> Session | None:
+    """A session on the next replica, or None if it has not yet replayed `min_lsn`."""
+    if _replica_cycle is None:
+        return None
+    db = SessionLocal(bind=next(_replica_cycle))
+    db.info["replica"] = True
+    if min_lsn is None:
+        return db
+    try:
+        with budget_exempt():
+            caught_up = db.execute(
+                text("SELECT pg_last_wal_replay_lsn() >= CAST(:lsn AS pg_lsn)"),
+                {"lsn": min_lsn},
+            ).scalar()
+    except Exception:
+        caught_up = False
+    if caught_up:
+        return db
+    db.close()
+    return None
+
+
+def get_db(request: Request, response: Response) -> Generator[Session, None, None]:
+    """Yield a DB session for the request; closed when request ends.
+
+    Reads go to a replica when one is configured and fresh enough for the client's LSN token.
+    """
+    db = None
+    if request.method in READ_METHODS:
+        token = request.headers.get(LSN_HEADER) or request.cookies.get(LSN_COOKIE)
+        db = _replica_session(token if token and _LSN_RE.match(token) else None)
+    if db is None:
+        db = SessionLocal()
+        db.info["response"] = response
     try:
         yield db
     finally:
@@ -0,0 +1,32 @@
+"""Unit of work - one commit per service operation.
+
+Repositories only add and flush; the service method that owns a write wraps it in
+`unit_of_work`, which commits once on success and rolls back on any error, so
+multi-step writes are atomic and pay for a single COMMIT.
+"""
+
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+
+@contextmanager
+def unit_of_work(db: Session) -> Iterator[Session]:
+    try:
+        yield db
+        db.commit()
+    except BaseException:
+        db.rollback()
+        raise
+
+
+@asynccontextmanager
+async def async_unit_of_work(db: AsyncSession) -> AsyncIterator[AsyncSession]:
+    try:
+        yield db
+        await db.commit()
+    except BaseException:
+        await db.rollback()
+        raise
@@ -1,19 +1,75 @@
 """Application factory - creates and configures the FastAPI app (SRP, OCP)."""
 
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api.routes import books_router, health_router, loans_router, members_router
+from app.api.idempotency import REPLAYED_HEADER
+from app.api.metrics import MetricsMiddleware
+from app.api.responses import DefaultResponse
+from app.api.routes import (
+    async_books_router,
+    async_loans_router,
+    async_members_router,
+    books_router,
+    exports_router,
+    health_router,
+    imports_router,
+    internal_router,
+    loans_router,
+    members_router,
+    metrics_router,
+    stats_router,
+)
+from app.api.tracing import QueryTraceMiddleware, query_budget_exceeded_handler
+from app.db.config import get_cache_settings, get_trace_settings, metrics_enabled, use_async_db
+from app.db.query_stats import install_query_stats
+from app.db.query_trace import QueryBudgetExceeded, install_query_trace
+from app.db.session import LSN_HEADER, SessionLocal, engine, replica_engines
+from app.services.catalog_cache import catalog_cache
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def _sync_db_lifespan(app: FastAPI) -> AsyncIterator[None]:
+    listen = catalog_cache.enabled and get_cache_settings().listen
+    if listen:
+        catalog_cache.start_listener(engine)
+    yield
+    if listen:
+        catalog_cache.stop_listener()
+
+
+@asynccontextmanager
+async def _async_db_lifespan(app: FastAPI) -> AsyncIterator[None]:
+    from app.db.async_session import get_async_engine
+
+    if replica_engines:
+        logger.warning("DB_ASYNC=1: the async book, member and loan routes ignore DATABASE_REPLICA_URLS")
+    yield
+    await get_async_engine().dispose()
+
 
+def create_app(*, async_db: bool | None = None) -> FastAPI:
+    """Create and configure the FastAPI application.
 
-def create_app() -> FastAPI:
-    """Create and configure the FastAPI application."""
+    `async_db` selects the asyncpg-backed routes (default: DB_ASYNC env var); both stacks
+    serve the same paths so they can be benchmarked side by side.
+    """
+    if async_db is None:
+        async_db = use_async_db()
     app = FastAPI(
         title="Neighborhood Library Service",
         description="API for the neighborhood library service",
         version="0.1.0",
         docs_url="/docs",
         redoc_url="/redoc",
+        default_response_class=DefaultResponse,
+        lifespan=_async_db_lifespan if async_db else _sync_db_lifespan,
     )
     app.add_middleware(
         CORSMiddleware,
@@ -21,9 +77,32 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["ETag", "X-Next-Cursor", LSN_HEADER, REPLAYED_HEADER],
     )
+    trace_settings = get_trace_settings()
+    if trace_settings.enabled:
+        install_query_trace()
+        app.add_middleware(QueryTraceMiddleware, settings=trace_settings)
+        app.add_exception_handler(QueryBudgetExceeded, query_budget_exceeded_handler)
+    if metrics_enabled():
+        # Outermost, so the recorded latency includes every other middleware
+        install_query_stats()
+        app.add_middleware(MetricsMiddleware)
+        app.include_router(metrics_router)
     app.include_router(health_router, prefix="/api/v1")
-    app.include_router(books_router, prefix="/api/v1")
-    app.include_router(members_router, prefix="/api/v1")
-    app.include_router(loans_router, prefix="/api/v1")
+    if not async_db:
+        # The async routes bypass the cache and send no invalidations (see CacheSettings)
+        catalog_cache.install(SessionLocal)
+    if async_db:
+        app.include_router(async_books_router, prefix="/api/v1")
+        app.include_router(async_members_router, prefix="/api/v1")
+        app.include_router(async_loans_router, prefix="/api/v1")
+    else:
+        app.include_router(books_router, prefix="/api/v1")
+        app.include_router(members_router, prefix="/api/v1")
+        app.include_router(loans_router, prefix="/api/v1")
+    app.include_router(exports_router, prefix="/api/v1")
+    app.include_router(imports_router, prefix="/api/v1")
+    app.include_router(stats_router, prefix="/api/v1")
+    app.include_router(internal_router, prefix="/api/v1")
     return app
@@ -3,7 +3,10 @@
 from app.db.base import Base
 from app.models.book import Book
 from app.models.book_copy import BookCopy
+from app.models.change_counter import ChangeCounter
+from app.models.idempotency_key import IdempotencyKey
 from app.models.loan import Loan
 from app.models.member import Member
+from app.models.overdue_notice import OverdueNotice
 
-__all__ = ["Base", "Book", "BookCopy", "Loan", "Member"]
+__all__ = ["Base", "Book", "BookCopy", "ChangeCounter", "IdempotencyKey", "Loan", "Member", "OverdueNotice"]
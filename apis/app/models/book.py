@@ -3,27 +3,55 @@
 from datetime import datetime
 from uuid import UUID, uuid4
 
-from sqlalchemy import DateTime, String, Text, func
+from sqlalchemy import Computed, DateTime, Index, Integer, String, Text, func, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
 
+# Weighted full-text document: title (A) > author (B) > description (C)
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(author, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
+
 
 class Book(Base):
     """Book catalog table (title/author); physical copies are in book_copies."""
 
     __tablename__ = "books"
+    __table_args__ = (
+        # Keyset pagination key for GET /books
+        Index("ix_books_title_id", "title", "id"),
+        # GET /books?available_only=true: titles with a copy on the shelf, in page order
+        Index("ix_books_available_title_id", "title", "id", postgresql_where=text("copies_available > 0")),
+        # Collection ETag: max(updated_at)
+        Index("ix_books_updated_at", "updated_at"),
+        # Catalog search: ranked full text, plus trigram fallback for typos and substrings
+        Index("ix_books_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_books_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("ix_books_author_trgm", "author", postgresql_using="gin", postgresql_ops={"author": "gin_trgm_ops"}),
+    )
 
     id: Mapped[UUID] = mapped_column(
         PG_UUID(as_uuid=True),
         primary_key=True,
         default=uuid4,
     )
-    title: Mapped[str] = mapped_column(String(512), nullable=False, index=True)
+    title: Mapped[str] = mapped_column(String(512), nullable=False)
     author: Mapped[str] = mapped_column(String(512), nullable=False, index=True)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
     isbn: Mapped[str | None] = mapped_column(String(20), nullable=True, unique=True)
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(SEARCH_VECTOR_SQL, persisted=True),
+        deferred=True,
+    )
+    # Maintained by statement triggers on book_copies and loans (app.db.schema); never written by the app
+    copies_total: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    copies_available: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
@@ -3,7 +3,7 @@
 from datetime import datetime
 from uuid import UUID, uuid4
 
-from sqlalchemy import DateTime, ForeignKey, String, func
+from sqlalchemy import DateTime, ForeignKey, Index, String, func
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -14,6 +14,10 @@ class BookCopy(Base):
     """Physical copy of a book; each copy can be lent independently."""
 
     __tablename__ = "book_copies"
+    __table_args__ = (
+        # Loan collection ETag: max(updated_at)
+        Index("ix_book_copies_updated_at", "updated_at"),
+    )
 
     id: Mapped[UUID] = mapped_column(
         PG_UUID(as_uuid=True),
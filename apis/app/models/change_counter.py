@@ -0,0 +1,20 @@
+"""ChangeCounter model - write counters that version cached list responses."""
+
+from sqlalchemy import BigInteger, SmallInteger, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class ChangeCounter(Base):
+    """Committed write statements against a list's tables, kept by triggers (see app.db.schema).
+
+    Each counter is split over slots picked by backend pid, so concurrent writers update
+    different rows instead of queueing on one; the counter's value is the sum of its slots.
+    """
+
+    __tablename__ = "change_counters"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    slot: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False)
@@ -0,0 +1,30 @@
+"""IdempotencyKey model - stored outcome of a POST retried with the same Idempotency-Key."""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class IdempotencyKey(Base):
+    """One row per client key: the request it was first used for and the response to replay until expires_at."""
+
+    __tablename__ = "idempotency_keys"
+
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    # sha256 of method, path and body: the same key on a different request is rejected
+    request_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    # NULL while the first request runs (pending); set with body when its outcome is stored
+    status_code: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    body: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+    # TTL eviction: expired rows are reclaimed on reuse and purged in batches
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+    # Lease on a pending row: once past, a retry of the same request may claim the key again
+    locked_until: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -3,7 +3,7 @@
 from datetime import datetime
 from uuid import UUID, uuid4
 
-from sqlalchemy import CheckConstraint, DateTime, ForeignKey, Index, func, text
+from sqlalchemy import Boolean, CheckConstraint, DateTime, ForeignKey, Index, false, func, text
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -11,7 +11,15 @@ from app.db.base import Base
 
 
 class Loan(Base):
-    """Loan table: one row per borrow; returned_at NULL means still out."""
+    """Loan table: one row per borrow; returned_at NULL means still out.
+
+    Partitioned on `archived`: loans_hot holds every loan still out plus recent history,
+    loans_archive (range-partitioned by borrowed_at) the returned loans the archival job
+    has moved out of it. Queries go through `loans` and see both. A unique index on a
+    partitioned table must contain every partition key, so the primary key on id and the
+    one-active-loan-per-copy index (ix_loans_active_copy) live on loans_hot only; see
+    app.db.schema.LOAN_PARTITIONS_DDL.
+    """
 
     __tablename__ = "loans"
     __table_args__ = (
@@ -23,24 +31,50 @@ class Loan(Base):
             "due_at >= borrowed_at",
             name="ck_loans_due_after_borrowed",
         ),
+        # Keyset pagination key for GET /loans (scanned backwards for DESC)
+        Index("ix_loans_borrowed_at_id", "borrowed_at", "id"),
+        # GET /loans?member_id=: a member's history in page order. Also serves the member_id
+        # FK lookups. INCLUDE carries the remaining projected loan columns so the loans side
+        # is an index-only scan (the joins to members/copies/books are primary-key lookups).
+        Index(
+            "ix_loans_member_borrowed_at",
+            "member_id",
+            "borrowed_at",
+            "id",
+            postgresql_include=["copy_id", "due_at", "returned_at"],
+        ),
+        # GET /loans?active_only=true: only loans still out, in page order
+        Index(
+            "ix_loans_active_borrowed_at",
+            "borrowed_at",
+            "id",
+            postgresql_include=["member_id", "copy_id", "due_at", "returned_at"],
+            postgresql_where=text("returned_at IS NULL"),
+        ),
+        # GET /loans/overdue and the overdue sweeper: loans still out, in due order
         Index(
-            "ix_loans_active_copy",
-            "copy_id",
-            unique=True,
+            "ix_loans_overdue",
+            "due_at",
+            "id",
+            postgresql_include=["member_id", "copy_id", "borrowed_at", "returned_at"],
             postgresql_where=text("returned_at IS NULL"),
         ),
+        # Collection ETag: max(updated_at)
+        Index("ix_loans_updated_at", "updated_at"),
+        {"postgresql_partition_by": "LIST (archived)"},
     )
+    # The parent has no primary key constraint (see above); the ORM identifies loans by id
+    __mapper_args__ = {**Base.__mapper_args__, "primary_key": ["id"]}
 
     id: Mapped[UUID] = mapped_column(
         PG_UUID(as_uuid=True),
-        primary_key=True,
         default=uuid4,
+        nullable=False,
     )
     member_id: Mapped[UUID] = mapped_column(
         PG_UUID(as_uuid=True),
         ForeignKey("members.id", ondelete="RESTRICT"),
         nullable=False,
-        index=True,
     )
     copy_id: Mapped[UUID] = mapped_column(
         PG_UUID(as_uuid=True),
@@ -58,6 +92,11 @@ class Loan(Base):
         DateTime(timezone=True),
         nullable=True,
     )
+    archived: Mapped[bool] = mapped_column(
+        Boolean,
+        server_default=false(),
+        nullable=False,
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
@@ -3,7 +3,7 @@
 from datetime import datetime
 from uuid import UUID, uuid4
 
-from sqlalchemy import DateTime, String, func
+from sqlalchemy import DateTime, Index, String, func
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -14,6 +14,12 @@ class Member(Base):
     """Library member table."""
 
     __tablename__ = "members"
+    __table_args__ = (
+        # Keyset pagination key for GET /members
+        Index("ix_members_name_id", "name", "id"),
+        # Collection ETag: max(updated_at)
+        Index("ix_members_updated_at", "updated_at"),
+    )
 
     id: Mapped[UUID] = mapped_column(
         PG_UUID(as_uuid=True),
@@ -0,0 +1,43 @@
+"""OverdueNotice model - outbox of overdue reminders queued by the overdue sweeper."""
+
+from datetime import datetime
+from uuid import UUID, uuid4
+
+from sqlalchemy import DateTime, ForeignKey, Index, UniqueConstraint, func, text
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class OverdueNotice(Base):
+    """One notice per overdue loan and due date; sent_at NULL means not yet delivered."""
+
+    __tablename__ = "overdue_notices"
+    __table_args__ = (
+        # Re-running the sweeper queues nothing twice; a renewed due date gets its own notice
+        UniqueConstraint("loan_id", "due_at", name="uq_overdue_notices_loan_due"),
+        # Outbox consumers read undelivered notices oldest first
+        Index("ix_overdue_notices_unsent", "created_at", "id", postgresql_where=text("sent_at IS NULL")),
+    )
+
+    id: Mapped[UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid4,
+    )
+    # No foreign key: loans is partitioned, so loans.id alone cannot be referenced
+    loan_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), nullable=False)
+    member_id: Mapped[UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("members.id", ondelete="RESTRICT"),
+        nullable=False,
+        index=True,
+    )
+    due_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
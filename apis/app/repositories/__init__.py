@@ -1,13 +1,35 @@
 """Data access layer - repositories for each entity."""
 
+from app.repositories.async_book_copy_repository import AsyncBookCopyRepository
+from app.repositories.async_book_repository import AsyncBookRepository
+from app.repositories.async_idempotency_repository import AsyncIdempotencyRepository
+from app.repositories.async_loan_repository import AsyncLoanRepository
+from app.repositories.async_member_repository import AsyncMemberRepository
 from app.repositories.book_copy_repository import BookCopyRepository
 from app.repositories.book_repository import BookRepository
-from app.repositories.loan_repository import LoanRepository
+from app.repositories.idempotency_repository import IdempotencyRepository
+from app.repositories.loan_archive_repository import LoanArchiveRepository
+from app.repositories.loan_repository import LoanFilters, LoanRepository
 from app.repositories.member_repository import MemberRepository
+from app.repositories.overdue_notice_repository import OverdueNoticeRepository
+from app.repositories.pagination import MAX_PAGE_SIZE, InvalidCursorError
+from app.repositories.stats_repository import StatsRepository
 
 __all__ = [
+    "AsyncBookCopyRepository",
+    "AsyncBookRepository",
+    "AsyncIdempotencyRepository",
+    "AsyncLoanRepository",
+    "AsyncMemberRepository",
     "BookCopyRepository",
     "BookRepository",
+    "IdempotencyRepository",
+    "InvalidCursorError",
+    "LoanArchiveRepository",
+    "LoanFilters",
     "LoanRepository",
+    "MAX_PAGE_SIZE",
     "MemberRepository",
+    "OverdueNoticeRepository",
+    "StatsRepository",
 ]
@@ -0,0 +1,34 @@
+"""Async book copy repository - data access for book copies over AsyncSession."""
+
+from uuid import UUID
+
+from sqlalchemy import exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import BookCopy
+
+
+class AsyncBookCopyRepository:
+    """CRUD and queries for book copies."""
+
+    async def create(self, db: AsyncSession, *, book_id: UUID, copy_code: str) -> BookCopy:
+        copy = BookCopy(book_id=book_id, copy_code=copy_code)
+        db.add(copy)
+        await db.flush()
+        return copy
+
+    async def get_by_id(self, db: AsyncSession, id: UUID) -> BookCopy | None:
+        return (await db.execute(select(BookCopy).where(BookCopy.id == id))).scalar_one_or_none()
+
+    async def list_by_book_id(self, db: AsyncSession, book_id: UUID) -> list[BookCopy]:
+        q = select(BookCopy).where(BookCopy.book_id == book_id).order_by(BookCopy.copy_code)
+        return list((await db.execute(q)).scalars().all())
+
+    async def existing_ids(self, db: AsyncSession, ids: list[UUID]) -> set[UUID]:
+        return set((await db.execute(select(BookCopy.id).where(BookCopy.id.in_(ids)))).scalars().all())
+
+    async def exists_for_book(self, db: AsyncSession, book_id: UUID) -> bool:
+        return bool((await db.execute(select(exists().where(BookCopy.book_id == book_id)))).scalar())
+
+    async def get_by_copy_code(self, db: AsyncSession, copy_code: str) -> BookCopy | None:
+        return (await db.execute(select(BookCopy).where(BookCopy.copy_code == copy_code))).scalar_one_or_none()
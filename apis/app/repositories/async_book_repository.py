@@ -0,0 +1,85 @@
+"""Async book repository - data access for books over AsyncSession."""
+
+from uuid import UUID
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Book
+from app.repositories.book_repository import decode_search_cursor, list_query, paginate_search, search_query
+from app.repositories.change_counter import version_query
+from app.repositories.pagination import decode_cursor, encode_cursor, key_values, parse_uuid
+
+
+class AsyncBookRepository:
+    """CRUD and queries for books."""
+
+    async def create(
+        self,
+        db: AsyncSession,
+        *,
+        title: str,
+        author: str,
+        description: str | None = None,
+        isbn: str | None = None,
+    ) -> Book:
+        book = Book(title=title, author=author, description=description, isbn=isbn)
+        db.add(book)
+        await db.flush()
+        return book
+
+    async def get_by_id(self, db: AsyncSession, id: UUID) -> Book | None:
+        return (await db.execute(select(Book).where(Book.id == id))).scalar_one_or_none()
+
+    async def version(self, db: AsyncSession) -> int:
+        """Changes to the book list so far (see BookRepository.version)."""
+        return (await db.execute(version_query("books"))).scalar_one()
+
+    async def list_all(self, db: AsyncSession, *, available_only: bool = False) -> list[Book]:
+        return list((await db.execute(list_query(available_only=available_only))).scalars().all())
+
+    async def list_page(
+        self, db: AsyncSession, *, limit: int, cursor: str | None = None, available_only: bool = False
+    ) -> tuple[list[Book], str | None]:
+        """One page ordered by (title, id). Returns (books, next_cursor)."""
+        q = list_query(available_only=available_only).limit(limit + 1)
+        if cursor is not None:
+            title, id = decode_cursor(cursor, 2)
+            q = q.where(tuple_(Book.title, Book.id) > key_values(title, parse_uuid(id)))
+        books = list((await db.execute(q)).scalars().all())
+        if len(books) <= limit:
+            return books, None
+        books = books[:limit]
+        return books, encode_cursor(books[-1].title, books[-1].id)
+
+    async def search(
+        self, db: AsyncSession, q: str, *, limit: int, cursor: str | None = None
+    ) -> tuple[list[tuple[Book, float]], str | None]:
+        """Ranked catalog search (see BookRepository.search)."""
+        mode, after = decode_search_cursor(cursor) if cursor is not None else ("fts", None)
+        hits = [(b, s) for b, s in (await db.execute(search_query(q, mode, limit=limit, after=after))).all()]
+        if not hits and cursor is None:
+            mode = "fuzzy"
+            hits = [(b, s) for b, s in (await db.execute(search_query(q, mode, limit=limit))).all()]
+        return paginate_search(hits, mode, limit)
+
+    async def update(
+        self,
+        db: AsyncSession,
+        book: Book,
+        *,
+        title: str | None = None,
+        author: str | None = None,
+        description: str | None = None,
+        isbn: str | None = None,
+    ) -> Book:
+        if title is not None:
+            book.title = title
+        if author is not None:
+            book.author = author
+        if description is not None:
+            book.description = description
+        if isbn is not None:
+            book.isbn = isbn
+        await db.flush()
+        return book
@@ -0,0 +1,40 @@
+"""Async idempotency key repository - stored POST outcomes over AsyncSession."""
+
+from datetime import timedelta
+from typing import Any, cast
+
+from sqlalchemy import CursorResult
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import IdempotencyKey
+from app.repositories.idempotency_repository import (
+    claim_query,
+    get_query,
+    purge_expired_query,
+    release_query,
+    save_query,
+)
+
+
+class AsyncIdempotencyRepository:
+    """Stored outcomes of POSTs sent with an Idempotency-Key."""
+
+    async def claim(self, db: AsyncSession, *, key: str, request_hash: str, ttl: timedelta, lease: timedelta) -> bool:
+        """True if this session now holds `key` (pending until `save`); False if another row holds it."""
+        result = await db.execute(claim_query(key=key, request_hash=request_hash, ttl=ttl, lease=lease))
+        return result.first() is not None
+
+    async def get(self, db: AsyncSession, key: str) -> IdempotencyKey | None:
+        return (await db.execute(get_query(key))).scalar_one_or_none()
+
+    async def save(self, db: AsyncSession, key: str, *, status_code: int, body: str) -> None:
+        await db.execute(save_query(key, status_code=status_code, body=body))
+
+    async def release(self, db: AsyncSession, key: str) -> None:
+        """Delete the pending row for `key`, so the next attempt claims it at once."""
+        await db.execute(release_query(key))
+
+    async def purge_expired(self, db: AsyncSession, *, limit: int) -> int:
+        """Delete up to `limit` expired keys; returns how many were deleted."""
+        result = await db.execute(purge_expired_query(limit).execution_options(synchronize_session=False))
+        return cast(CursorResult[Any], result).rowcount
@@ -0,0 +1,108 @@
+"""Async loan repository - data access for loans over AsyncSession."""
+
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import RowMapping, exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import BookCopy, Loan
+from app.repositories.change_counter import version_query
+from app.repositories.loan_repository import (
+    LoanFilters,
+    create_many_query,
+    list_query,
+    member_summary_query,
+    overdue_page_query,
+    page_query,
+    return_many_query,
+    split_page,
+)
+
+
+class AsyncLoanRepository:
+    """CRUD and queries for loans."""
+
+    async def create(
+        self,
+        db: AsyncSession,
+        *,
+        member_id: UUID,
+        copy_id: UUID,
+        due_at: datetime,
+    ) -> Loan:
+        loan = Loan(member_id=member_id, copy_id=copy_id, due_at=due_at)
+        db.add(loan)
+        await db.flush()
+        return loan
+
+    async def create_many(
+        self,
+        db: AsyncSession,
+        *,
+        member_id: UUID,
+        copy_ids: list[UUID],
+        due_at: datetime,
+    ) -> list[RowMapping]:
+        """Borrow the copies that are free; returns the created loan rows (see create_many_query)."""
+        result = await db.execute(create_many_query(member_id=member_id, copy_ids=copy_ids, due_at=due_at))
+        return list(result.mappings().all())
+
+    async def get_by_id(self, db: AsyncSession, id: UUID) -> Loan | None:
+        return (await db.execute(select(Loan).where(Loan.id == id))).scalar_one_or_none()
+
+    async def existing_ids(self, db: AsyncSession, ids: list[UUID]) -> set[UUID]:
+        return set((await db.execute(select(Loan.id).where(Loan.id.in_(ids)))).scalars().all())
+
+    async def claim_available_copy_id(self, db: AsyncSession, book_id: UUID) -> UUID | None:
+        """Lock and return one copy of the book with no active loan, or None (see LoanRepository)."""
+        on_loan = exists().where(Loan.copy_id == BookCopy.id, Loan.returned_at.is_(None))
+        q = (
+            select(BookCopy.id)
+            .where(BookCopy.book_id == book_id, ~on_loan)
+            .order_by(BookCopy.copy_code)
+            .limit(1)
+            .with_for_update(skip_locked=True, of=BookCopy)
+        )
+        return (await db.execute(q)).scalar_one_or_none()
+
+    async def version(self, db: AsyncSession) -> int:
+        """Changes to the loan list so far (see LoanRepository.version)."""
+        return (await db.execute(version_query("loans"))).scalar_one()
+
+    async def list_page(
+        self,
+        db: AsyncSession,
+        filters: LoanFilters,
+        *,
+        limit: int,
+        cursor: str | None = None,
+    ) -> tuple[list[RowMapping], str | None]:
+        """One page of detail rows ordered by (borrowed_at, id) descending. Returns (rows, next_cursor)."""
+        rows = (await db.execute(page_query(filters, limit=limit, cursor=cursor))).mappings().all()
+        return split_page(list(rows), limit)
+
+    async def member_summary(self, db: AsyncSession, member_id: UUID, *, recent: int) -> list[RowMapping]:
+        """Rows of member_summary_query; empty if the member does not exist."""
+        return list((await db.execute(member_summary_query(member_id, recent=recent))).mappings().all())
+
+    async def overdue_page(
+        self, db: AsyncSession, *, limit: int, cursor: str | None = None
+    ) -> tuple[list[RowMapping], str | None]:
+        """One page of overdue detail rows ordered by (due_at, id). Returns (rows, next_cursor)."""
+        rows = (await db.execute(overdue_page_query(limit=limit, cursor=cursor))).mappings().all()
+        return split_page(list(rows), limit, "due_at")
+
+    async def mark_returned(self, db: AsyncSession, loan: Loan, returned_at: datetime) -> Loan:
+        loan.returned_at = returned_at
+        await db.flush()
+        return loan
+
+    async def mark_returned_many(self, db: AsyncSession, loan_ids: list[UUID]) -> list[RowMapping]:
+        """Return the listed loans that are still out; returns their updated rows."""
+        return list((await db.execute(return_many_query(loan_ids))).mappings().all())
+
+    # Shadows the builtin inside the class body: keep it the last method.
+    async def list(self, db: AsyncSession, filters: LoanFilters) -> list[RowMapping]:
+        """Detail rows (see details_query), newest first."""
+        return list((await db.execute(list_query(filters))).mappings().all())
@@ -0,0 +1,69 @@
+"""Async member repository - data access for members over AsyncSession."""
+
+from uuid import UUID
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Member
+from app.repositories.change_counter import version_query
+from app.repositories.pagination import decode_cursor, encode_cursor, key_values, parse_uuid
+
+
+class AsyncMemberRepository:
+    """CRUD and queries for members."""
+
+    async def create(
+        self,
+        db: AsyncSession,
+        *,
+        name: str,
+        email: str | None = None,
+        phone: str | None = None,
+    ) -> Member:
+        member = Member(name=name, email=email, phone=phone)
+        db.add(member)
+        await db.flush()
+        return member
+
+    async def get_by_id(self, db: AsyncSession, id: UUID) -> Member | None:
+        return (await db.execute(select(Member).where(Member.id == id))).scalar_one_or_none()
+
+    async def version(self, db: AsyncSession) -> int:
+        """Changes to the member list so far (see MemberRepository.version)."""
+        return (await db.execute(version_query("members"))).scalar_one()
+
+    async def list_all(self, db: AsyncSession) -> list[Member]:
+        return list((await db.execute(select(Member).order_by(Member.name, Member.id))).scalars().all())
+
+    async def list_page(
+        self, db: AsyncSession, *, limit: int, cursor: str | None = None
+    ) -> tuple[list[Member], str | None]:
+        """One page ordered by (name, id). Returns (members, next_cursor)."""
+        q = select(Member).order_by(Member.name, Member.id).limit(limit + 1)
+        if cursor is not None:
+            name, id = decode_cursor(cursor, 2)
+            q = q.where(tuple_(Member.name, Member.id) > key_values(name, parse_uuid(id)))
+        members = list((await db.execute(q)).scalars().all())
+        if len(members) <= limit:
+            return members, None
+        members = members[:limit]
+        return members, encode_cursor(members[-1].name, members[-1].id)
+
+    async def update(
+        self,
+        db: AsyncSession,
+        member: Member,
+        *,
+        name: str | None = None,
+        email: str | None = None,
+        phone: str | None = None,
+    ) -> Member:
+        if name is not None:
+            member.name = name
+        if email is not None:
+            member.email = email
+        if phone is not None:
+            member.phone = phone
+        await db.flush()
+        return member
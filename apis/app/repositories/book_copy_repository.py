@@ -1,11 +1,15 @@
 """Book copy repository - data access for book copies."""
 
+from collections.abc import Collection
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Row, exists, func, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
 from app.models import BookCopy
+from app.repositories.upsert import inserted_flag
 
 
 class BookCopyRepository:
@@ -14,17 +18,51 @@ class BookCopyRepository:
     def create(self, db: Session, *, book_id: UUID, copy_code: str) -> BookCopy:
         copy = BookCopy(book_id=book_id, copy_code=copy_code)
         db.add(copy)
-        db.commit()
-        db.refresh(copy)
+        db.flush()
         return copy
 
     def get_by_id(self, db: Session, id: UUID) -> BookCopy | None:
         return db.execute(select(BookCopy).where(BookCopy.id == id)).scalar_one_or_none()
 
+    def upsert_many(self, db: Session, rows: list[dict[str, Any]]) -> list[Row[tuple[UUID, str, bool]]]:
+        """Insert `rows` in one statement, moving an existing copy_code to the row's book.
+
+        Returns (id, copy_code, inserted) for every row written; copies already on that book
+        are not returned.
+        """
+        stmt = insert(BookCopy).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[BookCopy.copy_code],
+            set_={"book_id": stmt.excluded.book_id, "updated_at": func.now()},
+            where=BookCopy.book_id != stmt.excluded.book_id,
+        )
+        return list(db.execute(stmt.returning(BookCopy.id, BookCopy.copy_code, inserted_flag("book_copies"))).all())
+
+    def by_copy_code(self, db: Session, copy_codes: Collection[str]) -> dict[str, tuple[UUID, UUID]]:
+        """copy_code -> (id, book_id) for the codes that exist."""
+        if not copy_codes:
+            return {}
+        rows = db.execute(
+            select(BookCopy.copy_code, BookCopy.id, BookCopy.book_id).where(BookCopy.copy_code.in_(copy_codes))
+        ).all()
+        return {code: (id, book_id) for code, id, book_id in rows}
+
     def list_by_book_id(self, db: Session, book_id: UUID) -> list[BookCopy]:
         return list(
             db.execute(select(BookCopy).where(BookCopy.book_id == book_id).order_by(BookCopy.copy_code)).scalars().all()
         )
 
+    def existing_ids(self, db: Session, ids: list[UUID]) -> set[UUID]:
+        return set(db.execute(select(BookCopy.id).where(BookCopy.id.in_(ids))).scalars().all())
+
+    def book_ids(self, db: Session, ids: Collection[UUID]) -> set[UUID]:
+        """Books the given copies belong to."""
+        if not ids:
+            return set()
+        return set(db.execute(select(BookCopy.book_id).where(BookCopy.id.in_(ids)).distinct()).scalars().all())
+
+    def exists_for_book(self, db: Session, book_id: UUID) -> bool:
+        return bool(db.execute(select(exists().where(BookCopy.book_id == book_id))).scalar())
+
     def get_by_copy_code(self, db: Session, copy_code: str) -> BookCopy | None:
         return db.execute(select(BookCopy).where(BookCopy.copy_code == copy_code)).scalar_one_or_none()
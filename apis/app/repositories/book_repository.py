@@ -1,11 +1,96 @@
 """Book repository - data access for books."""
 
+from collections.abc import Collection, Iterator
+from datetime import datetime
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import (
+    ColumnElement,
+    Double,
+    Row,
+    RowMapping,
+    Select,
+    cast,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
 from app.models import Book
+from app.repositories.change_counter import version_query
+from app.repositories.pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    key_values,
+    parse_float,
+    parse_uuid,
+)
+from app.repositories.upsert import inserted_flag
+
+SEARCH_MODES = ("fts", "fuzzy")
+
+
+def search_query(
+    q: str,
+    mode: str,
+    *,
+    limit: int,
+    after: tuple[float, UUID] | None = None,
+) -> Select[tuple[Book, float]]:
+    """(Book, score) best-first. `fts` ranks tsvector matches (GIN); `fuzzy` ranks trigram matches."""
+    score: ColumnElement[float]
+    match: ColumnElement[bool]
+    if mode == "fts":
+        tsq = func.websearch_to_tsquery("english", q)
+        score = func.ts_rank_cd(Book.search_vector, tsq)
+        match = Book.search_vector.op("@@")(tsq)
+    else:
+        score = func.greatest(func.similarity(Book.title, q), func.similarity(Book.author, q))
+        match = or_(
+            Book.title.op("%")(q),
+            Book.author.op("%")(q),
+            Book.title.icontains(q, autoescape=True),
+        )
+    # Both rankings are real (float4); the cursor carries a Python float, so rank and compare
+    # in double precision, or ties at the page edge would be skipped
+    score = cast(score, Double)
+    stmt = select(Book, score.label("score")).where(match).order_by(score.desc(), Book.id.desc()).limit(limit + 1)
+    if after is not None:
+        stmt = stmt.where(tuple_(score, Book.id) < tuple_(literal(after[0], Double), literal(after[1])))
+    return stmt
+
+
+def list_query(*, available_only: bool = False) -> Select[tuple[Book]]:
+    """Books by (title, id); `available_only` keeps those with a copy on the shelf."""
+    q = select(Book).order_by(Book.title, Book.id)
+    if available_only:
+        # Inlined, not bound: a prepared statement's generic plan must still match the partial index
+        q = q.where(Book.copies_available > literal_column("0"))
+    return q
+
+
+def decode_search_cursor(cursor: str) -> tuple[str, tuple[float, UUID]]:
+    mode, score, id = decode_cursor(cursor, 3)
+    if mode not in SEARCH_MODES:
+        raise InvalidCursorError("Invalid cursor")
+    return mode, (parse_float(score), parse_uuid(id))
+
+
+def paginate_search(
+    hits: list[tuple[Book, float]], mode: str, limit: int
+) -> tuple[list[tuple[Book, float]], str | None]:
+    if len(hits) <= limit:
+        return hits, None
+    hits = hits[:limit]
+    book, score = hits[-1]
+    return hits, encode_cursor(mode, str(score), book.id)
 
 
 class BookRepository:
@@ -14,15 +99,103 @@ class BookRepository:
     def create(self, db: Session, *, title: str, author: str, description: str | None = None, isbn: str | None = None) -> Book:
         book = Book(title=title, author=author, description=description, isbn=isbn)
         db.add(book)
-        db.commit()
-        db.refresh(book)
+        db.flush()
         return book
 
     def get_by_id(self, db: Session, id: UUID) -> Book | None:
         return db.execute(select(Book).where(Book.id == id)).scalar_one_or_none()
 
-    def list_all(self, db: Session) -> list[Book]:
-        return list(db.execute(select(Book).order_by(Book.title)).scalars().all())
+    def upsert_many(self, db: Session, rows: list[dict[str, Any]]) -> list[Row[tuple[UUID, str | None, bool]]]:
+        """Insert `rows` in one statement, updating the book that already has a row's isbn.
+
+        Returns (id, isbn, inserted) for every row written. A row identical to the stored
+        book is skipped by the conflict WHERE, so it keeps its updated_at and is not returned.
+        """
+        stmt = insert(Book).values(rows)
+        changed = tuple_(Book.title, Book.author, Book.description).is_distinct_from(
+            tuple_(stmt.excluded.title, stmt.excluded.author, stmt.excluded.description)
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Book.isbn],
+            set_={
+                "title": stmt.excluded.title,
+                "author": stmt.excluded.author,
+                "description": stmt.excluded.description,
+                "updated_at": func.now(),
+            },
+            where=changed,
+        )
+        return list(db.execute(stmt.returning(Book.id, Book.isbn, inserted_flag("books"))).all())
+
+    def ids_by_isbn(self, db: Session, isbns: Collection[str]) -> dict[str, UUID]:
+        if not isbns:
+            return {}
+        return {isbn: id for id, isbn in db.execute(select(Book.id, Book.isbn).where(Book.isbn.in_(isbns))).all()}
+
+    def existing_ids(self, db: Session, ids: Collection[UUID]) -> set[UUID]:
+        if not ids:
+            return set()
+        return set(db.execute(select(Book.id).where(Book.id.in_(ids))).scalars().all())
+
+    def version(self, db: Session) -> int:
+        """Changes to the book list so far; moves on every committed write it could show."""
+        return db.execute(version_query("books")).scalar_one()
+
+    def list_all(self, db: Session, *, available_only: bool = False) -> list[Book]:
+        return list(db.execute(list_query(available_only=available_only)).scalars().all())
+
+    def list_page(
+        self, db: Session, *, limit: int, cursor: str | None = None, available_only: bool = False
+    ) -> tuple[list[Book], str | None]:
+        """One page ordered by (title, id), served from ix_books_title_id or ix_books_available_title_id. Returns (books, next_cursor)."""
+        q = list_query(available_only=available_only).limit(limit + 1)
+        if cursor is not None:
+            title, id = decode_cursor(cursor, 2)
+            q = q.where(tuple_(Book.title, Book.id) > key_values(title, parse_uuid(id)))
+        books = list(db.execute(q).scalars().all())
+        if len(books) <= limit:
+            return books, None
+        books = books[:limit]
+        return books, encode_cursor(books[-1].title, books[-1].id)
+
+    def search(
+        self, db: Session, q: str, *, limit: int, cursor: str | None = None
+    ) -> tuple[list[tuple[Book, float]], str | None]:
+        """Ranked catalog search. Returns ([(book, score)], next_cursor).
+
+        Full-text matches first; if the query has none, fall back to trigram similarity
+        so typos and partial words still find something.
+        """
+        mode, after = decode_search_cursor(cursor) if cursor is not None else ("fts", None)
+        hits = [(b, s) for b, s in db.execute(search_query(q, mode, limit=limit, after=after)).all()]
+        if not hits and cursor is None:
+            mode = "fuzzy"
+            hits = [(b, s) for b, s in db.execute(search_query(q, mode, limit=limit)).all()]
+        return paginate_search(hits, mode, limit)
+
+    def iter_export_rows(
+        self,
+        db: Session,
+        *,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        batch_size: int = 1000,
+    ) -> Iterator[RowMapping]:
+        """Stream book columns from a server-side cursor, `batch_size` rows per fetch."""
+        q = select(
+            Book.id,
+            Book.title,
+            Book.author,
+            Book.description,
+            Book.isbn,
+            Book.created_at,
+            Book.updated_at,
+        ).order_by(Book.title, Book.id)
+        if created_from is not None:
+            q = q.where(Book.created_at >= created_from)
+        if created_to is not None:
+            q = q.where(Book.created_at < created_to)
+        yield from db.execute(q, execution_options={"yield_per": batch_size}).mappings()
 
     def update(
         self,
@@ -42,6 +215,5 @@ class BookRepository:
             book.description = description
         if isbn is not None:
             book.isbn = isbn
-        db.commit()
-        db.refresh(book)
+        db.flush()
         return book
@@ -0,0 +1,10 @@
+"""Helpers for the trigger-maintained change counters that version list ETags."""
+
+from sqlalchemy import Select, func, select
+
+from app.models import ChangeCounter
+
+
+def version_query(name: str) -> Select[tuple[int]]:
+    """Current value of a change counter: the sum of its slots, read off the primary key."""
+    return select(func.coalesce(func.sum(ChangeCounter.version), 0)).where(ChangeCounter.name == name)
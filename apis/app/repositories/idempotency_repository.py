@@ -0,0 +1,100 @@
+"""Idempotency key repository - claim, replay and expire stored POST outcomes."""
+
+from datetime import timedelta
+from typing import Any, cast
+
+from sqlalchemy import CursorResult, Delete, Insert, Select, Update, and_, delete, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models import IdempotencyKey
+
+
+def claim_query(*, key: str, request_hash: str, ttl: timedelta, lease: timedelta) -> Insert:
+    """Insert the key as pending, or take over a row that expired or that a previous attempt
+    at the same request left pending past its lease; RETURNING is empty otherwise.
+    """
+    stmt = insert(IdempotencyKey).values(
+        key=key,
+        request_hash=request_hash,
+        expires_at=func.now() + ttl,
+        locked_until=func.now() + lease,
+    )
+    lapsed = and_(
+        IdempotencyKey.status_code.is_(None),
+        IdempotencyKey.locked_until <= func.now(),
+        IdempotencyKey.request_hash == stmt.excluded.request_hash,
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[IdempotencyKey.key],
+        set_={
+            "request_hash": stmt.excluded.request_hash,
+            "status_code": None,
+            "body": None,
+            "created_at": func.now(),
+            "expires_at": stmt.excluded.expires_at,
+            "locked_until": stmt.excluded.locked_until,
+        },
+        where=or_(IdempotencyKey.expires_at <= func.now(), lapsed),
+    ).returning(IdempotencyKey.key)
+
+
+def lock_timeout_query(seconds: float) -> Select[tuple[str]]:
+    """Bound how long the current transaction waits for a lock (SET LOCAL takes no parameters)."""
+    return select(func.set_config("lock_timeout", f"{max(int(seconds * 1000), 1)}ms", True))
+
+
+def get_query(key: str) -> Select[tuple[IdempotencyKey]]:
+    # populate_existing: a duplicate polling for the outcome must see the row as committed now
+    return select(IdempotencyKey).where(IdempotencyKey.key == key).execution_options(populate_existing=True)
+
+
+def save_query(key: str, *, status_code: int, body: str) -> Update:
+    return (
+        update(IdempotencyKey)
+        .where(IdempotencyKey.key == key)
+        .values(status_code=status_code, body=body, locked_until=None)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def release_query(key: str) -> Delete:
+    return (
+        delete(IdempotencyKey)
+        .where(IdempotencyKey.key == key, IdempotencyKey.status_code.is_(None))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def purge_expired_query(limit: int) -> Delete:
+    # SKIP LOCKED: never wait on an expired key that a new request is taking over
+    expired = (
+        select(IdempotencyKey.key)
+        .where(IdempotencyKey.expires_at <= func.now())
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    return delete(IdempotencyKey).where(IdempotencyKey.key.in_(expired.scalar_subquery()))
+
+
+class IdempotencyRepository:
+    """Stored outcomes of POSTs sent with an Idempotency-Key."""
+
+    def claim(self, db: Session, *, key: str, request_hash: str, ttl: timedelta, lease: timedelta) -> bool:
+        """True if this session now holds `key` (pending until `save`); False if another row holds it."""
+        return db.execute(claim_query(key=key, request_hash=request_hash, ttl=ttl, lease=lease)).first() is not None
+
+    def get(self, db: Session, key: str) -> IdempotencyKey | None:
+        return db.execute(get_query(key)).scalar_one_or_none()
+
+    def save(self, db: Session, key: str, *, status_code: int, body: str) -> None:
+        db.execute(save_query(key, status_code=status_code, body=body))
+
+    def release(self, db: Session, key: str) -> None:
+        """Delete the pending row for `key`, so the next attempt claims it at once."""
+        db.execute(release_query(key))
+
+    def purge_expired(self, db: Session, *, limit: int) -> int:
+        """Delete up to `limit` expired keys; returns how many were deleted."""
+        result = db.execute(purge_expired_query(limit).execution_options(synchronize_session=False))
+        return cast(CursorResult[Any], result).rowcount
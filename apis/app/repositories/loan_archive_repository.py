@@ -0,0 +1,87 @@
+"""Loan archive repository - move returned loans from loans_hot into the loans_archive partitions."""
+
+from datetime import date, datetime
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, Select, func, select, text, tuple_, update
+from sqlalchemy.orm import Session
+
+from app.db.schema import archive_partition_ddl
+from app.models import Loan
+from app.repositories.idempotency_repository import lock_timeout_query
+from app.repositories.pagination import key_values
+
+# Creating a partition briefly locks loans_archive against every query that reads it: give up
+# rather than queue behind a long read (and block everything queued behind the DDL)
+PARTITION_LOCK_TIMEOUT = 5.0
+
+ARCHIVE_PARTITIONS_QUERY = text(
+    "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+    "WHERE i.inhparent = to_regclass('loans_archive')"
+)
+
+
+def archive_filters(cutoff: datetime) -> list[ColumnElement[bool]]:
+    """Hot loans returned before `cutoff`. The borrowed_at bound is implied (borrowed_at <=
+    returned_at) but lets the walk of ix_loans_borrowed_at_id stop at the cutoff."""
+    return [Loan.archived.is_(False), Loan.returned_at < cutoff, Loan.borrowed_at < cutoff]
+
+
+def archive_chunk_query(
+    *, cutoff: datetime, after: tuple[datetime, UUID] | None, limit: int
+) -> Select[tuple[int, int, datetime, UUID]]:
+    """Archive the next `limit` loans after `after` in (borrowed_at, id) order, in one statement.
+
+    Setting archived moves each row from loans_hot to its loans_archive month. updated_at is
+    kept: the loan itself has not changed. Returns (scanned, moved, last borrowed_at, last
+    id); no row once the walk is past the last loan to archive.
+    """
+    chunk = select(Loan.id, Loan.borrowed_at).where(*archive_filters(cutoff))
+    if after is not None:
+        chunk = chunk.where(tuple_(Loan.borrowed_at, Loan.id) > key_values(*after))
+    # SKIP LOCKED: a loan being written right now is left for the next run
+    chunk_cte = chunk.order_by(Loan.borrowed_at, Loan.id).limit(limit).with_for_update(skip_locked=True).cte("chunk")
+    moved = (
+        update(Loan)
+        .where(Loan.id.in_(select(chunk_cte.c.id)), Loan.archived.is_(False))
+        .values(archived=True, updated_at=Loan.updated_at)
+        .returning(Loan.id)
+        .cte("moved")
+    )
+    last = (
+        select(chunk_cte.c.borrowed_at, chunk_cte.c.id)
+        .order_by(chunk_cte.c.borrowed_at.desc(), chunk_cte.c.id.desc())
+        .limit(1)
+        .subquery("last")
+    )
+    return select(
+        select(func.count()).select_from(chunk_cte).scalar_subquery().label("scanned"),
+        select(func.count()).select_from(moved).scalar_subquery().label("moved"),
+        last.c.borrowed_at,
+        last.c.id,
+    )
+
+
+class LoanArchiveRepository:
+    """Partitions of loans_archive and the moves into them."""
+
+    def oldest_to_archive(self, db: Session, cutoff: datetime) -> datetime | None:
+        """borrowed_at of the first loan the archival job would move, or None."""
+        return db.execute(select(func.min(Loan.borrowed_at)).where(*archive_filters(cutoff))).scalar_one()
+
+    def partition_names(self, db: Session) -> set[str]:
+        return set(db.execute(ARCHIVE_PARTITIONS_QUERY).scalars().all())
+
+    def create_partition(self, db: Session, month: date) -> None:
+        db.execute(lock_timeout_query(PARTITION_LOCK_TIMEOUT))
+        db.execute(text(archive_partition_ddl(month)))
+
+    def archive_chunk(
+        self, db: Session, *, cutoff: datetime, after: tuple[datetime, UUID] | None, limit: int
+    ) -> tuple[int, int, tuple[datetime, UUID] | None]:
+        """Returns (scanned, moved, cursor for the next chunk); the cursor is None when the walk is done."""
+        row = db.execute(archive_chunk_query(cutoff=cutoff, after=after, limit=limit)).one_or_none()
+        if row is None:
+            return 0, 0, None
+        scanned, moved, borrowed_at, id = row
+        return scanned, moved, (borrowed_at, id)
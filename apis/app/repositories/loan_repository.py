@@ -1,12 +1,187 @@
 """Loan repository - data access for loans."""
 
+from collections.abc import Iterator
+from dataclasses import dataclass
 from datetime import datetime
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import ColumnElement, RowMapping, Select, Update, exists, func, literal, select, true, tuple_, update
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import ReturningInsert
 
-from app.models import BookCopy, Loan
+from app.models import Book, BookCopy, Loan, Member
+from app.repositories.change_counter import version_query
+from app.repositories.pagination import decode_cursor, encode_cursor, key_values, parse_datetime, parse_uuid
+
+
+@dataclass(frozen=True)
+class LoanFilters:
+    """Loan list filters; date ranges are half-open [from, to)."""
+
+    member_id: UUID | None = None
+    book_id: UUID | None = None
+    copy_id: UUID | None = None
+    active_only: bool = False
+    borrowed_from: datetime | None = None
+    borrowed_to: datetime | None = None
+    due_from: datetime | None = None
+    due_to: datetime | None = None
+
+
+# id, member_id, member_name, copy_id, copy_code, book_id, book_title, book_author, borrowed_at, due_at, returned_at
+DetailsSelect = Select[tuple[UUID, UUID, str, UUID, str, UUID, str, str, datetime, datetime, datetime | None]]
+
+
+def list_filters(filters: LoanFilters) -> list[ColumnElement[bool]]:
+    conditions: list[ColumnElement[bool]] = []
+    if filters.member_id is not None:
+        conditions.append(Loan.member_id == filters.member_id)
+    if filters.copy_id is not None:
+        conditions.append(Loan.copy_id == filters.copy_id)
+    if filters.book_id is not None:
+        # Semi-join on ix_book_copies_book_id -> ix_loans_copy_id; no join needed to filter
+        conditions.append(Loan.copy_id.in_(select(BookCopy.id).where(BookCopy.book_id == filters.book_id)))
+    if filters.active_only:
+        conditions.append(Loan.returned_at.is_(None))
+    if filters.borrowed_from is not None:
+        conditions.append(Loan.borrowed_at >= filters.borrowed_from)
+    if filters.borrowed_to is not None:
+        conditions.append(Loan.borrowed_at < filters.borrowed_to)
+    if filters.due_from is not None:
+        conditions.append(Loan.due_at >= filters.due_from)
+    if filters.due_to is not None:
+        conditions.append(Loan.due_at < filters.due_to)
+    return conditions
+
+
+def details_query() -> DetailsSelect:
+    """Loans joined to exactly the member/copy/book columns LoanWithDetailsResponse needs.
+
+    Selecting columns instead of joinedloading entities keeps wide columns such as
+    Book.description off the wire and skips building ORM identities for every row.
+    """
+    return (
+        select(
+            Loan.id,
+            Loan.member_id,
+            Member.name.label("member_name"),
+            Loan.copy_id,
+            BookCopy.copy_code,
+            BookCopy.book_id,
+            Book.title.label("book_title"),
+            Book.author.label("book_author"),
+            Loan.borrowed_at,
+            Loan.due_at,
+            Loan.returned_at,
+        )
+        .join(Member, Member.id == Loan.member_id)
+        .join(BookCopy, BookCopy.id == Loan.copy_id)
+        .join(Book, Book.id == BookCopy.book_id)
+    )
+
+
+def list_query(filters: LoanFilters) -> DetailsSelect:
+    return details_query().where(*list_filters(filters)).order_by(Loan.borrowed_at.desc(), Loan.id.desc())
+
+
+def page_query(filters: LoanFilters, *, limit: int, cursor: str | None) -> DetailsSelect:
+    q = list_query(filters).limit(limit + 1)
+    if cursor is not None:
+        borrowed_at, id = decode_cursor(cursor, 2)
+        q = q.where(tuple_(Loan.borrowed_at, Loan.id) < key_values(parse_datetime(borrowed_at), parse_uuid(id)))
+    return q
+
+
+def split_page(rows: list[RowMapping], limit: int, key: str = "borrowed_at") -> tuple[list[RowMapping], str | None]:
+    """Trim the look-ahead row fetched by a page query and derive the next cursor from (key, id)."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1][key], rows[-1]["id"])
+
+
+def overdue_filters(as_of: ColumnElement[datetime] | datetime) -> list[ColumnElement[bool]]:
+    """Loans still out and due before `as_of`; `returned_at IS NULL` matches ix_loans_overdue."""
+    return [Loan.returned_at.is_(None), Loan.due_at < as_of]
+
+
+def overdue_page_query(*, limit: int, cursor: str | None) -> DetailsSelect:
+    """Overdue loans, longest overdue first: a walk of ix_loans_overdue in (due_at, id) order."""
+    q = details_query().where(*overdue_filters(func.now())).order_by(Loan.due_at, Loan.id).limit(limit + 1)
+    if cursor is not None:
+        due_at, id = decode_cursor(cursor, 2)
+        q = q.where(tuple_(Loan.due_at, Loan.id) > key_values(parse_datetime(due_at), parse_uuid(id)))
+    return q
+
+
+def member_summary_query(member_id: UUID, *, recent: int) -> Select[Any]:
+    """One member's loan counts joined to their `recent` newest active loans (detail columns).
+
+    The counts aggregate the member's loans from ix_loans_member_borrowed_at, whose
+    INCLUDE columns make it an index-only scan. There is at least one row (detail columns
+    NULL if nothing is out), or none if the member does not exist.
+    """
+    active = Loan.returned_at.is_(None)
+    stats = (
+        select(
+            func.count(Loan.id).label("lifetime_loans"),
+            func.count(Loan.id).filter(active).label("active_loans"),
+            func.count(Loan.id).filter(active, Loan.due_at < func.now()).label("overdue_loans"),
+            func.min(Loan.due_at).filter(active).label("next_due_at"),
+        )
+        .select_from(Member)
+        .outerjoin(Loan, Loan.member_id == Member.id)
+        .where(Member.id == member_id)
+        .group_by(Member.id)
+        .cte("stats")
+    )
+    latest = (
+        details_query()
+        .where(Loan.member_id == member_id, active)
+        .order_by(Loan.borrowed_at.desc(), Loan.id.desc())
+        .limit(recent)
+        .subquery("latest")
+    )
+    return (
+        select(stats, latest)
+        .select_from(stats.outerjoin(latest, true()))
+        .order_by(latest.c.borrowed_at.desc(), latest.c.id.desc())
+    )
+
+
+def create_many_query(*, member_id: UUID, copy_ids: list[UUID], due_at: datetime) -> ReturningInsert[Any]:
+    """One INSERT ... SELECT borrowing every listed copy that exists and is not already on loan.
+
+    Copies on loan (including ones taken by a concurrent transaction) conflict on
+    ix_loans_active_copy and are skipped by DO NOTHING instead of failing the statement.
+    The index is on the loans_hot partition, not on loans, so it cannot be named as the
+    conflict target; DO NOTHING without one checks every unique index of the partition.
+    """
+    requested = select(
+        func.gen_random_uuid(),
+        literal(member_id, PG_UUID(as_uuid=True)),
+        BookCopy.id,
+        literal(due_at, Loan.due_at.type),
+    ).where(BookCopy.id.in_(copy_ids))
+    return (
+        insert(Loan)
+        .from_select(["id", "member_id", "copy_id", "due_at"], requested)
+        .on_conflict_do_nothing()
+        .returning(*Loan.__table__.c)
+    )
+
+
+def return_many_query(loan_ids: list[UUID]) -> Update:
+    """One UPDATE ... RETURNING closing every listed loan that is still out."""
+    return (
+        update(Loan)
+        .where(Loan.id.in_(loan_ids), Loan.returned_at.is_(None))
+        .values(returned_at=func.now(), updated_at=func.now())
+        .returning(*Loan.__table__.c)
+    )
 
 
 class LoanRepository:
@@ -22,44 +197,93 @@ class LoanRepository:
     ) -> Loan:
         loan = Loan(member_id=member_id, copy_id=copy_id, due_at=due_at)
         db.add(loan)
-        db.commit()
-        db.refresh(loan)
+        db.flush()
         return loan
 
+    def create_many(
+        self,
+        db: Session,
+        *,
+        member_id: UUID,
+        copy_ids: list[UUID],
+        due_at: datetime,
+    ) -> list[RowMapping]:
+        """Borrow the copies that are free; returns the created loan rows (see create_many_query)."""
+        q = create_many_query(member_id=member_id, copy_ids=copy_ids, due_at=due_at)
+        return list(db.execute(q).mappings().all())
+
     def get_by_id(self, db: Session, id: UUID) -> Loan | None:
         return db.execute(select(Loan).where(Loan.id == id)).scalar_one_or_none()
 
-    def get_active_copy_ids(self, db: Session) -> set[UUID]:
-        """Copy IDs that are currently on loan (not yet returned)."""
-        rows = db.execute(
-            select(Loan.copy_id).where(Loan.returned_at.is_(None))
-        ).scalars().all()
-        # Single-column select: scalars().all() may return UUIDs or Row objects depending on driver
-        return {r[0] if not isinstance(r, UUID) else r for r in rows}
+    def existing_ids(self, db: Session, ids: list[UUID]) -> set[UUID]:
+        return set(db.execute(select(Loan.id).where(Loan.id.in_(ids))).scalars().all())
 
-    def list(
+    def claim_available_copy_id(self, db: Session, book_id: UUID) -> UUID | None:
+        """Lock and return one copy of the book with no active loan, or None.
+
+        Single statement: the book's copies (ix_book_copies_book_id) anti-joined against
+        active loans (ix_loans_active_copy). SKIP LOCKED lets concurrent borrowers of the
+        same title take different copies instead of queueing on the same row. The lock is
+        held until the caller's transaction ends.
+        """
+        on_loan = exists().where(Loan.copy_id == BookCopy.id, Loan.returned_at.is_(None))
+        q = (
+            select(BookCopy.id)
+            .where(BookCopy.book_id == book_id, ~on_loan)
+            .order_by(BookCopy.copy_code)
+            .limit(1)
+            .with_for_update(skip_locked=True, of=BookCopy)
+        )
+        return db.execute(q).scalar_one_or_none()
+
+    def version(self, db: Session) -> int:
+        """Changes to the loan list so far; moves on every committed write it could show."""
+        return db.execute(version_query("loans")).scalar_one()
+
+    def list_page(
         self,
         db: Session,
+        filters: LoanFilters,
         *,
-        member_id: UUID | None = None,
-        active_only: bool = False,
-    ) -> list[Loan]:
-        q = (
-            select(Loan)
-            .options(
-                joinedload(Loan.member),
-                joinedload(Loan.copy).joinedload(BookCopy.book),
-            )
-            .order_by(Loan.borrowed_at.desc())
-        )
-        if member_id is not None:
-            q = q.where(Loan.member_id == member_id)
-        if active_only:
-            q = q.where(Loan.returned_at.is_(None))
-        return list(db.execute(q).scalars().all())
+        limit: int,
+        cursor: str | None = None,
+    ) -> tuple[list[RowMapping], str | None]:
+        """One page of detail rows ordered by (borrowed_at, id) descending. Returns (rows, next_cursor)."""
+        rows = db.execute(page_query(filters, limit=limit, cursor=cursor)).mappings().all()
+        return split_page(list(rows), limit)
+
+    def member_summary(self, db: Session, member_id: UUID, *, recent: int) -> list[RowMapping]:
+        """Rows of member_summary_query; empty if the member does not exist."""
+        return list(db.execute(member_summary_query(member_id, recent=recent)).mappings().all())
+
+    def overdue_page(self, db: Session, *, limit: int, cursor: str | None = None) -> tuple[list[RowMapping], str | None]:
+        """One page of overdue detail rows ordered by (due_at, id). Returns (rows, next_cursor)."""
+        rows = db.execute(overdue_page_query(limit=limit, cursor=cursor)).mappings().all()
+        return split_page(list(rows), limit, "due_at")
+
+    def iter_export_rows(
+        self,
+        db: Session,
+        *,
+        borrowed_from: datetime | None = None,
+        borrowed_to: datetime | None = None,
+        batch_size: int = 1000,
+    ) -> Iterator[RowMapping]:
+        """Stream loans with member/copy/book details from a server-side cursor, oldest first."""
+        filters = LoanFilters(borrowed_from=borrowed_from, borrowed_to=borrowed_to)
+        q = details_query().where(*list_filters(filters)).order_by(Loan.borrowed_at, Loan.id)
+        yield from db.execute(q, execution_options={"yield_per": batch_size}).mappings()
 
     def mark_returned(self, db: Session, loan: Loan, returned_at: datetime) -> Loan:
         loan.returned_at = returned_at
-        db.commit()
-        db.refresh(loan)
+        db.flush()
         return loan
+
+    def mark_returned_many(self, db: Session, loan_ids: list[UUID]) -> list[RowMapping]:
+        """Return the listed loans that are still out; returns their updated rows."""
+        return list(db.execute(return_many_query(loan_ids)).mappings().all())
+
+    # Shadows the builtin inside the class body: keep it the last method.
+    def list(self, db: Session, filters: LoanFilters) -> list[RowMapping]:
+        """Detail rows (see details_query), newest first."""
+        return list(db.execute(list_query(filters)).mappings().all())
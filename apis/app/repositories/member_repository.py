@@ -1,11 +1,18 @@
 """Member repository - data access for members."""
 
+from collections.abc import Collection, Iterator
+from datetime import datetime
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Row, RowMapping, func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
 from app.models import Member
+from app.repositories.change_counter import version_query
+from app.repositories.pagination import decode_cursor, encode_cursor, key_values, parse_uuid
+from app.repositories.upsert import inserted_flag
 
 
 class MemberRepository:
@@ -21,15 +28,73 @@ class MemberRepository:
     ) -> Member:
         member = Member(name=name, email=email, phone=phone)
         db.add(member)
-        db.commit()
-        db.refresh(member)
+        db.flush()
         return member
 
     def get_by_id(self, db: Session, id: UUID) -> Member | None:
         return db.execute(select(Member).where(Member.id == id)).scalar_one_or_none()
 
+    def upsert_many(self, db: Session, rows: list[dict[str, Any]]) -> list[Row[tuple[UUID, str | None, bool]]]:
+        """Insert `rows` in one statement, updating the member that already has a row's email.
+
+        Returns (id, email, inserted) for every row written; unchanged members are not returned.
+        """
+        stmt = insert(Member).values(rows)
+        changed = tuple_(Member.name, Member.phone).is_distinct_from(tuple_(stmt.excluded.name, stmt.excluded.phone))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Member.email],
+            set_={"name": stmt.excluded.name, "phone": stmt.excluded.phone, "updated_at": func.now()},
+            where=changed,
+        )
+        return list(db.execute(stmt.returning(Member.id, Member.email, inserted_flag("members"))).all())
+
+    def ids_by_email(self, db: Session, emails: Collection[str]) -> dict[str, UUID]:
+        if not emails:
+            return {}
+        rows = db.execute(select(Member.id, Member.email).where(Member.email.in_(emails))).all()
+        return {email: id for id, email in rows}
+
+    def version(self, db: Session) -> int:
+        """Changes to the member list so far; moves on every committed write it could show."""
+        return db.execute(version_query("members")).scalar_one()
+
     def list_all(self, db: Session) -> list[Member]:
-        return list(db.execute(select(Member).order_by(Member.name)).scalars().all())
+        return list(db.execute(select(Member).order_by(Member.name, Member.id)).scalars().all())
+
+    def list_page(self, db: Session, *, limit: int, cursor: str | None = None) -> tuple[list[Member], str | None]:
+        """One page ordered by (name, id), served from ix_members_name_id. Returns (members, next_cursor)."""
+        q = select(Member).order_by(Member.name, Member.id).limit(limit + 1)
+        if cursor is not None:
+            name, id = decode_cursor(cursor, 2)
+            q = q.where(tuple_(Member.name, Member.id) > key_values(name, parse_uuid(id)))
+        members = list(db.execute(q).scalars().all())
+        if len(members) <= limit:
+            return members, None
+        members = members[:limit]
+        return members, encode_cursor(members[-1].name, members[-1].id)
+
+    def iter_export_rows(
+        self,
+        db: Session,
+        *,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        batch_size: int = 1000,
+    ) -> Iterator[RowMapping]:
+        """Stream member columns from a server-side cursor, `batch_size` rows per fetch."""
+        q = select(
+            Member.id,
+            Member.name,
+            Member.email,
+            Member.phone,
+            Member.created_at,
+            Member.updated_at,
+        ).order_by(Member.name, Member.id)
+        if created_from is not None:
+            q = q.where(Member.created_at >= created_from)
+        if created_to is not None:
+            q = q.where(Member.created_at < created_to)
+        yield from db.execute(q, execution_options={"yield_per": batch_size}).mappings()
 
     def update(
         self,
@@ -46,6 +111,5 @@ class MemberRepository:
             member.email = email
         if phone is not None:
             member.phone = phone
-        db.commit()
-        db.refresh(member)
+        db.flush()
         return member
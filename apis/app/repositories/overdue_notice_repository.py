@@ -0,0 +1,63 @@
+"""Overdue notice repository - queue overdue loans into the notices outbox."""
+
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models import Loan, OverdueNotice
+from app.repositories.loan_repository import overdue_filters
+from app.repositories.pagination import key_values
+
+
+def queue_chunk_query(
+    *, as_of: datetime, after: tuple[datetime, UUID] | None, limit: int
+) -> Select[tuple[int, int, datetime, UUID]]:
+    """Queue notices for the next `limit` overdue loans after `after`, in one statement.
+
+    Reads the chunk from ix_loans_overdue, inserts a notice per loan (existing ones are
+    skipped by DO NOTHING) and returns (scanned, queued, last due_at, last id); no row
+    once the walk is past the last overdue loan.
+    """
+    chunk = select(Loan.id, Loan.member_id, Loan.due_at).where(*overdue_filters(as_of))
+    if after is not None:
+        chunk = chunk.where(tuple_(Loan.due_at, Loan.id) > key_values(*after))
+    chunk_cte = chunk.order_by(Loan.due_at, Loan.id).limit(limit).cte("chunk")
+    queued = (
+        insert(OverdueNotice)
+        .from_select(
+            ["id", "loan_id", "member_id", "due_at"],
+            select(func.gen_random_uuid(), chunk_cte.c.id, chunk_cte.c.member_id, chunk_cte.c.due_at),
+        )
+        .on_conflict_do_nothing(index_elements=[OverdueNotice.loan_id, OverdueNotice.due_at])
+        .returning(OverdueNotice.id)
+        .cte("queued")
+    )
+    last = (
+        select(chunk_cte.c.due_at, chunk_cte.c.id)
+        .order_by(chunk_cte.c.due_at.desc(), chunk_cte.c.id.desc())
+        .limit(1)
+        .subquery("last")
+    )
+    return select(
+        select(func.count()).select_from(chunk_cte).scalar_subquery().label("scanned"),
+        select(func.count()).select_from(queued).scalar_subquery().label("queued"),
+        last.c.due_at,
+        last.c.id,
+    )
+
+
+class OverdueNoticeRepository:
+    """Outbox rows for overdue loans."""
+
+    def queue_chunk(
+        self, db: Session, *, as_of: datetime, after: tuple[datetime, UUID] | None, limit: int
+    ) -> tuple[int, int, tuple[datetime, UUID] | None]:
+        """Returns (scanned, queued, cursor for the next chunk); the cursor is None when the walk is done."""
+        row = db.execute(queue_chunk_query(as_of=as_of, after=after, limit=limit)).one_or_none()
+        if row is None:
+            return 0, 0, None
+        scanned, queued, due_at, id = row
+        return scanned, queued, (due_at, id)
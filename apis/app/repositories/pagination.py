@@ -0,0 +1,61 @@
+"""Keyset pagination helpers - opaque cursors over (sort key, id)."""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import literal, tuple_
+from sqlalchemy.sql.elements import Tuple
+
+MAX_PAGE_SIZE = 500
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(*values: str | datetime | UUID) -> str:
+    """Encode the sort key of the last row on a page as an opaque URL-safe token."""
+    raw = [v.isoformat() if isinstance(v, datetime) else str(v) for v in values]
+    payload = json.dumps(raw, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list[str]:
+    """Decode a token from encode_cursor; expects exactly `size` values."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
+    if not isinstance(values, list) or len(values) != size or not all(isinstance(v, str) for v in values):
+        raise InvalidCursorError("Invalid cursor")
+    return values
+
+
+def key_values(*values: object) -> Tuple:
+    """Decoded cursor values as a row value to compare a `tuple_` sort key against, each bound as a literal."""
+    return tuple_(*(literal(v) for v in values))
+
+
+def parse_uuid(value: str) -> UUID:
+    try:
+        return UUID(value)
+    except ValueError as e:
+        raise InvalidCursorError("Invalid cursor") from e
+
+
+def parse_float(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError as e:
+        raise InvalidCursorError("Invalid cursor") from e
+
+
+def parse_datetime(value: str) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError as e:
+        raise InvalidCursorError("Invalid cursor") from e
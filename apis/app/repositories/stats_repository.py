@@ -0,0 +1,116 @@
+"""Stats repository - reads of the circulation materialized views and their refresh."""
+
+from datetime import date
+from typing import Any
+
+from sqlalchemy import BigInteger, ColumnElement, Date, DateTime, Float, RowMapping, Select, column, func, select, table, text
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Session
+
+from app.db.schema import STATS_VIEWS
+from app.models import Book, Member
+
+# The views are created by migrate.py (app.db.schema.STATS_VIEWS), not by create_all
+book_loans = table(
+    "stats_book_loans",
+    column("book_id", PG_UUID(as_uuid=True)),
+    column("loans", BigInteger),
+    column("last_borrowed_at", DateTime(timezone=True)),
+)
+loans_monthly = table(
+    "stats_loans_monthly",
+    column("month", Date),
+    column("loans", BigInteger),
+    column("returned", BigInteger),
+    column("returned_seconds", Float),
+)
+member_activity = table(
+    "stats_member_activity",
+    column("member_id", PG_UUID(as_uuid=True)),
+    column("loans", BigInteger),
+    column("active_loans", BigInteger),
+    column("last_borrowed_at", DateTime(timezone=True)),
+)
+
+SECONDS_PER_DAY = 86400.0
+
+
+def _average_days(seconds: ColumnElement[Any], returned: ColumnElement[Any]) -> ColumnElement[Any]:
+    """Average in days; NULL when no loan was returned."""
+    return seconds / func.nullif(returned, 0) / SECONDS_PER_DAY
+
+
+def top_books_query(limit: int) -> Select[Any]:
+    """The `limit` most borrowed books: a walk of ix_stats_book_loans_rank plus book primary-key lookups."""
+    return (
+        select(Book.id.label("book_id"), Book.title, Book.author, book_loans.c.loans, book_loans.c.last_borrowed_at)
+        .join(Book, Book.id == book_loans.c.book_id)
+        .order_by(book_loans.c.loans.desc(), book_loans.c.book_id)
+        .limit(limit)
+    )
+
+
+def _month_range(q: Select[Any], month_from: date | None, month_to: date | None) -> Select[Any]:
+    if month_from is not None:
+        q = q.where(loans_monthly.c.month >= month_from)
+    if month_to is not None:
+        q = q.where(loans_monthly.c.month < month_to)
+    return q
+
+
+def monthly_query(*, month_from: date | None, month_to: date | None) -> Select[Any]:
+    q = select(
+        loans_monthly.c.month,
+        loans_monthly.c.loans,
+        loans_monthly.c.returned,
+        _average_days(loans_monthly.c.returned_seconds, loans_monthly.c.returned).label("average_days"),
+    ).order_by(loans_monthly.c.month)
+    return _month_range(q, month_from, month_to)
+
+
+def duration_query(*, month_from: date | None, month_to: date | None) -> Select[Any]:
+    """Average loan duration over the months' returned loans, summed from the monthly rows."""
+    returned = func.coalesce(func.sum(loans_monthly.c.returned), 0).cast(BigInteger)
+    q = select(
+        returned.label("returned"),
+        _average_days(func.sum(loans_monthly.c.returned_seconds), returned).label("average_days"),
+    )
+    return _month_range(q, month_from, month_to)
+
+
+def top_members_query(limit: int) -> Select[Any]:
+    """The `limit` most active members: a walk of ix_stats_member_activity_rank plus member lookups."""
+    return (
+        select(
+            Member.id.label("member_id"),
+            Member.name,
+            member_activity.c.loans,
+            member_activity.c.active_loans,
+            member_activity.c.last_borrowed_at,
+        )
+        .join(Member, Member.id == member_activity.c.member_id)
+        .order_by(member_activity.c.loans.desc(), member_activity.c.member_id)
+        .limit(limit)
+    )
+
+
+class StatsRepository:
+    """Circulation statistics, as of the last refresh of each view."""
+
+    def top_books(self, db: Session, limit: int) -> list[RowMapping]:
+        return list(db.execute(top_books_query(limit)).mappings().all())
+
+    def monthly(self, db: Session, *, month_from: date | None = None, month_to: date | None = None) -> list[RowMapping]:
+        return list(db.execute(monthly_query(month_from=month_from, month_to=month_to)).mappings().all())
+
+    def duration(self, db: Session, *, month_from: date | None = None, month_to: date | None = None) -> RowMapping:
+        return db.execute(duration_query(month_from=month_from, month_to=month_to)).mappings().one()
+
+    def top_members(self, db: Session, limit: int) -> list[RowMapping]:
+        return list(db.execute(top_members_query(limit)).mappings().all())
+
+    def refresh(self, db: Session, view: str) -> None:
+        """Recompute one view. CONCURRENTLY keeps it readable meanwhile and only writes changed rows."""
+        if view not in STATS_VIEWS:
+            raise ValueError(f"Unknown stats view: {view}")
+        db.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view}"))
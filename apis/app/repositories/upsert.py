@@ -0,0 +1,12 @@
+"""Helpers for INSERT ... ON CONFLICT DO UPDATE statements."""
+
+from sqlalchemy import Boolean, Label, literal_column
+
+
+def inserted_flag(table: str) -> Label[bool]:
+    """RETURNING column that is true for rows the statement inserted, false for rows it updated.
+
+    A freshly inserted tuple has no deleting/locking transaction, so its xmax is 0; the
+    conflict path locks the existing row and sets it.
+    """
+    return literal_column(f"({table}.xmax = 0)", Boolean).label("inserted")
@@ -32,7 +32,15 @@ class BookResponse(BaseModel):
     author: str
     description: str | None
     isbn: str | None
+    copies_total: int
+    copies_available: int
     created_at: datetime
     updated_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+class BookSearchResult(BookResponse):
+    """Book in search results, with its relevance score (higher is better)."""
+
+    score: float
@@ -0,0 +1,17 @@
+"""Catalog cache stats response schema."""
+
+from pydantic import BaseModel, Field
+
+
+class CacheStatsResponse(BaseModel):
+    """Counters for this worker's catalog cache."""
+
+    enabled: bool
+    size: int
+    max_entries: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    coalesced: int = Field(..., description="Misses that waited on another request's load instead of querying")
+    evictions: int
+    invalidations: int
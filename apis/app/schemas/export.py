@@ -0,0 +1,14 @@
+"""Export format schema."""
+
+from enum import Enum
+
+
+class ExportFormat(str, Enum):
+    """Supported bulk export encodings."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+    @property
+    def media_type(self) -> str:
+        return "application/x-ndjson" if self is ExportFormat.NDJSON else "text/csv"
@@ -0,0 +1,65 @@
+"""Bulk import request/response schemas."""
+
+from enum import Enum
+from uuid import UUID
+
+from pydantic import BaseModel, Field, model_validator
+
+
+class ImportFormat(str, Enum):
+    """Accepted bulk import encodings, chosen by the request's Content-Type."""
+
+    JSON = "json"
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+    @classmethod
+    def from_content_type(cls, content_type: str | None) -> "ImportFormat | None":
+        media_type = (content_type or "").split(";")[0].strip().lower()
+        return {
+            "application/json": cls.JSON,
+            "application/x-ndjson": cls.NDJSON,
+            "text/csv": cls.CSV,
+        }.get(media_type)
+
+
+class BookCopyImport(BaseModel):
+    """One copy to import; the book is given by id or by isbn."""
+
+    copy_code: str = Field(..., min_length=1, max_length=64)
+    book_id: UUID | None = None
+    isbn: str | None = Field(None, max_length=20)
+
+    @model_validator(mode="after")
+    def _has_book(self) -> "BookCopyImport":
+        if self.book_id is None and self.isbn is None:
+            raise ValueError("book_id or isbn is required")
+        return self
+
+
+class ImportStatus(str, Enum):
+    """Outcome of one imported row."""
+
+    CREATED = "created"
+    UPDATED = "updated"
+    UNCHANGED = "unchanged"
+    ERROR = "error"
+
+
+class ImportRowResult(BaseModel):
+    """Outcome of one row; `row` is its 0-based position in the upload."""
+
+    row: int
+    status: ImportStatus
+    id: UUID | None = None
+    error: str | None = None
+
+
+class ImportResponse(BaseModel):
+    """Totals and per-row outcomes of a bulk import."""
+
+    created: int
+    updated: int
+    unchanged: int
+    failed: int
+    rows: list[ImportRowResult]
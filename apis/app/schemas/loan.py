@@ -1,6 +1,7 @@
 """Loan request/response schemas."""
 
 from datetime import datetime
+from enum import Enum
 from uuid import UUID
 
 from pydantic import BaseModel, Field
@@ -53,3 +54,46 @@ class LoanWithDetailsResponse(BaseModel):
     returned_at: datetime | None
 
     model_config = {"from_attributes": True}
+
+
+# Upper bound on items per desk transaction
+MAX_BATCH_ITEMS = 50
+
+
+class LoanBatchCreate(BaseModel):
+    """Payload to borrow several copies for one member in one transaction."""
+
+    member_id: UUID
+    copy_ids: list[UUID] = Field(..., min_length=1, max_length=MAX_BATCH_ITEMS)
+    due_at: datetime = Field(..., description="When the books must be returned")
+
+
+class LoanBatchReturn(BaseModel):
+    """Payload to return several loans in one transaction."""
+
+    loan_ids: list[UUID] = Field(..., min_length=1, max_length=MAX_BATCH_ITEMS)
+
+
+class LoanBatchStatus(str, Enum):
+    """Outcome of one item in a batch checkout or return."""
+
+    OK = "ok"
+    CONFLICT = "conflict"
+    NOT_FOUND = "not_found"
+
+
+class LoanBatchItem(BaseModel):
+    """Outcome for one requested copy (checkout) or loan (return)."""
+
+    id: UUID
+    status: LoanBatchStatus
+    loan: LoanResponse | None = None
+    error: str | None = None
+
+
+class LoanBatchResponse(BaseModel):
+    """Per-item outcomes of a batch checkout or return, in request order."""
+
+    succeeded: int
+    failed: int
+    items: list[LoanBatchItem]
@@ -5,6 +5,8 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field
 
+from app.schemas.loan import LoanWithDetailsResponse
+
 
 class MemberCreate(BaseModel):
     """Payload to create a member."""
@@ -33,3 +35,18 @@ class MemberResponse(BaseModel):
     updated_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+# Upper bound on the active loans listed in a member summary
+MAX_SUMMARY_LOANS = 50
+
+
+class MemberSummaryResponse(BaseModel):
+    """A member's loan counts and most recent active loans."""
+
+    member_id: UUID
+    active_loans: int
+    overdue_loans: int
+    lifetime_loans: int
+    next_due_at: datetime | None
+    recent_active_loans: list[LoanWithDetailsResponse]
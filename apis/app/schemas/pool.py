@@ -0,0 +1,30 @@
+"""Connection pool stats response schema."""
+
+from pydantic import BaseModel, Field
+
+
+class WaitBucket(BaseModel):
+    """Cumulative count of checkouts that waited at most `le` seconds."""
+
+    le: str
+    count: int
+
+
+class PoolStats(BaseModel):
+    """Live gauges and checkout metrics for one engine's pool."""
+
+    pool_class: str
+    size: int | None = Field(None, description="Configured persistent connections (queue pools only)")
+    checked_in: int | None = Field(None, description="Idle connections in the pool")
+    checked_out: int | None = Field(None, description="Connections currently in use")
+    overflow: int | None = Field(None, description="Connections open beyond `size`")
+    checkouts: int = 0
+    checkout_failures: int = Field(0, description="Checkouts that timed out waiting for a connection")
+    wait_seconds_sum: float = 0.0
+    wait_seconds_buckets: list[WaitBucket] = []
+
+
+class PoolStatsResponse(BaseModel):
+    """Pool stats per engine, e.g. `primary`, `replica-0` and `async`."""
+
+    engines: dict[str, PoolStats]
@@ -0,0 +1,45 @@
+"""Circulation statistics response schemas."""
+
+from datetime import date, datetime
+from uuid import UUID
+
+from pydantic import BaseModel
+
+# Upper bound on the rows of a top-N stats list
+MAX_STATS_ROWS = 100
+
+
+class BookLoanStats(BaseModel):
+    """A book and how often it has been borrowed."""
+
+    book_id: UUID
+    title: str
+    author: str
+    loans: int
+    last_borrowed_at: datetime
+
+
+class MonthlyLoanStats(BaseModel):
+    """Loans borrowed in one UTC calendar month; average_days covers the returned ones."""
+
+    month: date
+    loans: int
+    returned: int
+    average_days: float | None
+
+
+class LoanDurationStats(BaseModel):
+    """Average time from borrow to return over the returned loans of a month range."""
+
+    returned: int
+    average_days: float | None
+
+
+class MemberActivityStats(BaseModel):
+    """A member's loan totals."""
+
+    member_id: UUID
+    name: str
+    loans: int
+    active_loans: int
+    last_borrowed_at: datetime
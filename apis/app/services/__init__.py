@@ -1,11 +1,33 @@
 """Business logic layer - services for each domain."""
 
+from app.services.async_book_service import AsyncBookService
+from app.services.async_idempotency_service import AsyncIdempotencyService
+from app.services.async_loan_service import AsyncLoanService
+from app.services.async_member_service import AsyncMemberService
 from app.services.book_service import BookService
+from app.services.catalog_cache import CatalogCache
+from app.services.export_service import ExportService
+from app.services.idempotency_service import IdempotencyService
+from app.services.import_service import ImportService
+from app.services.loan_archive_service import LoanArchiveService
 from app.services.loan_service import LoanService
 from app.services.member_service import MemberService
+from app.services.overdue_service import OverdueService
+from app.services.stats_service import StatsService
 
 __all__ = [
+    "AsyncBookService",
+    "AsyncIdempotencyService",
+    "AsyncLoanService",
+    "AsyncMemberService",
     "BookService",
+    "CatalogCache",
+    "ExportService",
+    "IdempotencyService",
+    "ImportService",
+    "LoanArchiveService",
     "LoanService",
     "MemberService",
+    "OverdueService",
+    "StatsService",
 ]
@@ -0,0 +1,89 @@
+"""Async book service - business logic for books and copies over AsyncSession."""
+
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.unit_of_work import async_unit_of_work
+from app.models import Book, BookCopy
+from app.repositories import AsyncBookCopyRepository, AsyncBookRepository
+
+
+class AsyncBookService:
+    """Orchestrates book and copy operations."""
+
+    def __init__(self, db: AsyncSession) -> None:
+        self._db = db
+        self._book_repo = AsyncBookRepository()
+        self._copy_repo = AsyncBookCopyRepository()
+
+    async def create_book(
+        self,
+        *,
+        title: str,
+        author: str,
+        description: str | None = None,
+        isbn: str | None = None,
+    ) -> Book:
+        async with async_unit_of_work(self._db):
+            return await self._book_repo.create(
+                self._db,
+                title=title,
+                author=author,
+                description=description,
+                isbn=isbn,
+            )
+
+    async def get_book(self, book_id: UUID) -> Book | None:
+        return await self._book_repo.get_by_id(self._db, book_id)
+
+    async def books_version(self) -> int:
+        return await self._book_repo.version(self._db)
+
+    async def list_books(
+        self, *, limit: int | None = None, cursor: str | None = None, available_only: bool = False
+    ) -> tuple[list[Book], str | None]:
+        """Returns (books, next_cursor); without a limit the whole catalog is returned."""
+        if limit is None:
+            return await self._book_repo.list_all(self._db, available_only=available_only), None
+        return await self._book_repo.list_page(self._db, limit=limit, cursor=cursor, available_only=available_only)
+
+    async def search_books(
+        self, q: str, *, limit: int, cursor: str | None = None
+    ) -> tuple[list[tuple[Book, float]], str | None]:
+        return await self._book_repo.search(self._db, q, limit=limit, cursor=cursor)
+
+    async def update_book(
+        self,
+        book_id: UUID,
+        *,
+        title: str | None = None,
+        author: str | None = None,
+        description: str | None = None,
+        isbn: str | None = None,
+    ) -> Book | None:
+        async with async_unit_of_work(self._db):
+            book = await self._book_repo.get_by_id(self._db, book_id)
+            if book is None:
+                return None
+            return await self._book_repo.update(
+                self._db,
+                book,
+                title=title,
+                author=author,
+                description=description,
+                isbn=isbn,
+            )
+
+    async def create_copy(self, book_id: UUID, *, copy_code: str) -> BookCopy | None:
+        async with async_unit_of_work(self._db):
+            book = await self._book_repo.get_by_id(self._db, book_id)
+            if book is None:
+                return None
+            return await self._copy_repo.create(self._db, book_id=book_id, copy_code=copy_code)
+
+    async def get_copy(self, copy_id: UUID) -> BookCopy | None:
+        return await self._copy_repo.get_by_id(self._db, copy_id)
+
+    async def list_copies_for_book(self, book_id: UUID) -> list[BookCopy]:
+        return await self._copy_repo.list_by_book_id(self._db, book_id)
@@ -0,0 +1,74 @@
+"""Async idempotency service - Idempotency-Key claims over AsyncSession."""
+
+import asyncio
+import time
+from datetime import timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.config import get_idempotency_settings
+from app.db.unit_of_work import async_unit_of_work
+from app.models import IdempotencyKey
+from app.repositories import AsyncIdempotencyRepository
+from app.services.idempotency_service import (
+    FIRST_POLL_SECONDS,
+    KEY_IN_PROGRESS,
+    MAX_POLL_SECONDS,
+    PURGE_BATCH,
+    outcome,
+    purge_due,
+)
+
+
+class AsyncIdempotencyService:
+    """Claims one key in its own session, separate from the request's (see IdempotencyService)."""
+
+    def __init__(self, db: AsyncSession) -> None:
+        self._db = db
+        self._repo = AsyncIdempotencyRepository()
+        self._key: str | None = None
+
+    async def begin(self, key: str, request_hash: str) -> tuple[IdempotencyKey | None, str | None]:
+        """Claim `key`. Returns (None, None) to run the request, (stored, None) to replay it, or (None, error_message)."""
+        settings = get_idempotency_settings()
+        deadline = time.monotonic() + settings.wait
+        delay = FIRST_POLL_SECONDS
+        while True:
+            async with async_unit_of_work(self._db):
+                owned = await self._repo.claim(
+                    self._db,
+                    key=key,
+                    request_hash=request_hash,
+                    ttl=timedelta(seconds=settings.ttl),
+                    lease=timedelta(seconds=settings.lease),
+                )
+                stored = None if owned else await self._repo.get(self._db, key)
+            if owned:
+                self._key = key
+                return None, None
+            replay, err = outcome(stored, request_hash)
+            if replay is not None or err is not None:
+                return replay, err
+            if time.monotonic() + delay > deadline:
+                return None, KEY_IN_PROGRESS
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_POLL_SECONDS)
+
+    async def finish(self, status_code: int, body: str) -> None:
+        """Store the claimed request's response for replay."""
+        if self._key is None:
+            return
+        async with async_unit_of_work(self._db):
+            await self._repo.save(self._db, self._key, status_code=status_code, body=body)
+        self._key = None
+        if purge_due():
+            async with async_unit_of_work(self._db):
+                await self._repo.purge_expired(self._db, limit=PURGE_BATCH)
+
+    async def abandon(self) -> None:
+        """Drop the claim without storing anything; a retry runs the request again."""
+        if self._key is None:
+            return
+        async with async_unit_of_work(self._db):
+            await self._repo.release(self._db, self._key)
+        self._key = None
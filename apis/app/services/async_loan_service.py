@@ -0,0 +1,160 @@
+"""Async loan service - business logic for borrowing and returning over AsyncSession."""
+
+from datetime import datetime, timezone
+from uuid import UUID
+
+from sqlalchemy import RowMapping
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.query_trace import QueryBudgetExceeded
+from app.db.unit_of_work import async_unit_of_work
+from app.models import Loan
+from app.repositories import AsyncBookCopyRepository, AsyncLoanRepository, AsyncMemberRepository, LoanFilters
+from app.schemas.loan import LoanBatchResponse
+from app.services.loan_service import ALLOCATION_ATTEMPTS, batch_response, checkout_items, return_items
+
+
+class AsyncLoanService:
+    """Orchestrates borrow/return and loan queries."""
+
+    def __init__(self, db: AsyncSession) -> None:
+        self._db = db
+        self._loan_repo = AsyncLoanRepository()
+        self._member_repo = AsyncMemberRepository()
+        self._copy_repo = AsyncBookCopyRepository()
+
+    async def borrow(
+        self,
+        *,
+        member_id: UUID,
+        copy_id: UUID,
+        due_at: datetime,
+    ) -> tuple[Loan | None, str | None]:
+        """Create a loan. Returns (loan, None) or (None, error_message)."""
+        member = await self._member_repo.get_by_id(self._db, member_id)
+        if member is None:
+            return None, "Member not found"
+        copy = await self._copy_repo.get_by_id(self._db, copy_id)
+        if copy is None:
+            return None, "Book copy not found"
+        return await self._create_loan(member_id=member_id, copy_id=copy_id, due_at=due_at)
+
+    async def _create_loan(
+        self,
+        *,
+        member_id: UUID,
+        copy_id: UUID,
+        due_at: datetime,
+    ) -> tuple[Loan | None, str | None]:
+        try:
+            async with async_unit_of_work(self._db):
+                loan = await self._loan_repo.create(
+                    self._db,
+                    member_id=member_id,
+                    copy_id=copy_id,
+                    due_at=due_at,
+                )
+            return loan, None
+        except QueryBudgetExceeded:
+            raise
+        except Exception as e:
+            if "ix_loans_active_copy" in str(e) or "unique" in str(e).lower():
+                return None, "Copy is already on loan"
+            return None, str(e)
+
+    async def borrow_by_book(
+        self,
+        *,
+        member_id: UUID,
+        book_id: UUID,
+        due_at: datetime,
+    ) -> tuple[Loan | None, str | None]:
+        """Create a loan by picking any available copy of the book. Returns (loan, None) or (None, error_message)."""
+        member = await self._member_repo.get_by_id(self._db, member_id)
+        if member is None:
+            return None, "Member not found"
+        for _ in range(ALLOCATION_ATTEMPTS):
+            copy_id = await self._loan_repo.claim_available_copy_id(self._db, book_id)
+            if copy_id is None:
+                break
+            loan, err = await self._create_loan(member_id=member_id, copy_id=copy_id, due_at=due_at)
+            if err != "Copy is already on loan":
+                return loan, err
+        await self._db.rollback()
+        if not await self._copy_repo.exists_for_book(self._db, book_id):
+            return None, "Book has no copies"
+        return None, "No available copy for this book (all copies are on loan)"
+
+    async def borrow_many(
+        self,
+        *,
+        member_id: UUID,
+        copy_ids: list[UUID],
+        due_at: datetime,
+    ) -> tuple[LoanBatchResponse | None, str | None]:
+        """Borrow several copies in one transaction. Returns (per-copy outcomes, None) or (None, error_message)."""
+        member = await self._member_repo.get_by_id(self._db, member_id)
+        if member is None:
+            return None, "Member not found"
+        requested = list(dict.fromkeys(copy_ids))
+        try:
+            async with async_unit_of_work(self._db):
+                rows = await self._loan_repo.create_many(
+                    self._db, member_id=member_id, copy_ids=requested, due_at=due_at
+                )
+                loaned = {row["copy_id"] for row in rows}
+                missing = [c for c in requested if c not in loaned]
+                existing = await self._copy_repo.existing_ids(self._db, missing) if missing else set()
+        except QueryBudgetExceeded:
+            raise
+        except Exception as e:
+            return None, str(e)
+        return batch_response(checkout_items(requested, rows, existing)), None
+
+    async def return_loan(self, loan_id: UUID) -> tuple[Loan | None, str | None]:
+        """Mark loan as returned. Returns (loan, None) or (None, error_message)."""
+        async with async_unit_of_work(self._db):
+            loan = await self._loan_repo.get_by_id(self._db, loan_id)
+            if loan is None:
+                return None, "Loan not found"
+            if loan.returned_at is not None:
+                return None, "Loan already returned"
+            now = datetime.now(timezone.utc)
+            return await self._loan_repo.mark_returned(self._db, loan, now), None
+
+    async def return_many(self, loan_ids: list[UUID]) -> tuple[LoanBatchResponse | None, str | None]:
+        """Return several loans in one transaction. Returns (per-loan outcomes, None) or (None, error_message)."""
+        requested = list(dict.fromkeys(loan_ids))
+        try:
+            async with async_unit_of_work(self._db):
+                rows = await self._loan_repo.mark_returned_many(self._db, requested)
+                returned = {row["id"] for row in rows}
+                missing = [i for i in requested if i not in returned]
+                known = await self._loan_repo.existing_ids(self._db, missing) if missing else set()
+        except QueryBudgetExceeded:
+            raise
+        except Exception as e:
+            return None, str(e)
+        return batch_response(return_items(requested, rows, known)), None
+
+    async def get_loan(self, loan_id: UUID) -> Loan | None:
+        return await self._loan_repo.get_by_id(self._db, loan_id)
+
+    async def loans_version(self) -> int:
+        return await self._loan_repo.version(self._db)
+
+    async def list_overdue(self, *, limit: int, cursor: str | None = None) -> tuple[list[RowMapping], str | None]:
+        """Returns (overdue detail rows, longest overdue first, next_cursor)."""
+        return await self._loan_repo.overdue_page(self._db, limit=limit, cursor=cursor)
+
+    async def list_loans(
+        self,
+        filters: LoanFilters,
+        *,
+        limit: int | None = None,
+        cursor: str | None = None,
+    ) -> tuple[list[RowMapping], str | None]:
+        """Returns (detail rows, next_cursor); without a limit every matching loan is returned."""
+        if limit is None:
+            return await self._loan_repo.list(self._db, filters), None
+        return await self._loan_repo.list_page(self._db, filters, limit=limit, cursor=cursor)
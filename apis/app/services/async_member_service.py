@@ -0,0 +1,63 @@
+"""Async member service - business logic for members over AsyncSession."""
+
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.unit_of_work import async_unit_of_work
+from app.models import Member
+from app.repositories import AsyncLoanRepository, AsyncMemberRepository
+from app.schemas.member import MemberSummaryResponse
+from app.services.member_service import summary_response
+
+
+class AsyncMemberService:
+    """Orchestrates member operations."""
+
+    def __init__(self, db: AsyncSession) -> None:
+        self._db = db
+        self._repo = AsyncMemberRepository()
+        self._loan_repo = AsyncLoanRepository()
+
+    async def create_member(
+        self,
+        *,
+        name: str,
+        email: str | None = None,
+        phone: str | None = None,
+    ) -> Member:
+        async with async_unit_of_work(self._db):
+            return await self._repo.create(self._db, name=name, email=email, phone=phone)
+
+    async def get_member(self, member_id: UUID) -> Member | None:
+        return await self._repo.get_by_id(self._db, member_id)
+
+    async def get_summary(self, member_id: UUID, *, recent: int) -> MemberSummaryResponse | None:
+        """Loan counts, next due date and the `recent` newest active loans, in one query; None if no such member."""
+        rows = await self._loan_repo.member_summary(self._db, member_id, recent=recent)
+        return summary_response(member_id, rows) if rows else None
+
+    async def members_version(self) -> int:
+        return await self._repo.version(self._db)
+
+    async def list_members(
+        self, *, limit: int | None = None, cursor: str | None = None
+    ) -> tuple[list[Member], str | None]:
+        """Returns (members, next_cursor); without a limit all members are returned."""
+        if limit is None:
+            return await self._repo.list_all(self._db), None
+        return await self._repo.list_page(self._db, limit=limit, cursor=cursor)
+
+    async def update_member(
+        self,
+        member_id: UUID,
+        *,
+        name: str | None = None,
+        email: str | None = None,
+        phone: str | None = None,
+    ) -> Member | None:
+        async with async_unit_of_work(self._db):
+            member = await self._repo.get_by_id(self._db, member_id)
+            if member is None:
+                return None
+            return await self._repo.update(self._db, member, name=name, email=email, phone=phone)
@@ -1,21 +1,37 @@
 """Book service - business logic for books and copies."""
 
+from collections.abc import Callable, Hashable
+from typing import TypeVar
 from uuid import UUID
 
 from sqlalchemy.orm import Session
 
+from app.db.unit_of_work import unit_of_work
 from app.models import Book, BookCopy
 from app.repositories import BookCopyRepository, BookRepository
+from app.schemas.book import BookResponse
+from app.schemas.book_copy import BookCopyResponse
+from app.services.catalog_cache import CatalogCache
+
+T = TypeVar("T")
 
 
 class BookService:
     """Orchestrates book and copy operations."""
 
-    def __init__(self, db: Session) -> None:
+    def __init__(self, db: Session, cache: CatalogCache | None = None) -> None:
         self._db = db
+        self._cache = cache
         self._book_repo = BookRepository()
         self._copy_repo = BookCopyRepository()
 
+    def _cached(self, key: Hashable, load: Callable[[], T]) -> T:
+        """Reads return detached snapshots, served from the catalog cache when one is configured."""
+        if self._cache is None:
+            return load()
+        # A lagging replica could repopulate an entry that was just invalidated
+        return self._cache.get_or_load(key, load, store=not self._db.info.get("replica", False))
+
     def create_book(
         self,
         *,
@@ -24,19 +40,45 @@ class BookService:
         description: str | None = None,
         isbn: str | None = None,
     ) -> Book:
-        return self._book_repo.create(
-            self._db,
-            title=title,
-            author=author,
-            description=description,
-            isbn=isbn,
-        )
+        with unit_of_work(self._db):
+            return self._book_repo.create(
+                self._db,
+                title=title,
+                author=author,
+                description=description,
+                isbn=isbn,
+            )
+
+    def get_book(self, book_id: UUID) -> BookResponse | None:
+        def load() -> BookResponse | None:
+            book = self._book_repo.get_by_id(self._db, book_id)
+            return None if book is None else BookResponse.model_validate(book)
+
+        return self._cached(("book", book_id), load)
 
-    def get_book(self, book_id: UUID) -> Book | None:
-        return self._book_repo.get_by_id(self._db, book_id)
+    def books_version(self) -> int:
+        return self._cached(("books", "version"), lambda: self._book_repo.version(self._db))
 
-    def list_books(self) -> list[Book]:
-        return self._book_repo.list_all(self._db)
+    def list_books(
+        self, *, limit: int | None = None, cursor: str | None = None, available_only: bool = False
+    ) -> tuple[list[BookResponse], str | None]:
+        """Returns (books, next_cursor); without a limit the whole catalog is returned."""
+
+        def load() -> tuple[list[BookResponse], str | None]:
+            if limit is None:
+                books, next_cursor = self._book_repo.list_all(self._db, available_only=available_only), None
+            else:
+                books, next_cursor = self._book_repo.list_page(
+                    self._db, limit=limit, cursor=cursor, available_only=available_only
+                )
+            return [BookResponse.model_validate(b) for b in books], next_cursor
+
+        return self._cached(("books", limit, cursor, available_only), load)
+
+    def search_books(
+        self, q: str, *, limit: int, cursor: str | None = None
+    ) -> tuple[list[tuple[Book, float]], str | None]:
+        return self._book_repo.search(self._db, q, limit=limit, cursor=cursor)
 
     def update_book(
         self,
@@ -47,26 +89,31 @@ class BookService:
         description: str | None = None,
         isbn: str | None = None,
     ) -> Book | None:
-        book = self._book_repo.get_by_id(self._db, book_id)
-        if book is None:
-            return None
-        return self._book_repo.update(
-            self._db,
-            book,
-            title=title,
-            author=author,
-            description=description,
-            isbn=isbn,
-        )
+        with unit_of_work(self._db):
+            book = self._book_repo.get_by_id(self._db, book_id)
+            if book is None:
+                return None
+            return self._book_repo.update(
+                self._db,
+                book,
+                title=title,
+                author=author,
+                description=description,
+                isbn=isbn,
+            )
 
     def create_copy(self, book_id: UUID, *, copy_code: str) -> BookCopy | None:
-        book = self._book_repo.get_by_id(self._db, book_id)
-        if book is None:
-            return None
-        return self._copy_repo.create(self._db, book_id=book_id, copy_code=copy_code)
+        with unit_of_work(self._db):
+            book = self._book_repo.get_by_id(self._db, book_id)
+            if book is None:
+                return None
+            return self._copy_repo.create(self._db, book_id=book_id, copy_code=copy_code)
 
     def get_copy(self, copy_id: UUID) -> BookCopy | None:
         return self._copy_repo.get_by_id(self._db, copy_id)
 
-    def list_copies_for_book(self, book_id: UUID) -> list[BookCopy]:
-        return self._copy_repo.list_by_book_id(self._db, book_id)
+    def list_copies_for_book(self, book_id: UUID) -> list[BookCopyResponse]:
+        def load() -> list[BookCopyResponse]:
+            return [BookCopyResponse.model_validate(c) for c in self._copy_repo.list_by_book_id(self._db, book_id)]
+
+        return self._cached(("copies", book_id), load)
@@ -0,0 +1,253 @@
+"""Catalog cache - bounded LRU/TTL cache for book reads with single-flight loading.
+
+Values are Pydantic snapshots, never ORM instances, so they are safe to share across
+sessions and threads. Any commit that inserted, updated or deleted a Book or BookCopy
+drops the affected keys; the same ids are sent with pg_notify inside the committing
+transaction so every other worker (LISTENing on CATALOG_CHANNEL) drops them too.
+"""
+
+import json
+import logging
+import select
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from time import monotonic
+from typing import Any, TypeVar
+from uuid import UUID
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, UOWTransaction, sessionmaker
+
+from app.db.config import get_cache_settings
+from app.models import Book, BookCopy
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CATALOG_CHANNEL = "catalog_invalidate"
+# pg_notify payloads are capped at 8000 bytes; beyond this many ids, invalidate everything
+_MAX_NOTIFY_IDS = 150
+_FLIGHT_TIMEOUT = 30.0
+
+
+class _Flight:
+    """A load in progress that concurrent misses for the same key wait on."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.ok = False
+        self.value: Any = None
+
+
+class CatalogCache:
+    """Thread-safe LRU cache with per-entry TTL, single-flight misses and hit/miss counters."""
+
+    def __init__(self, *, max_entries: int, ttl: float) -> None:
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        # Bumped by every invalidation; a load that started before it must not be stored
+        self._generation = 0
+        self._stop = threading.Event()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_entries > 0
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], T], *, store: bool = True) -> T:
+        """Return the cached value or run `loader` once for all concurrent callers of this key.
+
+        With store=False (e.g. a replica-bound session that may lag) hits are served but a
+        miss is loaded without being cached.
+        """
+        if not self.enabled:
+            return loader()
+        leader: _Flight | None = None
+        follower: _Flight | None = None
+        generation = 0
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]  # type: ignore[no-any-return]
+                del self._entries[key]
+            self.misses += 1
+            if store:
+                follower = self._inflight.get(key)
+                if follower is not None:
+                    self.coalesced += 1
+                else:
+                    leader = self._inflight[key] = _Flight()
+                    generation = self._generation
+        if leader is None:
+            if follower is not None and follower.done.wait(_FLIGHT_TIMEOUT) and follower.ok:
+                return follower.value  # type: ignore[no-any-return]
+            return loader()
+        try:
+            value = loader()
+        except BaseException:
+            with self._lock:
+                self._inflight.pop(key, None)
+            leader.done.set()
+            raise
+        with self._lock:
+            self._inflight.pop(key, None)
+            if generation == self._generation:
+                self._entries[key] = (monotonic() + self._ttl, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self._max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        leader.value = value
+        leader.ok = True
+        leader.done.set()
+        return value
+
+    def invalidate(self, *, book_ids: Iterable[UUID] = (), copy_book_ids: Iterable[UUID] = ()) -> None:
+        """Drop the given books, the copy lists of the given books, and every list page.
+
+        A book's snapshot carries its copy counts, so a copy change drops the book too.
+        """
+        copy_book_ids = set(copy_book_ids)
+        doomed = {("book", b) for b in (*book_ids, *copy_book_ids)} | {("copies", b) for b in copy_book_ids}
+        with self._lock:
+            self._generation += 1
+            for key in [k for k in self._entries if k in doomed or (isinstance(k, tuple) and k[0] == "books")]:
+                del self._entries[key]
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_entries": self._max_entries,
+                "ttl_seconds": self._ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    # --- Write-through invalidation ---
+
+    def install(self, session_factory: sessionmaker[Session]) -> None:
+        """Invalidate on commit of any session made by `session_factory`."""
+        if event.contains(session_factory, "after_commit", self._after_commit):
+            return
+        event.listen(session_factory, "after_flush", self._after_flush)
+        event.listen(session_factory, "after_commit", self._after_commit)
+        event.listen(session_factory, "after_soft_rollback", self._after_rollback)
+
+    def _after_flush(self, session: Session, flush_context: UOWTransaction) -> None:
+        books: set[UUID] = set()
+        copies: set[UUID] = set()
+        for obj in (*session.new, *session.dirty, *session.deleted):
+            if isinstance(obj, Book):
+                books.add(obj.id)
+            elif isinstance(obj, BookCopy):
+                copies.add(obj.book_id)
+        self.mark_changed(session, book_ids=books, copy_book_ids=copies)
+
+    def mark_changed(
+        self, session: Session, *, book_ids: Iterable[UUID] = (), copy_book_ids: Iterable[UUID] = ()
+    ) -> None:
+        """Invalidate these keys when `session` commits. Flushes do this automatically; Core writes must call it."""
+        books = set(book_ids)
+        copies = set(copy_book_ids)
+        if not books and not copies:
+            return
+        session.info.setdefault("catalog_books", set()).update(books)
+        session.info.setdefault("catalog_copies", set()).update(copies)
+        # NOTIFY is transactional: other workers hear it only if this transaction commits
+        if len(books) + len(copies) > _MAX_NOTIFY_IDS:
+            payload = json.dumps({"all": True})
+        else:
+            payload = json.dumps({"books": [str(b) for b in books], "copies": [str(c) for c in copies]})
+        session.connection().execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": CATALOG_CHANNEL, "payload": payload},
+        )
+
+    def _after_commit(self, session: Session) -> None:
+        books = session.info.pop("catalog_books", None)
+        copies = session.info.pop("catalog_copies", None)
+        if books or copies:
+            self.invalidate(book_ids=books or (), copy_book_ids=copies or ())
+
+    def _after_rollback(self, session: Session, previous_transaction: Any) -> None:
+        session.info.pop("catalog_books", None)
+        session.info.pop("catalog_copies", None)
+
+    # --- Cross-worker invalidation ---
+
+    def start_listener(self, engine: Engine) -> threading.Thread:
+        """LISTEN for other workers' invalidations on a dedicated (unpooled) connection."""
+        self._stop.clear()
+        thread = threading.Thread(target=self._listen, args=(engine,), name="catalog-cache-listener", daemon=True)
+        thread.start()
+        return thread
+
+    def stop_listener(self) -> None:
+        self._stop.set()
+
+    def _apply_payload(self, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+            if message.get("all"):
+                self.clear()
+                return
+            self.invalidate(
+                book_ids=[UUID(b) for b in message.get("books", [])],
+                copy_book_ids=[UUID(c) for c in message.get("copies", [])],
+            )
+        except (ValueError, AttributeError, TypeError):
+            logger.warning("Catalog cache: malformed invalidation payload %r; clearing", payload)
+            self.clear()
+
+    def _listen(self, engine: Engine) -> None:
+        cargs, cparams = engine.dialect.create_connect_args(engine.url)
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = engine.dialect.loaded_dbapi.connect(*cargs, **cparams)
+                conn.autocommit = True
+                conn.cursor().execute(f"LISTEN {CATALOG_CHANNEL}")
+                # Anything committed while we were not listening is unknown: start clean
+                self.clear()
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], 1.0) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        self._apply_payload(conn.notifies.pop(0).payload)
+            except Exception:
+                logger.exception("Catalog cache listener failed; reconnecting in 5s")
+                self.clear()
+                self._stop.wait(5.0)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+
+_settings = get_cache_settings()
+catalog_cache = CatalogCache(max_entries=_settings.max_entries, ttl=_settings.ttl)
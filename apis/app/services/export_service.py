@@ -0,0 +1,126 @@
+"""Export service - streams whole tables as NDJSON or CSV with flat memory use."""
+
+import csv
+import io
+import json
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from itertools import islice
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import RowMapping
+from sqlalchemy.orm import Session
+
+from app.repositories import BookRepository, LoanRepository, MemberRepository
+from app.schemas.export import ExportFormat
+
+EXPORT_BATCH_SIZE = 1000
+
+BOOK_COLUMNS = ("id", "title", "author", "description", "isbn", "created_at", "updated_at")
+MEMBER_COLUMNS = ("id", "name", "email", "phone", "created_at", "updated_at")
+LOAN_COLUMNS = (
+    "id",
+    "member_id",
+    "member_name",
+    "copy_id",
+    "copy_code",
+    "book_id",
+    "book_title",
+    "book_author",
+    "borrowed_at",
+    "due_at",
+    "returned_at",
+)
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _batches(rows: Iterable[RowMapping]) -> Iterator[list[RowMapping]]:
+    it = iter(rows)
+    while batch := list(islice(it, EXPORT_BATCH_SIZE)):
+        yield batch
+
+
+def _encode(fmt: ExportFormat, columns: tuple[str, ...], rows: Iterable[RowMapping]) -> Iterator[str]:
+    """Encode rows one chunk per fetched batch, so only a single batch is ever held in memory."""
+    if fmt is ExportFormat.NDJSON:
+        for batch in _batches(rows):
+            yield "".join(
+                json.dumps({c: _plain(row[c]) for c in columns}, separators=(",", ":")) + "\n" for row in batch
+            )
+        return
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(columns)
+    for batch in _batches(rows):
+        writer.writerows([_plain(row[c]) for c in columns] for row in batch)
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue()
+
+
+class ExportService:
+    """Produces export bodies for loans, books and members."""
+
+    def __init__(self, db: Session) -> None:
+        self._db = db
+        self._book_repo = BookRepository()
+        self._member_repo = MemberRepository()
+        self._loan_repo = LoanRepository()
+
+    def export_loans(
+        self,
+        fmt: ExportFormat,
+        *,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> Iterator[str]:
+        """Loans borrowed in [since, until), oldest first."""
+        rows = self._loan_repo.iter_export_rows(
+            self._db,
+            borrowed_from=since,
+            borrowed_to=until,
+            batch_size=EXPORT_BATCH_SIZE,
+        )
+        return _encode(fmt, LOAN_COLUMNS, rows)
+
+    def export_books(
+        self,
+        fmt: ExportFormat,
+        *,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> Iterator[str]:
+        """Books created in [since, until), by title."""
+        rows = self._book_repo.iter_export_rows(
+            self._db,
+            created_from=since,
+            created_to=until,
+            batch_size=EXPORT_BATCH_SIZE,
+        )
+        return _encode(fmt, BOOK_COLUMNS, rows)
+
+    def export_members(
+        self,
+        fmt: ExportFormat,
+        *,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> Iterator[str]:
+        """Members created in [since, until), by name."""
+        rows = self._member_repo.iter_export_rows(
+            self._db,
+            created_from=since,
+            created_to=until,
+            batch_size=EXPORT_BATCH_SIZE,
+        )
+        return _encode(fmt, MEMBER_COLUMNS, rows)
@@ -0,0 +1,100 @@
+"""Idempotency service - claim an Idempotency-Key, then replay or record its outcome."""
+
+import itertools
+import time
+from datetime import timedelta
+
+from sqlalchemy.orm import Session
+
+from app.db.config import get_idempotency_settings
+from app.db.unit_of_work import unit_of_work
+from app.models import IdempotencyKey
+from app.repositories import IdempotencyRepository
+
+KEY_REUSED = "Idempotency-Key was already used for a different request"
+KEY_IN_PROGRESS = "A request with this Idempotency-Key is still in progress"
+
+# Every PURGE_EVERY-th stored outcome (per process) also deletes up to PURGE_BATCH expired keys
+PURGE_EVERY = 100
+PURGE_BATCH = 1000
+_finished = itertools.count(1)
+
+# A duplicate re-reads a pending key after these delays (doubling) until IDEMPOTENCY_WAIT runs out
+FIRST_POLL_SECONDS = 0.05
+MAX_POLL_SECONDS = 0.5
+
+
+def purge_due() -> bool:
+    """Count one stored outcome; True on every PURGE_EVERY-th."""
+    return next(_finished) % PURGE_EVERY == 0
+
+
+def outcome(stored: IdempotencyKey | None, request_hash: str) -> tuple[IdempotencyKey | None, str | None]:
+    """What a request that did not get the claim does: replay `stored`, wait (None, None) or fail."""
+    if stored is None:
+        return None, None
+    if stored.request_hash != request_hash:
+        return None, KEY_REUSED
+    if stored.status_code is None:
+        return None, None
+    return stored, None
+
+
+class IdempotencyService:
+    """Claims one key in its own session, separate from the request's.
+
+    The claim is committed at once as a pending row with a lease, so no transaction or
+    connection is held while the request runs. A concurrent duplicate polls the row until
+    `finish` stores the outcome; `abandon` deletes the pending row so the next attempt runs
+    the request again, and a claim whose request never finished lapses with its lease.
+    """
+
+    def __init__(self, db: Session) -> None:
+        self._db = db
+        self._repo = IdempotencyRepository()
+        self._key: str | None = None
+
+    def begin(self, key: str, request_hash: str) -> tuple[IdempotencyKey | None, str | None]:
+        """Claim `key`. Returns (None, None) to run the request, (stored, None) to replay it, or (None, error_message)."""
+        settings = get_idempotency_settings()
+        deadline = time.monotonic() + settings.wait
+        delay = FIRST_POLL_SECONDS
+        while True:
+            with unit_of_work(self._db):
+                owned = self._repo.claim(
+                    self._db,
+                    key=key,
+                    request_hash=request_hash,
+                    ttl=timedelta(seconds=settings.ttl),
+                    lease=timedelta(seconds=settings.lease),
+                )
+                stored = None if owned else self._repo.get(self._db, key)
+            if owned:
+                self._key = key
+                return None, None
+            replay, err = outcome(stored, request_hash)
+            if replay is not None or err is not None:
+                return replay, err
+            if time.monotonic() + delay > deadline:
+                return None, KEY_IN_PROGRESS
+            time.sleep(delay)
+            delay = min(delay * 2, MAX_POLL_SECONDS)
+
+    def finish(self, status_code: int, body: str) -> None:
+        """Store the claimed request's response for replay."""
+        if self._key is None:
+            return
+        with unit_of_work(self._db):
+            self._repo.save(self._db, self._key, status_code=status_code, body=body)
+        self._key = None
+        if purge_due():
+            with unit_of_work(self._db):
+                self._repo.purge_expired(self._db, limit=PURGE_BATCH)
+
+    def abandon(self) -> None:
+        """Drop the claim without storing anything; a retry runs the request again."""
+        if self._key is None:
+            return
+        with unit_of_work(self._db):
+            self._repo.release(self._db, self._key)
+        self._key = None
@@ -0,0 +1,244 @@
+"""Import service - bulk upserts of books, members and copies from JSON, NDJSON or CSV bodies."""
+
+import csv
+import io
+import json
+from collections.abc import Callable, Collection, Hashable
+from itertools import batched
+from typing import Any, TypeVar
+from uuid import UUID, uuid4
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import Row
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.db.unit_of_work import unit_of_work
+from app.repositories import BookCopyRepository, BookRepository, MemberRepository
+from app.schemas.book import BookCreate
+from app.schemas.imports import BookCopyImport, ImportFormat, ImportResponse, ImportRowResult, ImportStatus
+from app.schemas.member import MemberCreate
+from app.services.catalog_cache import CatalogCache
+
+# Rows per INSERT ... ON CONFLICT statement (and per savepoint): 1000 books is 5000 bind params
+IMPORT_BATCH_SIZE = 1000
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def _decode(fmt: ImportFormat, body: bytes) -> list[Any]:
+    """Raw records from the body; raises ValueError or csv.Error if it is not valid `fmt`."""
+    text = body.decode("utf-8-sig")
+    if fmt is ImportFormat.JSON:
+        records = json.loads(text)
+        if not isinstance(records, list):
+            raise ValueError("expected a JSON array")
+        return records
+    if fmt is ImportFormat.NDJSON:
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+    # Empty cells are missing values (as written by the CSV exports); ragged overflow cells are dropped
+    reader = csv.DictReader(io.StringIO(text))
+    return [{k: v if v != "" else None for k, v in row.items() if k is not None} for row in reader]
+
+
+def _describe(e: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(p) for p in err['loc']) or 'row'}: {err['msg']}" for err in e.errors())
+
+
+class _Run:
+    """Per-row outcomes of one import, filled in as batches are written."""
+
+    def __init__(self, size: int) -> None:
+        self.results: list[ImportRowResult | None] = [None] * size
+
+    def fail(self, row: int, error: str) -> None:
+        self.results[row] = ImportRowResult(row=row, status=ImportStatus.ERROR, error=error)
+
+    def done(self, row: int, status: ImportStatus, id: UUID | None) -> None:
+        self.results[row] = ImportRowResult(row=row, status=status, id=id)
+
+    def status(self, row: int) -> ImportStatus | None:
+        result = self.results[row]
+        return result.status if result is not None else None
+
+    def written_ids(self) -> set[UUID]:
+        return {
+            r.id
+            for r in self.results
+            if r is not None and r.id is not None and r.status in (ImportStatus.CREATED, ImportStatus.UPDATED)
+        }
+
+    def response(self) -> ImportResponse:
+        rows = [r for r in self.results if r is not None]
+        counts = {status: 0 for status in ImportStatus}
+        for r in rows:
+            counts[r.status] += 1
+        return ImportResponse(
+            created=counts[ImportStatus.CREATED],
+            updated=counts[ImportStatus.UPDATED],
+            unchanged=counts[ImportStatus.UNCHANGED],
+            failed=counts[ImportStatus.ERROR],
+            rows=rows,
+        )
+
+
+class ImportService:
+    """Bulk upserts: books on isbn, members on email, copies on copy_code.
+
+    Rows are validated individually, then written IMPORT_BATCH_SIZE at a time, each batch a
+    single INSERT ... ON CONFLICT DO UPDATE inside its own savepoint, so a failing batch
+    only fails its own rows. Everything that succeeded is committed together at the end.
+    """
+
+    def __init__(self, db: Session, cache: CatalogCache | None = None) -> None:
+        self._db = db
+        self._cache = cache
+        self._book_repo = BookRepository()
+        self._member_repo = MemberRepository()
+        self._copy_repo = BookCopyRepository()
+
+    def import_books(self, fmt: ImportFormat, body: bytes) -> tuple[ImportResponse | None, str | None]:
+        """Upsert books on isbn (books without one are always created). Returns (result, None) or (None, error_message)."""
+        try:
+            records = _decode(fmt, body)
+        except (ValueError, csv.Error) as e:
+            return None, f"Malformed {fmt.value} body: {e}"
+        run = _Run(len(records))
+        valid = self._validate(run, records, BookCreate, "isbn")
+        for batch in batched(valid, IMPORT_BATCH_SIZE):
+            rows = [{"id": uuid4(), **book.model_dump()} for _, book in batch]
+            self._write(
+                run,
+                [(i, row) for (i, _), row in zip(batch, rows)],
+                "isbn",
+                lambda: self._book_repo.upsert_many(self._db, rows),
+                lambda isbns: self._book_repo.ids_by_isbn(self._db, isbns),
+            )
+        self._commit(book_ids=run.written_ids())
+        return run.response(), None
+
+    def import_members(self, fmt: ImportFormat, body: bytes) -> tuple[ImportResponse | None, str | None]:
+        """Upsert members on email (members without one are always created). Returns (result, None) or (None, error_message)."""
+        try:
+            records = _decode(fmt, body)
+        except (ValueError, csv.Error) as e:
+            return None, f"Malformed {fmt.value} body: {e}"
+        run = _Run(len(records))
+        valid = self._validate(run, records, MemberCreate, "email")
+        for batch in batched(valid, IMPORT_BATCH_SIZE):
+            rows = [{"id": uuid4(), **member.model_dump()} for _, member in batch]
+            self._write(
+                run,
+                [(i, row) for (i, _), row in zip(batch, rows)],
+                "email",
+                lambda: self._member_repo.upsert_many(self._db, rows),
+                lambda emails: self._member_repo.ids_by_email(self._db, emails),
+            )
+        self._commit()
+        return run.response(), None
+
+    def import_copies(self, fmt: ImportFormat, body: bytes) -> tuple[ImportResponse | None, str | None]:
+        """Upsert copies on copy_code; an existing code moves to the row's book. Returns (result, None) or (None, error_message)."""
+        try:
+            records = _decode(fmt, body)
+        except (ValueError, csv.Error) as e:
+            return None, f"Malformed {fmt.value} body: {e}"
+        run = _Run(len(records))
+        valid = self._validate(run, records, BookCopyImport, "copy_code")
+        affected_books: set[UUID] = set()
+        for batch in batched(valid, IMPORT_BATCH_SIZE):
+            # book_id wins over isbn when a row has both
+            isbn_ids = self._book_repo.ids_by_isbn(self._db, {c.isbn for _, c in batch if c.book_id is None and c.isbn})
+            known_ids = self._book_repo.existing_ids(self._db, {c.book_id for _, c in batch if c.book_id is not None})
+            existing = self._copy_repo.by_copy_code(self._db, [c.copy_code for _, c in batch])
+            rows: list[tuple[int, dict[str, Any]]] = []
+            for i, copy in batch:
+                if copy.book_id is not None:
+                    book_id = copy.book_id if copy.book_id in known_ids else None
+                else:
+                    book_id = isbn_ids.get(copy.isbn) if copy.isbn else None
+                if book_id is None:
+                    run.fail(i, "Book not found")
+                    continue
+                rows.append((i, {"id": uuid4(), "book_id": book_id, "copy_code": copy.copy_code}))
+            if not rows:
+                continue
+            self._write(
+                run,
+                rows,
+                "copy_code",
+                lambda: self._copy_repo.upsert_many(self._db, [row for _, row in rows]),
+                # Read again: a code another import added since `existing` was read is unchanged too
+                lambda codes: {code: id for code, (id, _) in self._copy_repo.by_copy_code(self._db, codes).items()},
+            )
+            for i, row in rows:
+                status = run.status(i)
+                if status is ImportStatus.CREATED:
+                    affected_books.add(row["book_id"])
+                elif status is ImportStatus.UPDATED:
+                    # The copy moved: both books' copy lists change (the old one only if it was read above)
+                    affected_books.add(row["book_id"])
+                    if (previous := existing.get(row["copy_code"])) is not None:
+                        affected_books.add(previous[1])
+        self._commit(copy_book_ids=affected_books)
+        return run.response(), None
+
+    def _validate(self, run: _Run, records: list[Any], schema: type[M], key: str) -> list[tuple[int, M]]:
+        """Validate each record; invalid rows and repeats of an earlier row's key are marked failed."""
+        valid: list[tuple[int, M]] = []
+        first_row: dict[Hashable, int] = {}
+        for i, record in enumerate(records):
+            try:
+                item = schema.model_validate(record)
+            except ValidationError as e:
+                run.fail(i, _describe(e))
+                continue
+            value = getattr(item, key)
+            if value is not None:
+                if value in first_row:
+                    run.fail(i, f"Duplicate {key} (same as row {first_row[value]})")
+                    continue
+                first_row[value] = i
+            valid.append((i, item))
+        return valid
+
+    def _write(
+        self,
+        run: _Run,
+        rows: list[tuple[int, dict[str, Any]]],
+        key: str,
+        upsert: Callable[[], list[Row[Any]]],
+        lookup: Callable[[Collection[Any]], dict[Any, UUID]],
+    ) -> None:
+        """Run one batch's upsert in a savepoint and record each row's outcome."""
+        try:
+            with self._db.begin_nested():
+                written = upsert()
+                created = {id for id, _, inserted in written if inserted}
+                updated = {value: id for id, value, inserted in written if not inserted}
+                unchanged = [
+                    row[key]
+                    for _, row in rows
+                    if row["id"] not in created and row[key] is not None and row[key] not in updated
+                ]
+                unchanged_ids = lookup(unchanged) if unchanged else {}
+        except DBAPIError as e:
+            error = str(e.orig).strip() if e.orig is not None else str(e)
+            for i, _ in rows:
+                run.fail(i, error)
+            return
+        for i, row in rows:
+            if row["id"] in created:
+                run.done(i, ImportStatus.CREATED, row["id"])
+            elif row[key] in updated:
+                run.done(i, ImportStatus.UPDATED, updated[row[key]])
+            elif row[key] in unchanged_ids:
+                run.done(i, ImportStatus.UNCHANGED, unchanged_ids[row[key]])
+            else:
+                run.fail(i, f"Row with this {key} was changed concurrently; retry it")
+
+    def _commit(self, *, book_ids: Collection[UUID] = (), copy_book_ids: Collection[UUID] = ()) -> None:
+        with unit_of_work(self._db):
+            # Core upserts bypass the flush events the catalog cache listens to
+            if self._cache is not None:
+                self._cache.mark_changed(self._db, book_ids=book_ids, copy_book_ids=copy_book_ids)
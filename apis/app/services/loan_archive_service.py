@@ -0,0 +1,70 @@
+"""Loan archive service - move old returned loans to the archive partitions in bounded chunks."""
+
+from collections.abc import Iterator
+from datetime import date, datetime, timezone
+
+from sqlalchemy.orm import Session
+
+from app.db.schema import archive_partition_name
+from app.db.unit_of_work import unit_of_work
+from app.repositories import LoanArchiveRepository
+
+ARCHIVE_CHUNK_SIZE = 1000
+# Months of archive partitions kept ready past the cutoff's month, so a run never has to
+# create the partition it is about to fill
+PARTITIONS_AHEAD = 3
+
+
+def _month(at: datetime) -> date:
+    return at.astimezone(timezone.utc).date().replace(day=1)
+
+
+def _next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+class LoanArchiveService:
+    """Keeps loans_hot small: loans returned before a cutoff move to loans_archive."""
+
+    def __init__(self, db: Session) -> None:
+        self._db = db
+        self._repo = LoanArchiveRepository()
+
+    def ensure_partitions(self, *, cutoff: datetime) -> list[str]:
+        """Create the monthly archive partitions from the oldest loan to archive through
+        PARTITIONS_AHEAD months past `cutoff`. Returns the names of the ones created.
+
+        Each partition is created in its own short transaction, before any row is moved, so
+        rows never land in loans_archive_default (which would block their month's partition).
+        """
+        with unit_of_work(self._db):
+            oldest = self._repo.oldest_to_archive(self._db, cutoff)
+            existing = self._repo.partition_names(self._db)
+        month = _month(oldest) if oldest is not None else _month(cutoff)
+        last = _month(cutoff)
+        for _ in range(PARTITIONS_AHEAD):
+            last = _next_month(last)
+        created: list[str] = []
+        while month <= last:
+            if archive_partition_name(month) not in existing:
+                with unit_of_work(self._db):
+                    self._repo.create_partition(self._db, month)
+                created.append(archive_partition_name(month))
+            month = _next_month(month)
+        return created
+
+    def archive(self, *, cutoff: datetime, chunk_size: int = ARCHIVE_CHUNK_SIZE) -> Iterator[tuple[int, int]]:
+        """Yield (scanned, moved) per chunk of loans returned before `cutoff`.
+
+        Call ensure_partitions for the same cutoff first. Each chunk is one statement in its own
+        transaction and only the keyset cursor is carried between chunks. Safe to re-run.
+        """
+        after = None
+        while True:
+            with unit_of_work(self._db):
+                scanned, moved, after = self._repo.archive_chunk(self._db, cutoff=cutoff, after=after, limit=chunk_size)
+            if after is None:
+                return
+            yield scanned, moved
+            if scanned < chunk_size:
+                return
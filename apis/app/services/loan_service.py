@@ -1,19 +1,68 @@
 """Loan service - business logic for borrowing and returning."""
 
+from collections.abc import Collection
 from datetime import datetime, timezone
 from uuid import UUID
 
+from sqlalchemy import RowMapping
 from sqlalchemy.orm import Session
 
+from app.db.query_trace import QueryBudgetExceeded
+from app.db.unit_of_work import unit_of_work
 from app.models import Loan
-from app.repositories import BookCopyRepository, LoanRepository, MemberRepository
+from app.repositories import BookCopyRepository, LoanFilters, LoanRepository, MemberRepository
+from app.schemas.loan import LoanBatchItem, LoanBatchResponse, LoanBatchStatus, LoanResponse
+from app.services.catalog_cache import CatalogCache
+
+# A copy claimed by a transaction that commits between our snapshot and our lock
+# surfaces as a unique violation on ix_loans_active_copy; retry with the next copy.
+ALLOCATION_ATTEMPTS = 3
+# borrow_by_book at worst: the member lookup, a claim and an insert per attempt, then the
+# cache notification (or, when every attempt lost, the has-copies check)
+BORROW_BY_BOOK_STATEMENTS = 2 + 2 * ALLOCATION_ATTEMPTS
+
+
+def batch_response(items: list[LoanBatchItem]) -> LoanBatchResponse:
+    succeeded = sum(1 for item in items if item.status is LoanBatchStatus.OK)
+    return LoanBatchResponse(succeeded=succeeded, failed=len(items) - succeeded, items=items)
+
+
+def checkout_items(requested: list[UUID], rows: list[RowMapping], existing: set[UUID]) -> list[LoanBatchItem]:
+    """Per-copy outcomes: loaned if a row came back, else on loan if the copy exists, else not found."""
+    loans = {row["copy_id"]: row for row in rows}
+    items: list[LoanBatchItem] = []
+    for copy_id in requested:
+        if copy_id in loans:
+            loan = LoanResponse.model_validate(dict(loans[copy_id]))
+            items.append(LoanBatchItem(id=copy_id, status=LoanBatchStatus.OK, loan=loan))
+        elif copy_id in existing:
+            items.append(LoanBatchItem(id=copy_id, status=LoanBatchStatus.CONFLICT, error="Copy is already on loan"))
+        else:
+            items.append(LoanBatchItem(id=copy_id, status=LoanBatchStatus.NOT_FOUND, error="Book copy not found"))
+    return items
+
+
+def return_items(requested: list[UUID], rows: list[RowMapping], known: set[UUID]) -> list[LoanBatchItem]:
+    """Per-loan outcomes: returned if a row came back, else already returned if the loan exists, else not found."""
+    loans = {row["id"]: row for row in rows}
+    items: list[LoanBatchItem] = []
+    for loan_id in requested:
+        if loan_id in loans:
+            loan = LoanResponse.model_validate(dict(loans[loan_id]))
+            items.append(LoanBatchItem(id=loan_id, status=LoanBatchStatus.OK, loan=loan))
+        elif loan_id in known:
+            items.append(LoanBatchItem(id=loan_id, status=LoanBatchStatus.CONFLICT, error="Loan already returned"))
+        else:
+            items.append(LoanBatchItem(id=loan_id, status=LoanBatchStatus.NOT_FOUND, error="Loan not found"))
+    return items
 
 
 class LoanService:
     """Orchestrates borrow/return and loan queries."""
 
-    def __init__(self, db: Session) -> None:
+    def __init__(self, db: Session, cache: CatalogCache | None = None) -> None:
         self._db = db
+        self._cache = cache
         self._loan_repo = LoanRepository()
         self._member_repo = MemberRepository()
         self._copy_repo = BookCopyRepository()
@@ -32,16 +81,35 @@ class LoanService:
         copy = self._copy_repo.get_by_id(self._db, copy_id)
         if copy is None:
             return None, "Book copy not found"
+        return self._create_loan(member_id=member_id, copy_id=copy_id, book_id=copy.book_id, due_at=due_at)
+
+    def _availability_changed(self, *, book_ids: Collection[UUID] = (), copy_ids: Collection[UUID] = ()) -> None:
+        """Loans change their books' copies_available (kept by triggers): drop those books from the cache on commit."""
+        if self._cache is None:
+            return
+        self._cache.mark_changed(self._db, book_ids={*book_ids, *self._copy_repo.book_ids(self._db, copy_ids)})
+
+    def _create_loan(
+        self,
+        *,
+        member_id: UUID,
+        copy_id: UUID,
+        book_id: UUID,
+        due_at: datetime,
+    ) -> tuple[Loan | None, str | None]:
         try:
-            loan = self._loan_repo.create(
-                self._db,
-                member_id=member_id,
-                copy_id=copy_id,
-                due_at=due_at,
-            )
+            with unit_of_work(self._db):
+                loan = self._loan_repo.create(
+                    self._db,
+                    member_id=member_id,
+                    copy_id=copy_id,
+                    due_at=due_at,
+                )
+                self._availability_changed(book_ids=[book_id])
             return loan, None
+        except QueryBudgetExceeded:
+            raise
         except Exception as e:
-            self._db.rollback()
             if "ix_loans_active_copy" in str(e) or "unique" in str(e).lower():
                 return None, "Copy is already on loan"
             return None, str(e)
@@ -57,32 +125,90 @@ class LoanService:
         member = self._member_repo.get_by_id(self._db, member_id)
         if member is None:
             return None, "Member not found"
-        copies = self._copy_repo.list_by_book_id(self._db, book_id)
-        if not copies:
+        for _ in range(ALLOCATION_ATTEMPTS):
+            copy_id = self._loan_repo.claim_available_copy_id(self._db, book_id)
+            if copy_id is None:
+                break
+            loan, err = self._create_loan(member_id=member_id, copy_id=copy_id, book_id=book_id, due_at=due_at)
+            if err != "Copy is already on loan":
+                return loan, err
+        self._db.rollback()
+        if not self._copy_repo.exists_for_book(self._db, book_id):
             return None, "Book has no copies"
-        on_loan = self._loan_repo.get_active_copy_ids(self._db)
-        for copy in copies:
-            if copy.id not in on_loan:
-                return self.borrow(member_id=member_id, copy_id=copy.id, due_at=due_at)
         return None, "No available copy for this book (all copies are on loan)"
 
+    def borrow_many(
+        self,
+        *,
+        member_id: UUID,
+        copy_ids: list[UUID],
+        due_at: datetime,
+    ) -> tuple[LoanBatchResponse | None, str | None]:
+        """Borrow several copies in one transaction. Returns (per-copy outcomes, None) or (None, error_message)."""
+        member = self._member_repo.get_by_id(self._db, member_id)
+        if member is None:
+            return None, "Member not found"
+        requested = list(dict.fromkeys(copy_ids))
+        try:
+            with unit_of_work(self._db):
+                rows = self._loan_repo.create_many(self._db, member_id=member_id, copy_ids=requested, due_at=due_at)
+                loaned = {row["copy_id"] for row in rows}
+                self._availability_changed(copy_ids=loaned)
+                missing = [c for c in requested if c not in loaned]
+                existing = self._copy_repo.existing_ids(self._db, missing) if missing else set()
+        except QueryBudgetExceeded:
+            raise
+        except Exception as e:
+            return None, str(e)
+        return batch_response(checkout_items(requested, rows, existing)), None
+
     def return_loan(self, loan_id: UUID) -> tuple[Loan | None, str | None]:
         """Mark loan as returned. Returns (loan, None) or (None, error_message)."""
-        loan = self._loan_repo.get_by_id(self._db, loan_id)
-        if loan is None:
-            return None, "Loan not found"
-        if loan.returned_at is not None:
-            return None, "Loan already returned"
-        now = datetime.now(timezone.utc)
-        return self._loan_repo.mark_returned(self._db, loan, now), None
+        with unit_of_work(self._db):
+            loan = self._loan_repo.get_by_id(self._db, loan_id)
+            if loan is None:
+                return None, "Loan not found"
+            if loan.returned_at is not None:
+                return None, "Loan already returned"
+            now = datetime.now(timezone.utc)
+            loan = self._loan_repo.mark_returned(self._db, loan, now)
+            self._availability_changed(copy_ids=[loan.copy_id])
+            return loan, None
+
+    def return_many(self, loan_ids: list[UUID]) -> tuple[LoanBatchResponse | None, str | None]:
+        """Return several loans in one transaction. Returns (per-loan outcomes, None) or (None, error_message)."""
+        requested = list(dict.fromkeys(loan_ids))
+        try:
+            with unit_of_work(self._db):
+                rows = self._loan_repo.mark_returned_many(self._db, requested)
+                returned = {row["id"] for row in rows}
+                self._availability_changed(copy_ids={row["copy_id"] for row in rows})
+                missing = [i for i in requested if i not in returned]
+                known = self._loan_repo.existing_ids(self._db, missing) if missing else set()
+        except QueryBudgetExceeded:
+            raise
+        except Exception as e:
+            return None, str(e)
+        return batch_response(return_items(requested, rows, known)), None
 
     def get_loan(self, loan_id: UUID) -> Loan | None:
         return self._loan_repo.get_by_id(self._db, loan_id)
 
+    def loans_version(self) -> int:
+        return self._loan_repo.version(self._db)
+
+    def list_overdue(self, *, limit: int, cursor: str | None = None) -> tuple[list[RowMapping], str | None]:
+        """Returns (overdue detail rows, longest overdue first, next_cursor)."""
+        return self._loan_repo.overdue_page(self._db, limit=limit, cursor=cursor)
+
     def list_loans(
         self,
+        filters: LoanFilters,
         *,
-        member_id: UUID | None = None,
-        active_only: bool = False,
-    ) -> list[Loan]:
-        return self._loan_repo.list(self._db, member_id=member_id, active_only=active_only)
+        limit: int | None = None,
+        cursor: str | None = None,
+    ) -> tuple[list[RowMapping], str | None]:
+        """Returns (detail rows, next_cursor); without a limit every matching loan is returned."""
+        if limit is None:
+            return self._loan_repo.list(self._db, filters), None
+        return self._loan_repo.list_page(self._db, filters, limit=limit, cursor=cursor)
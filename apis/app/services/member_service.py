@@ -2,10 +2,33 @@
 
 from uuid import UUID
 
+from sqlalchemy import RowMapping
 from sqlalchemy.orm import Session
 
+from app.db.unit_of_work import unit_of_work
 from app.models import Member
-from app.repositories import MemberRepository
+from app.repositories import LoanRepository, MemberRepository
+from app.schemas.loan import LoanWithDetailsResponse
+from app.schemas.member import MemberSummaryResponse
+
+
+def summary_response(member_id: UUID, rows: list[RowMapping]) -> MemberSummaryResponse:
+    """Build the summary from member_summary_query rows (counts repeated on each loan row)."""
+    stats = rows[0]
+    loans = [
+        # Typed detail columns, exactly the response fields: construct without re-validating
+        LoanWithDetailsResponse.model_construct(**{k: row[k] for k in LoanWithDetailsResponse.model_fields})
+        for row in rows
+        if row["id"] is not None
+    ]
+    return MemberSummaryResponse(
+        member_id=member_id,
+        active_loans=stats["active_loans"],
+        overdue_loans=stats["overdue_loans"],
+        lifetime_loans=stats["lifetime_loans"],
+        next_due_at=stats["next_due_at"],
+        recent_active_loans=loans,
+    )
 
 
 class MemberService:
@@ -14,6 +37,7 @@ class MemberService:
     def __init__(self, db: Session) -> None:
         self._db = db
         self._repo = MemberRepository()
+        self._loan_repo = LoanRepository()
 
     def create_member(
         self,
@@ -22,13 +46,25 @@ class MemberService:
         email: str | None = None,
         phone: str | None = None,
     ) -> Member:
-        return self._repo.create(self._db, name=name, email=email, phone=phone)
+        with unit_of_work(self._db):
+            return self._repo.create(self._db, name=name, email=email, phone=phone)
 
     def get_member(self, member_id: UUID) -> Member | None:
         return self._repo.get_by_id(self._db, member_id)
 
-    def list_members(self) -> list[Member]:
-        return self._repo.list_all(self._db)
+    def get_summary(self, member_id: UUID, *, recent: int) -> MemberSummaryResponse | None:
+        """Loan counts, next due date and the `recent` newest active loans, in one query; None if no such member."""
+        rows = self._loan_repo.member_summary(self._db, member_id, recent=recent)
+        return summary_response(member_id, rows) if rows else None
+
+    def members_version(self) -> int:
+        return self._repo.version(self._db)
+
+    def list_members(self, *, limit: int | None = None, cursor: str | None = None) -> tuple[list[Member], str | None]:
+        """Returns (members, next_cursor); without a limit all members are returned."""
+        if limit is None:
+            return self._repo.list_all(self._db), None
+        return self._repo.list_page(self._db, limit=limit, cursor=cursor)
 
     def update_member(
         self,
@@ -38,7 +74,8 @@ class MemberService:
         email: str | None = None,
         phone: str | None = None,
     ) -> Member | None:
-        member = self._repo.get_by_id(self._db, member_id)
-        if member is None:
-            return None
-        return self._repo.update(self._db, member, name=name, email=email, phone=phone)
+        with unit_of_work(self._db):
+            member = self._repo.get_by_id(self._db, member_id)
+            if member is None:
+                return None
+            return self._repo.update(self._db, member, name=name, email=email, phone=phone)
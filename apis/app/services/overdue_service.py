@@ -0,0 +1,36 @@
+"""Overdue service - queue overdue notices in bounded chunks."""
+
+from collections.abc import Iterator
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from app.db.unit_of_work import unit_of_work
+from app.repositories import OverdueNoticeRepository
+
+SWEEP_CHUNK_SIZE = 1000
+
+
+class OverdueService:
+    """Walks overdue loans in (due_at, id) order and queues a notice for each into the outbox."""
+
+    def __init__(self, db: Session) -> None:
+        self._db = db
+        self._repo = OverdueNoticeRepository()
+
+    def sweep(self, *, as_of: datetime, chunk_size: int = SWEEP_CHUNK_SIZE) -> Iterator[tuple[int, int]]:
+        """Yield (scanned, queued) per chunk of loans overdue as of `as_of`.
+
+        Each chunk is one statement in its own transaction and only the keyset cursor is
+        carried between chunks, so a large backlog never holds a long transaction or sits in
+        memory. Safe to re-run: notices already queued are not duplicated.
+        """
+        after = None
+        while True:
+            with unit_of_work(self._db):
+                scanned, queued, after = self._repo.queue_chunk(self._db, as_of=as_of, after=after, limit=chunk_size)
+            if after is None:
+                return
+            yield scanned, queued
+            if scanned < chunk_size:
+                return
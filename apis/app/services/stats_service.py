@@ -0,0 +1,46 @@
+"""Stats service - circulation statistics from the materialized views, and their refresh."""
+
+from collections.abc import Iterator
+from datetime import date
+
+from sqlalchemy.orm import Session
+
+from app.db.schema import STATS_VIEWS
+from app.db.unit_of_work import unit_of_work
+from app.repositories import StatsRepository
+from app.schemas.stats import BookLoanStats, LoanDurationStats, MemberActivityStats, MonthlyLoanStats
+
+
+def _month(day: date | None) -> date | None:
+    return day.replace(day=1) if day is not None else None
+
+
+class StatsService:
+    """Dashboard reads cost O(rows returned); the views are as fresh as the last refresh()."""
+
+    def __init__(self, db: Session) -> None:
+        self._db = db
+        self._repo = StatsRepository()
+
+    def top_books(self, limit: int) -> list[BookLoanStats]:
+        return [BookLoanStats.model_construct(**row) for row in self._repo.top_books(self._db, limit)]
+
+    def loans_per_month(self, *, since: date | None = None, until: date | None = None) -> list[MonthlyLoanStats]:
+        """Months in [since, until); only the month of each bound counts."""
+        rows = self._repo.monthly(self._db, month_from=_month(since), month_to=_month(until))
+        return [MonthlyLoanStats.model_construct(**row) for row in rows]
+
+    def loan_duration(self, *, since: date | None = None, until: date | None = None) -> LoanDurationStats:
+        """Over loans borrowed in the months [since, until)."""
+        row = self._repo.duration(self._db, month_from=_month(since), month_to=_month(until))
+        return LoanDurationStats.model_construct(**row)
+
+    def top_members(self, limit: int) -> list[MemberActivityStats]:
+        return [MemberActivityStats.model_construct(**row) for row in self._repo.top_members(self._db, limit)]
+
+    def refresh(self) -> Iterator[str]:
+        """Refresh every view, each in its own transaction; yields each name once it is done."""
+        for view in STATS_VIEWS:
+            with unit_of_work(self._db):
+                self._repo.refresh(self._db, view)
+            yield view
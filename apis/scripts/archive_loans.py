@@ -0,0 +1,61 @@
+"""Move loans returned more than a horizon ago from loans_hot into the loans_archive partitions.
+
+Creates the archive's monthly partitions first (including a few months ahead), then moves
+loans in fixed-size chunks, one short transaction per chunk; safe to re-run (e.g. nightly
+from cron). Archived loans are still read through `loans`; only the hot indexes shrink.
+
+Run from apis/:
+  uv run python scripts/archive_loans.py
+  uv run python scripts/archive_loans.py --horizon-days 180 --chunk-size 500
+"""
+
+import argparse
+import logging
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+from app.db.config import get_loan_archive_horizon_days  # noqa: E402
+from app.db.session import SessionLocal  # noqa: E402
+from app.services.loan_archive_service import ARCHIVE_CHUNK_SIZE, LoanArchiveService  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Archive old returned loans in chunks.")
+    parser.add_argument(
+        "--horizon-days",
+        type=int,
+        default=get_loan_archive_horizon_days(),
+        help="Archive loans returned more than this many days ago (default: LOAN_ARCHIVE_HORIZON_DAYS or 365)",
+    )
+    parser.add_argument("--chunk-size", type=int, default=ARCHIVE_CHUNK_SIZE, help="Loans per transaction")
+    args = parser.parse_args()
+    if args.horizon_days < 0:
+        parser.error("--horizon-days must not be negative")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+    cutoff = datetime.now(timezone.utc) - timedelta(days=args.horizon_days)
+
+    db = SessionLocal()
+    service = LoanArchiveService(db)
+    moved = 0
+    try:
+        for name in service.ensure_partitions(cutoff=cutoff):
+            logger.info("Created partition %s", name)
+        for chunk, (chunk_scanned, chunk_moved) in enumerate(
+            service.archive(cutoff=cutoff, chunk_size=args.chunk_size), start=1
+        ):
+            moved += chunk_moved
+            logger.info("Chunk %d: %d loans scanned, %d archived", chunk, chunk_scanned, chunk_moved)
+    finally:
+        db.close()
+    logger.info("Done. %d loans returned before %s archived.", moved, cutoff.isoformat())
+
+
+if __name__ == "__main__":
+    main()
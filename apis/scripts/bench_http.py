@@ -0,0 +1,725 @@
+"""HTTP load benchmark: every API route under a weighted concurrent mix, with latency percentiles.
+
+`run` starts the API with uvicorn (sync stack, or --async-db) against DATABASE_URL, optionally
+resets it and loads a synthetic dataset first, then has --concurrency client threads send
+requests for --duration seconds, each request a route scenario picked by weight. Results
+(requests, throughput, errors and p50/p95/p99/max latency per route) go to a JSON file.
+`compare` diffs two result files and exits 1 if any route regressed.
+
+Every route the app serves needs a scenario in SCENARIOS; a route without one fails the run,
+so the suite keeps covering the whole API as routes are added. Write scenarios create books,
+members, copies and loans: point it at a disposable database.
+
+Client threads share one interpreter, so at high concurrency the client itself can become the
+bottleneck; compare runs made with the same settings on the same machine.
+
+Run from apis/:
+  uv run python scripts/bench_http.py routes
+  uv run python scripts/bench_http.py run --reset --books 20000 --members 5000 --loans 200000 \\
+      --concurrency 16 --duration 60 --out bench-base.json
+  uv run python scripts/bench_http.py run --mix "GET /api/v1/loans=20,POST /api/v1/loans/by-book=0" \\
+      --out bench-new.json
+  uv run python scripts/bench_http.py compare bench-base.json bench-new.json --threshold 10
+"""
+
+import argparse
+import http.client
+import json
+import math
+import os
+import platform
+import random
+import re
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter, deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlencode, urlsplit
+from uuid import uuid4
+
+APIS_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(APIS_DIR))
+
+from app.db.config import get_database_url  # noqa: E402
+
+API = "/api/v1"
+
+# ---- Dataset ----
+
+
+@dataclass(frozen=True)
+class Dataset:
+    books: int
+    members: int
+    copies_per_book: int
+    loans: int
+    active_share: float
+    seed: int
+
+
+def load_dataset(database_url: str, dataset: Dataset) -> None:
+    """Drop and recreate the schema, then load `dataset` with generate_data.py."""
+    env = {**os.environ, "DATABASE_URL": database_url}
+    subprocess.run([sys.executable, "scripts/migrate.py", "--clean"], cwd=APIS_DIR, env=env, check=True)
+    options = [f"--{name.replace('_', '-')}={value}" for name, value in vars(dataset).items()]
+    subprocess.run([sys.executable, "scripts/generate_data.py", *options], cwd=APIS_DIR, env=env, check=True)
+
+
+# ---- Scenarios ----
+
+
+@dataclass
+class Sample:
+    """Ids the scenarios draw from, read through the API before the run."""
+
+    started_at: datetime
+    book_ids: list[str]
+    isbns: list[str]
+    member_ids: list[str]
+    copy_ids: list[str]
+    loan_ids: list[str]
+    # Loans known to be out; borrow scenarios add to it, return scenarios take from it
+    active_loans: deque[str] = field(default_factory=deque)
+
+    def take_active(self, rng: random.Random) -> str:
+        try:
+            return self.active_loans.popleft()
+        except IndexError:
+            return rng.choice(self.loan_ids)
+
+
+@dataclass(frozen=True)
+class Call:
+    method: str
+    path: str
+    body: Any = None
+    content_type: str = "application/json"
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """How to exercise one route: `route` is "METHOD path" as in the OpenAPI document."""
+
+    route: str
+    weight: int
+    make: Callable[[Sample, random.Random], Call]
+    ok: frozenset[int] = frozenset({200})
+    # Called with the decoded body of a 2xx response (e.g. to remember a new loan)
+    after: Callable[[Sample, Any], None] | None = None
+
+
+def _get(path: str, **query: Any) -> Callable[[Sample, random.Random], Call]:
+    def make(sample: Sample, rng: random.Random) -> Call:
+        return Call("GET", API + path + ("?" + urlencode(query) if query else ""))
+
+    return make
+
+
+def _due(days: int = 14) -> str:
+    return (datetime.now(timezone.utc) + timedelta(days=days)).isoformat()
+
+
+def _remember_loan(sample: Sample, body: Any) -> None:
+    sample.active_loans.append(body["id"])
+
+
+def _remember_batch(sample: Sample, body: Any) -> None:
+    sample.active_loans.extend(item["loan"]["id"] for item in body["items"] if item["loan"] is not None)
+
+
+def _search(sample: Sample, rng: random.Random) -> Call:
+    q = rng.choice(["bench", "book", "author", f"book {rng.randint(1, 999)}", f"author {rng.randint(1, 996)}"])
+    return Call("GET", f"{API}/books/search?" + urlencode({"q": q, "limit": 20}))
+
+
+def _list_loans(sample: Sample, rng: random.Random) -> Call:
+    query: dict[str, Any] = rng.choice(
+        [
+            {"limit": 50},
+            {"limit": 50, "active_only": "true"},
+            {"limit": 50, "member_id": rng.choice(sample.member_ids)},
+            {"limit": 50, "book_id": rng.choice(sample.book_ids)},
+        ]
+    )
+    return Call("GET", f"{API}/loans?" + urlencode(query))
+
+
+def _since(sample: Sample) -> str:
+    return urlencode({"since": sample.started_at.isoformat()})
+
+
+SCENARIOS = [
+    Scenario("GET /api/v1/health", 1, _get("/health")),
+    # Catalog reads
+    Scenario("GET /api/v1/books", 10, _get("/books", limit=50)),
+    Scenario("GET /api/v1/books/search", 5, _search),
+    Scenario("GET /api/v1/books/{book_id}", 10, lambda s, r: Call("GET", f"{API}/books/{r.choice(s.book_ids)}")),
+    Scenario(
+        "GET /api/v1/books/{book_id}/copies",
+        5,
+        lambda s, r: Call("GET", f"{API}/books/{r.choice(s.book_ids)}/copies"),
+    ),
+    Scenario("GET /api/v1/members", 3, _get("/members", limit=50)),
+    Scenario("GET /api/v1/members/{member_id}", 5, lambda s, r: Call("GET", f"{API}/members/{r.choice(s.member_ids)}")),
+    Scenario(
+        "GET /api/v1/members/{member_id}/summary",
+        5,
+        lambda s, r: Call("GET", f"{API}/members/{r.choice(s.member_ids)}/summary"),
+    ),
+    Scenario("GET /api/v1/loans", 10, _list_loans),
+    Scenario("GET /api/v1/loans/overdue", 3, _get("/loans/overdue", limit=100)),
+    Scenario("GET /api/v1/loans/{loan_id}", 5, lambda s, r: Call("GET", f"{API}/loans/{r.choice(s.loan_ids)}")),
+    # Desk writes; borrowing a copy that is out (or a book with none left) is a 400, not an error
+    Scenario(
+        "POST /api/v1/loans",
+        3,
+        lambda s, r: Call(
+            "POST",
+            f"{API}/loans",
+            {"member_id": r.choice(s.member_ids), "copy_id": r.choice(s.copy_ids), "due_at": _due()},
+        ),
+        frozenset({201, 400}),
+        _remember_loan,
+    ),
+    Scenario(
+        "POST /api/v1/loans/by-book",
+        3,
+        lambda s, r: Call(
+            "POST",
+            f"{API}/loans/by-book",
+            {"member_id": r.choice(s.member_ids), "book_id": r.choice(s.book_ids), "due_at": _due()},
+        ),
+        frozenset({201, 400}),
+        _remember_loan,
+    ),
+    Scenario(
+        "POST /api/v1/loans/batch",
+        1,
+        lambda s, r: Call(
+            "POST",
+            f"{API}/loans/batch",
+            {"member_id": r.choice(s.member_ids), "copy_ids": r.sample(s.copy_ids, 5), "due_at": _due()},
+        ),
+        after=_remember_batch,
+    ),
+    Scenario(
+        "POST /api/v1/loans/{loan_id}/return",
+        3,
+        lambda s, r: Call("POST", f"{API}/loans/{s.take_active(r)}/return"),
+        frozenset({200, 400}),
+    ),
+    Scenario(
+        "POST /api/v1/loans/batch-return",
+        1,
+        lambda s, r: Call("POST", f"{API}/loans/batch-return", {"loan_ids": [s.take_active(r) for _ in range(5)]}),
+    ),
+    Scenario(
+        "POST /api/v1/books",
+        1,
+        lambda s, r: Call("POST", f"{API}/books", {"title": f"New Book {uuid4().hex[:8]}", "author": "Bench Author"}),
+        frozenset({201}),
+    ),
+    Scenario(
+        "PUT /api/v1/books/{book_id}",
+        1,
+        lambda s, r: Call("PUT", f"{API}/books/{r.choice(s.book_ids)}", {"description": f"Revised {uuid4().hex}"}),
+    ),
+    Scenario(
+        "POST /api/v1/books/{book_id}/copies",
+        1,
+        lambda s, r: Call("POST", f"{API}/books/{r.choice(s.book_ids)}/copies", {"copy_code": uuid4().hex}),
+        frozenset({201}),
+    ),
+    Scenario(
+        "POST /api/v1/members",
+        1,
+        lambda s, r: Call("POST", f"{API}/members", {"name": f"New Member {uuid4().hex[:8]}"}),
+        frozenset({201}),
+    ),
+    Scenario(
+        "PUT /api/v1/members/{member_id}",
+        1,
+        lambda s, r: Call("PUT", f"{API}/members/{r.choice(s.member_ids)}", {"phone": str(r.randint(10**6, 10**7))}),
+    ),
+    # Bulk endpoints: small bodies, so they measure per-request overhead rather than volume
+    Scenario(
+        "POST /api/v1/imports/books",
+        1,
+        lambda s, r: Call(
+            "POST",
+            f"{API}/imports/books",
+            [{"title": f"Imported {uuid4().hex[:8]}", "author": "Bench Author", "isbn": f"I{uuid4().hex[:12]}"}
+             for _ in range(10)],
+        ),
+    ),
+    Scenario(
+        "POST /api/v1/imports/members",
+        1,
+        lambda s, r: Call(
+            "POST",
+            f"{API}/imports/members",
+            [{"name": "Imported Member", "email": f"{uuid4().hex}@bench.example"} for _ in range(10)],
+        ),
+    ),
+    Scenario(
+        "POST /api/v1/imports/copies",
+        1,
+        lambda s, r: Call(
+            "POST",
+            f"{API}/imports/copies",
+            [{"copy_code": uuid4().hex, "isbn": r.choice(s.isbns)} for _ in range(5)],
+        ),
+    ),
+    # Exports are bounded to rows created since the run started (loans: the last day)
+    Scenario(
+        "GET /api/v1/exports/loans.{fmt}",
+        1,
+        lambda s, r: Call(
+            "GET",
+            f"{API}/exports/loans.ndjson?"
+            + urlencode({"since": (datetime.now(timezone.utc) - timedelta(days=1)).isoformat()}),
+        ),
+    ),
+    Scenario("GET /api/v1/exports/books.{fmt}", 1, lambda s, r: Call("GET", f"{API}/exports/books.csv?{_since(s)}")),
+    Scenario(
+        "GET /api/v1/exports/members.{fmt}", 1, lambda s, r: Call("GET", f"{API}/exports/members.csv?{_since(s)}")
+    ),
+    # Dashboards and operations
+    Scenario("GET /api/v1/stats/top-books", 2, _get("/stats/top-books", limit=10)),
+    Scenario("GET /api/v1/stats/loans-per-month", 2, _get("/stats/loans-per-month")),
+    Scenario("GET /api/v1/stats/loan-duration", 2, _get("/stats/loan-duration")),
+    Scenario("GET /api/v1/stats/top-members", 2, _get("/stats/top-members", limit=10)),
+    Scenario("GET /api/v1/internal/pool", 1, _get("/internal/pool")),
+    Scenario("GET /api/v1/internal/cache", 1, _get("/internal/cache")),
+]
+
+
+def served_routes(async_db: bool) -> set[str]:
+    """"METHOD path" of every operation the app serves on the chosen stack."""
+    from app.factory import create_app
+
+    paths = create_app(async_db=async_db).openapi()["paths"]
+    return {f"{method.upper()} {path}" for path, operations in paths.items() for method in operations}
+
+
+def parse_mix(raw: str | None) -> dict[str, int]:
+    """ "METHOD path=weight,..." overrides; weight 0 leaves the route out."""
+    weights: dict[str, int] = {}
+    for item in filter(None, (part.strip() for part in (raw or "").split(","))):
+        route, _, weight = item.rpartition("=")
+        if not route or not weight.isdigit():
+            raise ValueError(f"Bad --mix entry {item!r}: expected 'METHOD /path=weight'")
+        weights[route.strip()] = int(weight)
+    unknown = set(weights) - {s.route for s in SCENARIOS}
+    if unknown:
+        raise ValueError(f"Unknown routes in --mix: {', '.join(sorted(unknown))}")
+    return weights
+
+
+# ---- Load ----
+
+
+# Methods safe to resend when the connection drops before a response: a POST the server may
+# already have run is reported as a transport error instead of being run twice
+RETRYABLE_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS"})
+
+
+class HttpClient:
+    """Keep-alive HTTP/1.1 connection that reconnects after a transport error."""
+
+    def __init__(self, base_url: str, timeout: float) -> None:
+        parts = urlsplit(base_url)
+        self._host = parts.hostname or "127.0.0.1"
+        self._port = parts.port or 80
+        self._timeout = timeout
+        self._conn = self._connect()
+
+    def _connect(self) -> http.client.HTTPConnection:
+        return http.client.HTTPConnection(self._host, self._port, timeout=self._timeout)
+
+    def send(self, call: Call) -> tuple[int, bytes]:
+        """(status, body); status 0 on a transport error or timeout."""
+        body = None if call.body is None else json.dumps(call.body).encode()
+        headers = {} if body is None else {"Content-Type": call.content_type}
+        for _ in range(2 if call.method in RETRYABLE_METHODS else 1):
+            try:
+                self._conn.request(call.method, call.path, body=body, headers=headers)
+                response = self._conn.getresponse()
+                return response.status, response.read()
+            except (ConnectionResetError, BrokenPipeError, http.client.RemoteDisconnected):
+                # The server dropped the kept-alive connection (it does after a 500): resend once if idempotent
+                self._reconnect()
+            except (OSError, http.client.HTTPException):
+                self._reconnect()
+                break
+        return 0, b""
+
+    def _reconnect(self) -> None:
+        self._conn.close()
+        self._conn = self._connect()
+
+    def get_json(self, path: str) -> Any:
+        status, body = self.send(Call("GET", API + path))
+        if status != 200:
+            raise RuntimeError(f"GET {path} returned {status}")
+        return json.loads(body)
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def take_sample(base_url: str) -> Sample:
+    client = HttpClient(base_url, timeout=60)
+    try:
+        books = client.get_json("/books?limit=500")
+        members = client.get_json("/members?limit=500")
+        loans = client.get_json("/loans?limit=500")
+        active = client.get_json("/loans?limit=500&active_only=true")
+        copy_ids = [c["id"] for b in books[:100] for c in client.get_json(f"/books/{b['id']}/copies")]
+    finally:
+        client.close()
+    if not books or not members or not loans or not copy_ids:
+        raise RuntimeError("The database needs books, members, copies and loans: run with --reset")
+    return Sample(
+        started_at=datetime.now(timezone.utc),
+        book_ids=[b["id"] for b in books],
+        isbns=[b["isbn"] for b in books if b["isbn"]],
+        member_ids=[m["id"] for m in members],
+        copy_ids=copy_ids,
+        loan_ids=[loan["id"] for loan in loans],
+        active_loans=deque(loan["id"] for loan in active),
+    )
+
+
+@dataclass
+class RouteResults:
+    latencies: list[float] = field(default_factory=list)
+    statuses: Counter[int] = field(default_factory=Counter)
+    errors: int = 0
+
+    def merge(self, other: "RouteResults") -> None:
+        self.latencies.extend(other.latencies)
+        self.statuses.update(other.statuses)
+        self.errors += other.errors
+
+
+def _drive(
+    base_url: str,
+    scenarios: list[Scenario],
+    sample: Sample,
+    *,
+    seed: int,
+    measure_from: float,
+    until: float,
+    timeout: float,
+    out: dict[str, RouteResults],
+) -> None:
+    """One client: send weighted-random requests until `until`, recording those sent after `measure_from`."""
+    rng = random.Random(seed)
+    cum_weights = list(accumulate(s.weight for s in scenarios))
+    client = HttpClient(base_url, timeout)
+    try:
+        while (start := time.perf_counter()) < until:
+            scenario = rng.choices(scenarios, cum_weights=cum_weights)[0]
+            status, body = client.send(scenario.make(sample, rng))
+            elapsed = time.perf_counter() - start
+            ok = status in scenario.ok
+            if scenario.after is not None and 200 <= status < 300:
+                scenario.after(sample, json.loads(body))
+            if start < measure_from:
+                continue
+            results = out.setdefault(scenario.route, RouteResults())
+            results.latencies.append(elapsed)
+            results.statuses[status] += 1
+            results.errors += not ok
+    finally:
+        client.close()
+
+
+def percentile(ordered: list[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    return ordered[max(math.ceil(q / 100 * len(ordered)) - 1, 0)]
+
+
+def summarize(results: RouteResults, seconds: float) -> dict[str, Any]:
+    ordered = sorted(results.latencies)
+    count = len(ordered)
+    return {
+        "requests": count,
+        "errors": results.errors,
+        "error_rate": results.errors / count,
+        "throughput_rps": count / seconds,
+        **{f"p{q}_ms": percentile(ordered, q) * 1000 for q in (50, 95, 99)},
+        "max_ms": ordered[-1] * 1000,
+        "statuses": {str(status): n for status, n in sorted(results.statuses.items())},
+    }
+
+
+def run_load(
+    base_url: str, scenarios: list[Scenario], sample: Sample, *, concurrency: int, duration: float, warmup: float,
+    timeout: float,
+) -> dict[str, Any]:
+    measure_from = time.perf_counter() + warmup
+    until = measure_from + duration
+    per_thread: list[dict[str, RouteResults]] = [{} for _ in range(concurrency)]
+    threads = [
+        threading.Thread(
+            target=_drive,
+            args=(base_url, scenarios, sample),
+            kwargs={
+                "seed": i,
+                "measure_from": measure_from,
+                "until": until,
+                "timeout": timeout,
+                "out": per_thread[i],
+            },
+            daemon=True,
+        )
+        for i in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    merged: dict[str, RouteResults] = {}
+    total = RouteResults()
+    for results in per_thread:
+        for route, r in results.items():
+            merged.setdefault(route, RouteResults()).merge(r)
+            total.merge(r)
+    if not total.latencies:
+        raise RuntimeError("No requests completed in the measured window")
+    return {
+        "routes": {route: summarize(merged[route], duration) for route in sorted(merged)},
+        "total": summarize(total, duration),
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+@contextmanager
+def serve(database_url: str, *, async_db: bool, workers: int, log_path: Path) -> Iterator[str]:
+    """Run the API in a uvicorn subprocess logging to `log_path`; yields its base URL once /health answers."""
+    port = _free_port()
+    env = {**os.environ, "DATABASE_URL": database_url, "DB_ASYNC": "1" if async_db else "0"}
+    command = [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port)]
+    command += ["--workers", str(workers), "--log-level", "warning", "--no-access-log"]
+    log = log_path.open("w")
+    proc = subprocess.Popen(command, cwd=APIS_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 60
+        while True:
+            if proc.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {proc.returncode} (see {log_path})")
+            try:
+                with socket.create_connection(("127.0.0.1", port), timeout=1):
+                    pass
+                client = HttpClient(base_url, timeout=5)
+                ready = client.send(Call("GET", f"{API}/health"))[0] == 200
+                client.close()
+                if ready:
+                    break
+            except OSError:
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"API did not become ready within 60s (see {log_path})")
+            time.sleep(0.2)
+        yield base_url
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+        log.close()
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=APIS_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def cmd_run(args: argparse.Namespace) -> None:
+    try:
+        weights = {s.route: s.weight for s in SCENARIOS} | parse_mix(args.mix)
+    except ValueError as e:
+        sys.exit(str(e))
+    only = re.compile(args.only) if args.only else None
+    missing = served_routes(args.async_db) - weights.keys()
+    if missing:
+        sys.exit(f"No benchmark scenario for: {', '.join(sorted(missing))} (add them to SCENARIOS)")
+    scenarios = [
+        Scenario(s.route, weights[s.route], s.make, s.ok, s.after)
+        for s in SCENARIOS
+        if weights[s.route] > 0 and (only is None or only.search(s.route))
+    ]
+    if not scenarios:
+        sys.exit("No routes left to run (check --mix and --only)")
+
+    dataset = None
+    if args.reset:
+        dataset = Dataset(args.books, args.members, args.copies_per_book, args.loans, args.active_share, args.seed)
+        print(f"Loading dataset {dataset} ...", file=sys.stderr)
+        start = time.perf_counter()
+        load_dataset(args.database_url, dataset)
+        print(f"Loaded in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+    log_path = Path(args.out).with_suffix(".server.log")
+    with serve(args.database_url, async_db=args.async_db, workers=args.workers, log_path=log_path) as base_url:
+        sample = take_sample(base_url)
+        print(
+            f"Driving {len(scenarios)} routes: {args.concurrency} clients, {args.warmup:g}s warmup + "
+            f"{args.duration:g}s measured",
+            file=sys.stderr,
+        )
+        results = run_load(
+            base_url,
+            scenarios,
+            sample,
+            concurrency=args.concurrency,
+            duration=args.duration,
+            warmup=args.warmup,
+            timeout=args.timeout,
+        )
+    report = {
+        "meta": {
+            "started_at": sample.started_at.isoformat(),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "async_db": args.async_db,
+            "workers": args.workers,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "dataset": vars(dataset) if dataset else None,
+            "weights": {s.route: s.weight for s in scenarios},
+        },
+        **results,
+    }
+    Path(args.out).write_text(json.dumps(report, indent=2) + "\n")
+    print_report(report)
+    print(f"Wrote {args.out}", file=sys.stderr)
+
+
+def print_report(report: dict[str, Any]) -> None:
+    print(f"{'route':<46} {'req':>7} {'rps':>8} {'err':>5} {'p50':>8} {'p95':>8} {'p99':>8}")
+    rows = [*report["routes"].items(), ("TOTAL", report["total"])]
+    for route, r in rows:
+        print(
+            f"{route:<46} {r['requests']:>7} {r['throughput_rps']:>8.1f} {r['errors']:>5} "
+            f"{r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f}"
+        )
+
+
+# ---- Compare ----
+
+
+def regressions(base: dict[str, Any], new: dict[str, Any], *, threshold: float, min_ms: float) -> list[str]:
+    """Routes in both runs that got slower, lost throughput or failed more, beyond the noise allowances."""
+    found = []
+    for route in sorted(base["routes"].keys() & new["routes"].keys()):
+        b, n = base["routes"][route], new["routes"][route]
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            if n[key] > b[key] * (1 + threshold / 100) and n[key] - b[key] >= min_ms:
+                found.append(f"{route}: {key} {b[key]:.2f} -> {n[key]:.2f} ({(n[key] / b[key] - 1) * 100:+.0f}%)")
+        if n["throughput_rps"] < b["throughput_rps"] * (1 - threshold / 100):
+            found.append(f"{route}: throughput {b['throughput_rps']:.1f} -> {n['throughput_rps']:.1f} rps")
+        if n["error_rate"] > b["error_rate"] + 0.01:
+            found.append(f"{route}: error rate {b['error_rate']:.1%} -> {n['error_rate']:.1%}")
+    return found
+
+
+def cmd_compare(args: argparse.Namespace) -> None:
+    base = json.loads(Path(args.base).read_text())
+    new = json.loads(Path(args.new).read_text())
+    for key in ("async_db", "workers", "concurrency", "duration_s", "dataset", "weights"):
+        if base["meta"].get(key) != new["meta"].get(key):
+            print(f"warning: runs differ in {key}; results may not be comparable", file=sys.stderr)
+    print(f"{'route':<46} {'p95 base':>9} {'p95 new':>9} {'change':>8} {'rps base':>9} {'rps new':>9}")
+    for route in sorted(base["routes"].keys() | new["routes"].keys()):
+        b, n = base["routes"].get(route), new["routes"].get(route)
+        if b is None or n is None:
+            print(f"{route:<46} {'only in ' + ('new' if b is None else 'base'):>9}")
+            continue
+        change = (n["p95_ms"] / b["p95_ms"] - 1) * 100
+        print(
+            f"{route:<46} {b['p95_ms']:>9.2f} {n['p95_ms']:>9.2f} {change:>+7.0f}% "
+            f"{b['throughput_rps']:>9.1f} {n['throughput_rps']:>9.1f}"
+        )
+    found = regressions(base, new, threshold=args.threshold, min_ms=args.min_ms)
+    if found:
+        print(f"\n{len(found)} regression(s) over {args.threshold:g}%:")
+        for line in found:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"\nNo regressions over {args.threshold:g}%.")
+
+
+def cmd_routes(args: argparse.Namespace) -> None:
+    served = served_routes(args.async_db)
+    for s in SCENARIOS:
+        print(f"{s.weight:>3}  {s.route}{'' if s.route in served else '  (not served)'}")
+    for route in sorted(served - {s.route for s in SCENARIOS}):
+        print(f"  -  {route}  (no scenario)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="HTTP load benchmark of every API route.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Start the API, drive it and write a results file")
+    run.add_argument("--database-url", default=get_database_url(), help="Database to serve (default: DATABASE_URL)")
+    run.add_argument("--async-db", action="store_true", help="Serve the asyncpg stack (DB_ASYNC=1)")
+    run.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    run.add_argument("--concurrency", type=int, default=8, help="Concurrent client connections")
+    run.add_argument("--duration", type=float, default=30, help="Measured seconds")
+    run.add_argument("--warmup", type=float, default=5, help="Seconds of load before measuring")
+    run.add_argument("--timeout", type=float, default=30, help="Per-request timeout (seconds)")
+    run.add_argument("--mix", help="Weight overrides: 'METHOD /path=weight,...' (0 disables; see `routes`)")
+    run.add_argument("--only", help="Only routes matching this regex")
+    run.add_argument("--out", default="bench-results.json", help="Results file")
+    dataset = run.add_argument_group("dataset (with --reset: drops all tables first)")
+    dataset.add_argument("--reset", action="store_true", help="Recreate the schema and load a synthetic dataset")
+    dataset.add_argument("--books", type=int, default=10_000)
+    dataset.add_argument("--members", type=int, default=2_000)
+    dataset.add_argument("--copies-per-book", type=int, default=3)
+    dataset.add_argument("--loans", type=int, default=100_000, help="Total loans, active ones included")
+    dataset.add_argument("--active-share", type=float, default=0.2, help="Share of copies currently on loan")
+    dataset.add_argument("--seed", type=int, default=1, help="Generator seed; the same seed gives the same dataset")
+    run.set_defaults(func=cmd_run)
+
+    compare = commands.add_parser("compare", help="Flag regressions between two results files")
+    compare.add_argument("base")
+    compare.add_argument("new")
+    compare.add_argument("--threshold", type=float, default=10, help="Allowed slowdown / throughput loss, percent")
+    compare.add_argument("--min-ms", type=float, default=1, help="Ignore latency changes smaller than this")
+    compare.set_defaults(func=cmd_compare)
+
+    routes = commands.add_parser("routes", help="List scenarios and their default weights")
+    routes.add_argument("--async-db", action="store_true")
+    routes.set_defaults(func=cmd_routes)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Micro-benchmark: per-row cost of serializing the books and loans lists.
+
+Compares the previous route path (model_validate per row, then FastAPI re-validating the
+returned list against response_model and encoding via jsonable_encoder + json.dumps)
+with the fast path (one validation or model_construct, then TypeAdapter.dump_json).
+Rows are in-memory ORM objects, so no database is needed.
+
+Run from apis/:
+  uv run python scripts/bench_serialization.py --rows 5000 --repeat 5
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from app.models import Book, BookCopy, Loan, Member  # noqa: E402
+from app.schemas.book import BookResponse  # noqa: E402
+from app.schemas.loan import LoanWithDetailsResponse  # noqa: E402
+
+BOOK_LIST = TypeAdapter(list[BookResponse])
+LOAN_DETAILS_LIST = TypeAdapter(list[LoanWithDetailsResponse])
+
+
+def make_books(n: int) -> list[Book]:
+    now = datetime.now(timezone.utc)
+    return [
+        Book(
+            id=uuid4(),
+            title=f"Title {i}",
+            author=f"Author {i % 97}",
+            description="A fairly typical catalog description of moderate length. " * 3,
+            isbn=f"978-{i:010d}",
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(n)
+    ]
+
+
+def make_loans(n: int) -> list[Loan]:
+    now = datetime.now(timezone.utc)
+    member = Member(id=uuid4(), name="Alice Chen", email="alice@example.com", created_at=now, updated_at=now)
+    book = make_books(1)[0]
+    loans = []
+    for i in range(n):
+        copy = BookCopy(id=uuid4(), book_id=book.id, copy_code=f"C-{i}", created_at=now, updated_at=now)
+        copy.book = book
+        loan = Loan(
+            id=uuid4(),
+            member_id=member.id,
+            copy_id=copy.id,
+            borrowed_at=now,
+            due_at=now + timedelta(days=14),
+            returned_at=None,
+            created_at=now,
+            updated_at=now,
+        )
+        loan.member = member
+        loan.copy = copy
+        loans.append(loan)
+    return loans
+
+
+def fastapi_encode(adapter: TypeAdapter[list[object]], result: list[object]) -> bytes:
+    """What FastAPI does with a returned list when response_model is set."""
+    validated = adapter.validate_python(result, from_attributes=True)
+    return json.dumps(jsonable_encoder(adapter.dump_python(validated, mode="json"))).encode()
+
+
+def books_before(books: list[Book]) -> bytes:
+    return fastapi_encode(BOOK_LIST, [BookResponse.model_validate(b) for b in books])  # type: ignore[arg-type]
+
+
+def books_after(books: list[Book]) -> bytes:
+    return BOOK_LIST.dump_json(BOOK_LIST.validate_python(books, from_attributes=True))
+
+
+def loan_details(loan: Loan, build: Callable[..., LoanWithDetailsResponse]) -> LoanWithDetailsResponse:
+    return build(
+        id=loan.id,
+        member_id=loan.member_id,
+        member_name=loan.member.name,
+        copy_id=loan.copy_id,
+        copy_code=loan.copy.copy_code,
+        book_id=loan.copy.book_id,
+        book_title=loan.copy.book.title,
+        book_author=loan.copy.book.author,
+        borrowed_at=loan.borrowed_at,
+        due_at=loan.due_at,
+        returned_at=loan.returned_at,
+    )
+
+
+def loans_before(loans: list[Loan]) -> bytes:
+    result = [loan_details(loan, LoanWithDetailsResponse) for loan in loans]
+    return fastapi_encode(LOAN_DETAILS_LIST, result)  # type: ignore[arg-type]
+
+
+def loans_after(loans: list[Loan]) -> bytes:
+    result = [loan_details(loan, LoanWithDetailsResponse.model_construct) for loan in loans]
+    return LOAN_DETAILS_LIST.dump_json(result)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-row serialization cost of list routes.")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    books = make_books(args.rows)
+    loans = make_loans(args.rows)
+    cases = [
+        ("books", "before", lambda: books_before(books)),
+        ("books", "after", lambda: books_after(books)),
+        ("loans", "before", lambda: loans_before(loans)),
+        ("loans", "after", lambda: loans_after(loans)),
+    ]
+    print(f"{'list':<6} {'path':<7} {'us/row':>8}")
+    for name, path, fn in cases:
+        best = min(timeit.repeat(fn, number=1, repeat=args.repeat))
+        print(f"{name:<6} {path:<7} {best / args.rows * 1e6:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Container start - wait for Postgres, migrate and seed, then serve, all in one process.
+
+Replaces an entrypoint that started a fresh interpreter (re-importing SQLAlchemy and the
+models) for every readiness poll, for migrate.py and for seed_data.py before uvicorn.
+Here the app is imported once; the readiness poll backs off exponentially; migration
+and seeding run under a Postgres advisory lock, so replicas starting together take turns
+(both steps are idempotent, so the ones that wait find nothing left to do); and uvicorn
+then serves the already-imported app. Each phase's duration is logged.
+
+Run from apis/:
+  python scripts/bootstrap.py --host 0.0.0.0 --port 8000
+  python scripts/bootstrap.py --no-seed --workers 4
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+_started = time.perf_counter()
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger("bootstrap")
+# Keep engine.dispose() from logging the pool state
+logging.getLogger("sqlalchemy.pool").setLevel(logging.WARNING)
+
+import uvicorn  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+
+import seed_data  # noqa: E402
+from app.db.session import engine  # noqa: E402
+from main import app  # noqa: E402
+from migrate import migrate  # noqa: E402
+
+IMPORT_SECONDS = time.perf_counter() - _started
+
+# pg_advisory_lock key shared by every replica ("nlsboot" in ASCII)
+BOOTSTRAP_LOCK_ID = 0x6E6C73626F6F74
+FIRST_RETRY_SECONDS = 0.1
+MAX_RETRY_SECONDS = 2.0
+
+
+def wait_for_db(timeout: float) -> None:
+    """Poll until Postgres accepts connections, doubling the delay up to MAX_RETRY_SECONDS."""
+    deadline = time.monotonic() + timeout
+    delay = FIRST_RETRY_SECONDS
+    while True:
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            return
+        except OperationalError as e:
+            if time.monotonic() + delay > deadline:
+                raise
+            reason = str(e.orig).strip().splitlines()[0] if e.orig else str(e)
+            logger.info("  Postgres not ready (%s), retrying in %.1fs...", reason, delay)
+            time.sleep(delay)
+            delay = min(delay * 2, MAX_RETRY_SECONDS)
+
+
+def migrate_and_seed(seed: bool) -> None:
+    """Run the migration (and seed) while holding the bootstrap advisory lock.
+
+    The lock is session-level on a connection of its own, so it is released on unlock or,
+    if this process dies, when Postgres drops the connection.
+    """
+    with engine.connect() as conn:
+        params = {"id": BOOTSTRAP_LOCK_ID}
+        if not conn.execute(text("SELECT pg_try_advisory_lock(:id)"), params).scalar():
+            logger.info("  Another instance is migrating; waiting for it...")
+            conn.execute(text("SELECT pg_advisory_lock(:id)"), params)
+        # Session-level: the lock outlives this transaction, which must not sit idle meanwhile
+        conn.commit()
+        try:
+            migrate(engine)
+            if seed:
+                seed_data.main()
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:id)"), params)
+            conn.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Wait for Postgres, migrate and seed, then serve the API.")
+    parser.add_argument("--host", default="0.0.0.0", help="Bind address")
+    parser.add_argument("--port", type=int, default=8000, help="Bind port")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="uvicorn worker processes; above 1 each worker imports the app again",
+    )
+    parser.add_argument("--wait-timeout", type=float, default=60.0, help="Seconds to wait for Postgres")
+    parser.add_argument("--no-seed", action="store_true", help="Skip seeding the demo data")
+    args = parser.parse_args()
+
+    logger.info("Imported app in %.0f ms.", IMPORT_SECONDS * 1000)
+
+    started = time.perf_counter()
+    logger.info("Waiting for Postgres...")
+    wait_for_db(args.wait_timeout)
+    logger.info("Postgres is ready (%.0f ms).", (time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    logger.info("Migrating%s...", "" if args.no_seed else " and seeding")
+    migrate_and_seed(not args.no_seed)
+    logger.info("Database ready (%.0f ms).", (time.perf_counter() - started) * 1000)
+    # Serve from fresh pools, not the bootstrap's connections
+    engine.dispose()
+
+    logger.info("Starting API (%.0f ms after start)...", (time.perf_counter() - _started) * 1000)
+    if args.workers > 1:
+        uvicorn.run("main:app", host=args.host, port=args.port, workers=args.workers)
+    else:
+        uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
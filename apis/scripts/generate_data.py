@@ -0,0 +1,334 @@
+"""Generate a synthetic dataset at performance-testing scale: books, members, copies and loan history.
+
+Rows are streamed with COPY from parallel worker processes. Members load first; then each
+task loads a range of books together with their copies and loans, so tasks never touch the
+same books and the counter triggers on book_copies/loans (one run per COPY statement) do not
+contend. Ids, isbns, emails and copy codes carry a per-run tag, so the generator can add to a
+database that already has data.
+
+Each copy's loans sit in consecutive, non-overlapping slots over --history-days, ending
+ACTIVE_WINDOW_DAYS before now, so every loan passes the ck_loans_* checks and only a copy's
+last loan can still be out (ix_loans_active_copy). That last loan is out for --active-share
+of the copies, borrowed within ACTIVE_WINDOW_DAYS, which leaves about half of the active
+loans overdue. Loans per book follow a popularity curve (the most popular book gets
+POPULARITY_SKEW + 1 times the least popular), and HEAVY_BORROWERS of the members take
+HEAVY_BORROWER_LOANS of the loans.
+
+seed_data.py still loads the small demo catalog; use this one for volume.
+
+Run from apis/:
+  uv run python scripts/generate_data.py --books 100000 --members 50000 --loans 10000000
+  uv run python scripts/generate_data.py --books 1000 --members 200 --loans 20000 --workers 2 --seed 7
+"""
+
+import argparse
+import io
+import logging
+import math
+import os
+import random
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate, batched, pairwise
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+from sqlalchemy import create_engine, text  # noqa: E402
+from sqlalchemy.pool import NullPool  # noqa: E402
+
+from app.db.config import get_database_url  # noqa: E402
+from app.db.session import SessionLocal  # noqa: E402
+from app.services.stats_service import StatsService  # noqa: E402
+
+# Books per task (with their copies and loans), members per task
+BOOKS_PER_TASK = 2000
+MEMBERS_PER_TASK = 50_000
+# Rows per COPY statement, each committed on its own
+COPY_ROWS = 100_000
+
+LOAN_DAYS = 14
+ACTIVE_WINDOW_DAYS = 28
+POPULARITY_SKEW = 9
+HEAVY_BORROWERS = 0.2
+HEAVY_BORROWER_LOANS = 0.8
+# Shortest history slot a loan can get; more loans per copy than fit is an error
+MIN_SLOT_DAYS = 1.0
+
+# Id kinds: the hex digit after the run tag
+BOOK, MEMBER, COPY, LOAN = 1, 2, 3, 4
+# Loan index = copy index << LOAN_SEQ_BITS | position in the copy's history
+LOAN_SEQ_BITS = 20
+
+FIRST_NAMES = [
+    "Alice", "Bob", "Carol", "David", "Eva", "Farid", "Grace", "Hiro", "Ines", "Jonas", "Kemi", "Lena",
+    "Mateo", "Nadia", "Omar", "Priya", "Quinn", "Rosa", "Sven", "Tara", "Umar", "Vera", "Wei", "Yara",
+]  # fmt: skip
+LAST_NAMES = [
+    "Chen", "Martinez", "Okonkwo", "Park", "Schmidt", "Haddad", "Ivanova", "Kim", "Lopez", "Mensah",
+    "Novak", "Osei", "Patel", "Rossi", "Sato", "Tanaka", "Umarov", "Varga", "Weber", "Zhang",
+]  # fmt: skip
+TITLE_WORDS = [
+    "data", "systems", "design", "patterns", "architecture", "learning", "history", "garden", "river",
+    "city", "night", "ocean", "engineering", "mountain", "secret", "language", "silent", "journey",
+    "practical", "modern", "distributed", "theory", "kitchen", "letters", "stars", "winter", "atlas",
+]  # fmt: skip
+
+
+@dataclass(frozen=True)
+class Plan:
+    """What every worker needs; ids are derived from row indexes, so nothing is read back."""
+
+    database_url: str
+    tag: int
+    seed: int
+    members: int
+    copies_per_book: int
+    active_share: float
+    history_days: float
+    now: datetime
+
+    def id(self, kind: int, index: int) -> str:
+        """Deterministic uuid (32 hex digits): run tag, kind, index."""
+        return f"{self.tag:016x}{kind:x}{index:015x}"
+
+    @property
+    def short_tag(self) -> str:
+        return f"{self.tag & 0xFFFFFF:06x}"
+
+
+def loan_counts(books: int, loans: int) -> list[int]:
+    """Loans per book along the popularity curve, summing to exactly `loans`."""
+    weights = [1 / (1 + POPULARITY_SKEW * i / books) for i in range(books)]
+    scale = loans / sum(weights)
+    bounds = [round(c * scale) for c in accumulate(weights, initial=0.0)]
+    return [b - a for a, b in pairwise(bounds)]
+
+
+def _copy(conn: Any, table: str, columns: str, rows: Iterable[tuple[str | None, ...]]) -> int:
+    """COPY text rows (None for NULL) into `table`, COPY_ROWS per statement and transaction."""
+    count = 0
+    cursor = conn.cursor()
+    try:
+        for chunk in batched(rows, COPY_ROWS):
+            buffer = io.StringIO()
+            buffer.writelines("\t".join(r"\N" if v is None else v for v in row) + "\n" for row in chunk)
+            buffer.seek(0)
+            cursor.copy_expert(f"COPY {table} ({columns}) FROM STDIN", buffer)
+            conn.commit()
+            count += len(chunk)
+    finally:
+        cursor.close()
+    return count
+
+
+def _connect(plan: Plan) -> Any:
+    """A raw psycopg2 connection for COPY; synthetic data does not need to wait for WAL flushes."""
+    conn = create_engine(plan.database_url, poolclass=NullPool).raw_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SET synchronous_commit = off")
+    finally:
+        cursor.close()
+    return conn
+
+
+def load_members(plan: Plan, start: int, stop: int) -> dict[str, int]:
+    """Members [start, stop)."""
+    rng = random.Random(f"{plan.seed}:members:{start}")
+
+    def rows() -> Iterator[tuple[str | None, ...]]:
+        for i in range(start, stop):
+            name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+            phone = f"+1-555-{rng.randrange(10**7):07d}" if rng.random() < 0.7 else None
+            yield plan.id(MEMBER, i), name, f"member{i}.{plan.short_tag}@example.com", phone
+
+    conn = _connect(plan)
+    try:
+        return {"members": _copy(conn, "members", "id, name, email, phone", rows())}
+    finally:
+        conn.close()
+
+
+def _loans(plan: Plan, rng: random.Random, copy_index: int, count: int, out: dict[str, int]) -> Iterator[tuple[str | None, ...]]:
+    """One copy's loans: `count` in all, the last one still out for --active-share of copies."""
+    active = count > 0 and rng.random() < plan.active_share
+    history = count - active
+    history_end = plan.now - timedelta(days=ACTIVE_WINDOW_DAYS)
+    history_start = history_end - timedelta(days=plan.history_days)
+    copy_id = plan.id(COPY, copy_index)
+    slot = plan.history_days / max(history, 1)
+    heavy = max(1, int(plan.members * HEAVY_BORROWERS))
+    for seq in range(count):
+        # Heavy borrowers are the members with the lowest indexes
+        if heavy == plan.members or rng.random() < HEAVY_BORROWER_LOANS:
+            member = int(rng.random() * heavy)
+        else:
+            member = heavy + int(rng.random() * (plan.members - heavy))
+        member_id = plan.id(MEMBER, member)
+        if seq < history:
+            slot_start = seq * slot
+            borrowed_at = history_start + timedelta(days=slot_start + rng.random() * slot / 4)
+            # Some returns come after the due date; all come before the next slot starts
+            returned_at = borrowed_at + timedelta(days=min(rng.uniform(0.5, LOAN_DAYS + 7), slot * 3 / 4))
+        else:
+            borrowed_at = plan.now - timedelta(days=rng.random() * ACTIVE_WINDOW_DAYS)
+            returned_at = None
+            out["active"] += 1
+        updated_at = (returned_at or borrowed_at).isoformat()
+        yield (
+            plan.id(LOAN, copy_index << LOAN_SEQ_BITS | seq),
+            member_id,
+            copy_id,
+            borrowed_at.isoformat(),
+            (borrowed_at + timedelta(days=LOAN_DAYS)).isoformat(),
+            returned_at.isoformat() if returned_at else None,
+            borrowed_at.isoformat(),
+            updated_at,
+        )
+
+
+def load_books(plan: Plan, start: int, counts: list[int]) -> dict[str, int]:
+    """Books [start, start + len(counts)) with their copies and `counts[i]` loans each."""
+    rng = random.Random(f"{plan.seed}:books:{start}")
+    per_book = plan.copies_per_book
+    stop = start + len(counts)
+    out = {"books": 0, "copies": 0, "loans": 0, "active": 0}
+
+    def books() -> Iterator[tuple[str | None, ...]]:
+        for i in range(start, stop):
+            title = " ".join(rng.sample(TITLE_WORDS, rng.randint(2, 4))).capitalize()
+            author = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+            description = f"Synthetic title number {i}." if rng.random() < 0.5 else None
+            yield plan.id(BOOK, i), title, author, description, f"S{plan.short_tag}{i:010d}"
+
+    def copies() -> Iterator[tuple[str | None, ...]]:
+        for i in range(start, stop):
+            for c in range(i * per_book, (i + 1) * per_book):
+                yield plan.id(COPY, c), plan.id(BOOK, i), f"{plan.short_tag}-{c:010d}"
+
+    def loans() -> Iterator[tuple[str | None, ...]]:
+        for i, count in zip(range(start, stop), counts):
+            for k in range(per_book):
+                yield from _loans(plan, rng, i * per_book + k, count // per_book + (k < count % per_book), out)
+
+    conn = _connect(plan)
+    try:
+        out["books"] = _copy(conn, "books", "id, title, author, description, isbn", books())
+        out["copies"] = _copy(conn, "book_copies", "id, book_id, copy_code", copies())
+        out["loans"] = _copy(
+            conn,
+            "loans",
+            "id, member_id, copy_id, borrowed_at, due_at, returned_at, created_at, updated_at",
+            loans(),
+        )
+    finally:
+        conn.close()
+    return out
+
+
+def _run(futures: list[Future[dict[str, int]]], label: str, total: int) -> dict[str, int]:
+    """Wait for `futures`, logging progress about every 10%; re-raises the first failure."""
+    done: dict[str, int] = {}
+    start = time.perf_counter()
+    next_report = 0.1
+    for future in as_completed(futures):
+        for key, n in future.result().items():
+            done[key] = done.get(key, 0) + n
+        share = done[label] / total
+        if share >= next_report or share == 1:
+            elapsed = time.perf_counter() - start
+            logger.info("  %s %s/%s (%.0f rows/s)", label, done[label], total, sum(done.values()) / elapsed)
+            next_report = math.floor(share * 10 + 1) / 10
+    return done
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load a synthetic books/members/copies/loans dataset with COPY.")
+    parser.add_argument("--books", type=int, default=10_000)
+    parser.add_argument("--members", type=int, default=5_000)
+    parser.add_argument("--copies-per-book", type=int, default=3)
+    parser.add_argument("--loans", type=int, default=100_000, help="Total loans, active ones included")
+    parser.add_argument("--active-share", type=float, default=0.2, help="Share of copies currently on loan")
+    parser.add_argument("--history-days", type=float, default=730, help="Span of the returned-loan history")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4, help="Loader processes")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed (default: random)")
+    args = parser.parse_args()
+
+    if args.books < 1 or args.members < 1 or args.copies_per_book < 1:
+        sys.exit("--books, --members and --copies-per-book must be at least 1")
+    if not 0 <= args.active_share <= 1:
+        sys.exit("--active-share must be between 0 and 1")
+    counts = loan_counts(args.books, args.loans)
+    busiest = math.ceil(max(counts) / args.copies_per_book)
+    if args.history_days / busiest < MIN_SLOT_DAYS:
+        sys.exit(
+            f"The busiest copy would need {busiest} loans in {args.history_days:g} days; "
+            "add books or copies, or lengthen --history-days"
+        )
+
+    seed = args.seed if args.seed is not None else random.randrange(2**32)
+    plan = Plan(
+        database_url=get_database_url(),
+        tag=random.Random(seed).getrandbits(64),
+        seed=seed,
+        members=args.members,
+        copies_per_book=args.copies_per_book,
+        active_share=args.active_share,
+        history_days=args.history_days,
+        now=datetime.now(timezone.utc),
+    )
+    logger.info("Seed %s, %s workers", seed, args.workers)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        logger.info("Members")
+        _run(
+            [
+                pool.submit(load_members, plan, i, min(i + MEMBERS_PER_TASK, args.members))
+                for i in range(0, args.members, MEMBERS_PER_TASK)
+            ],
+            "members",
+            args.members,
+        )
+        # Loans reference members, so books (with their copies and loans) go second
+        logger.info("Books, copies and loans")
+        totals = _run(
+            [
+                pool.submit(load_books, plan, i, counts[i : i + BOOKS_PER_TASK])
+                for i in range(0, args.books, BOOKS_PER_TASK)
+            ],
+            "books",
+            args.books,
+        )
+    logger.info(
+        "Loaded %s books, %s copies, %s loans (%s active) in %.0fs",
+        totals["books"],
+        totals["copies"],
+        totals["loans"],
+        totals["active"],
+        time.perf_counter() - start,
+    )
+
+    engine = create_engine(plan.database_url, poolclass=NullPool)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("ANALYZE"))
+    engine.dispose()
+    db = SessionLocal()
+    try:
+        for view in StatsService(db).refresh():
+            logger.info("Refreshed %s", view)
+    finally:
+        db.close()
+    logger.info("Done in %.0fs.", time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -20,7 +20,32 @@ logger = logging.getLogger(__name__)
 import app.models  # noqa: F401, E402
 from app.db.base import Base  # noqa: E402
 from app.db.config import get_database_url  # noqa: E402
-from sqlalchemy import create_engine
+from app.db.schema import PRE_CREATE_DDL, PRE_DROP_DDL, UPGRADE_DDL  # noqa: E402
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+
+
+def migrate(engine: Engine, *, clean: bool = False) -> None:
+    """Create missing tables, views and indexes on `engine`; with `clean`, drop everything first."""
+    if clean:
+        with engine.begin() as conn:
+            for ddl in PRE_DROP_DDL:
+                conn.execute(text(ddl))
+        Base.metadata.drop_all(engine, checkfirst=True)
+        logger.info("Dropped all tables.")
+
+    with engine.begin() as conn:
+        for ddl in PRE_CREATE_DDL:
+            conn.execute(text(ddl))
+    Base.metadata.create_all(engine, checkfirst=True)
+    with engine.begin() as conn:
+        for ddl in UPGRADE_DDL:
+            conn.execute(text(ddl))
+    # create_all skips existing tables entirely; add indexes declared since they were created
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+    logger.info("Tables OK.")
 
 
 def main() -> None:
@@ -33,15 +58,7 @@ def main() -> None:
     args = parser.parse_args()
 
     try:
-        url = get_database_url()
-        engine = create_engine(url)
-
-        if args.clean:
-            Base.metadata.drop_all(engine, checkfirst=True)
-            logger.info("Dropped all tables.")
-
-        Base.metadata.create_all(engine, checkfirst=True)
-        logger.info("Tables OK.")
+        migrate(create_engine(get_database_url()), clean=args.clean)
     except Exception as e:
         logger.exception("Migration failed: %s", e)
         raise
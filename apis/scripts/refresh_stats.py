@@ -0,0 +1,37 @@
+"""Refresh the circulation statistics behind /api/v1/stats.
+
+Each materialized view is refreshed CONCURRENTLY in its own transaction, so the stats
+endpoints keep answering (from the previous snapshot) while it runs. Run it on a schedule,
+e.g. hourly from cron; the endpoints are as fresh as the last run.
+
+Run from apis/:
+  uv run python scripts/refresh_stats.py
+"""
+
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+from app.db.session import SessionLocal  # noqa: E402
+from app.services.stats_service import StatsService  # noqa: E402
+
+
+def main() -> None:
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        for view in StatsService(db).refresh():
+            logger.info("Refreshed %s (%.1fs)", view, time.perf_counter() - start)
+            start = time.perf_counter()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
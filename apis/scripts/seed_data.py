@@ -186,6 +186,8 @@ def main() -> None:
             logger.info("  + %s (%s)", copy_code, book_title)
         logger.info("  Created %s copies.\n", copies_created)
 
+        # Repositories only flush: everything above lands in one transaction
+        db.commit()
         logger.info("Done.")
     except Exception as e:
         logger.exception("Seed failed: %s", e)
@@ -0,0 +1,57 @@
+"""Queue a notice for every overdue loan into the overdue_notices outbox.
+
+Walks overdue loans in fixed-size chunks, one short transaction per chunk; safe to
+re-run (e.g. from cron), notices already queued are skipped.
+
+Run from apis/:
+  uv run python scripts/sweep_overdue.py
+  uv run python scripts/sweep_overdue.py --chunk-size 500 --as-of 2026-01-31T00:00:00+00:00
+"""
+
+import argparse
+import logging
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+from app.db.session import SessionLocal  # noqa: E402
+from app.services.overdue_service import SWEEP_CHUNK_SIZE, OverdueService  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Queue overdue notices in chunks.")
+    parser.add_argument("--chunk-size", type=int, default=SWEEP_CHUNK_SIZE, help="Loans per transaction")
+    parser.add_argument(
+        "--as-of",
+        type=datetime.fromisoformat,
+        default=None,
+        help="Count loans due before this time as overdue (default: now)",
+    )
+    args = parser.parse_args()
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+    as_of = args.as_of or datetime.now(timezone.utc)
+    if as_of.tzinfo is None:
+        as_of = as_of.replace(tzinfo=timezone.utc)
+
+    db = SessionLocal()
+    scanned = queued = 0
+    try:
+        for chunk, (chunk_scanned, chunk_queued) in enumerate(
+            OverdueService(db).sweep(as_of=as_of, chunk_size=args.chunk_size), start=1
+        ):
+            scanned += chunk_scanned
+            queued += chunk_queued
+            logger.info("Chunk %d: %d overdue loans, %d notices queued", chunk, chunk_scanned, chunk_queued)
+    finally:
+        db.close()
+    logger.info("Done. %d overdue loans as of %s, %d new notices.", scanned, as_of.isoformat(), queued)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Types and helpers shared by the test modules."""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.db.session import engine
+
+Json = dict[str, Any]
+
+
+def due_at(days: int = 14) -> str:
+    return (datetime.now(timezone.utc) + timedelta(days=days)).isoformat()
+
+
+def backdate_return(loan: Json, days: int) -> None:
+    """Make a loan one borrowed `days` ago and returned a week later."""
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "UPDATE loans SET borrowed_at = :at, due_at = :at + interval '14 days', "
+                "returned_at = :at + interval '7 days' WHERE id = :id"
+            ),
+            {"at": datetime.now(timezone.utc) - timedelta(days=days), "id": loan["id"]},
+        )
+
+
+def make_overdue(loan: Json, days: int) -> None:
+    """Backdate a loan to `days` overdue; the API can't create one (due_at must follow borrowed_at)."""
+    with engine.begin() as conn:
+        conn.execute(
+            text("UPDATE loans SET borrowed_at = :due - interval '14 days', due_at = :due WHERE id = :id"),
+            {"due": datetime.now(timezone.utc) - timedelta(days=days), "id": loan["id"]},
+        )
+
+
+def walk(client: TestClient, path: str, limit: int, max_pages: int = 100, **params: str | int) -> list[Json]:
+    """Every row of `path`, fetched `limit` at a time by following X-Next-Cursor."""
+    rows: list[Json] = []
+    query: dict[str, str | int] = {**params, "limit": limit}
+    for _ in range(max_pages):
+        response = client.get(path, params=query)
+        assert response.status_code == 200, response.text
+        rows.extend(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return rows
+        query["cursor"] = cursor
+    raise AssertionError(f"{path} still had a next page after {max_pages} pages")
@@ -0,0 +1,80 @@
+"""Loan archival - loans returned before the cutoff move to loans_archive and stay readable."""
+
+import sys
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+
+import archive_loans
+import pytest
+from fastapi.testclient import TestClient
+from helpers import Json, backdate_return
+from sqlalchemy import text
+
+from app.db.schema import archive_partition_name
+from app.db.session import SessionLocal, engine
+from app.services.loan_archive_service import LoanArchiveService
+
+HORIZON = timedelta(days=365)
+
+
+def partitions(loans: list[Json]) -> list[str]:
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text("SELECT id, tableoid::regclass::text FROM loans WHERE id = ANY(CAST(:ids AS uuid[]))"),
+            {"ids": [loan["id"] for loan in loans]},
+        ).all()
+    partition = {str(id): name for id, name in rows}
+    return [partition[loan["id"]] for loan in loans]
+
+
+@pytest.fixture
+def loans(
+    client: TestClient,
+    make_member: Callable[[], Json],
+    make_book: Callable[..., tuple[Json, list[Json]]],
+    borrow: Callable[[Json, Json], Json],
+) -> list[Json]:
+    """Two loans returned long ago, one returned recently, one still out."""
+    member = make_member()
+    _, copies = make_book(copies=4)
+    loans = [borrow(member, copy) for copy in copies]
+    backdate_return(loans[0], 800)
+    backdate_return(loans[1], 700)
+    backdate_return(loans[2], 30)
+    return loans
+
+
+def test_archive_moves_loans_returned_before_the_cutoff(client: TestClient, loans: list[Json]) -> None:
+    cutoff = datetime.now(timezone.utc) - HORIZON
+    with SessionLocal() as db:
+        service = LoanArchiveService(db)
+        service.ensure_partitions(cutoff=cutoff)
+        assert sum(moved for _, moved in service.archive(cutoff=cutoff, chunk_size=1)) >= 2
+        assert sum(moved for _, moved in service.archive(cutoff=cutoff, chunk_size=1)) == 0
+
+    # Archived loans are still read through `loans`, from their borrowed_at month's partition
+    archived = [client.get(f"/loans/{loan['id']}").json() for loan in loans[:2]]
+    months = [datetime.fromisoformat(loan["borrowed_at"]).date().replace(day=1) for loan in archived]
+    assert partitions(loans) == [*map(archive_partition_name, months), "loans_hot", "loans_hot"]
+
+
+def test_script_creates_partitions_once(
+    monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture, loans: list[Json]
+) -> None:
+    ensure_partitions = LoanArchiveService.ensure_partitions
+    calls = 0
+
+    def counted(self: LoanArchiveService, *, cutoff: datetime) -> list[str]:
+        nonlocal calls
+        calls += 1
+        return ensure_partitions(self, cutoff=cutoff)
+
+    monkeypatch.setattr(LoanArchiveService, "ensure_partitions", counted)
+    monkeypatch.setattr(sys, "argv", ["archive_loans.py", "--horizon-days", "365", "--chunk-size", "1"])
+    caplog.set_level("INFO", logger=archive_loans.__name__)
+
+    archive_loans.main()
+
+    assert calls == 1
+    assert [name == "loans_hot" for name in partitions(loans)] == [False, False, True, True]
+    assert "Done." in caplog.text
@@ -0,0 +1,57 @@
+"""Async stack parity - the asyncpg routes serve the same paths and the same bodies as the sync ones."""
+
+from collections.abc import Iterator
+from importlib.util import find_spec
+from uuid import uuid4
+
+import pytest
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from helpers import Json, due_at
+
+from app.factory import create_app
+
+pytestmark = pytest.mark.skipif(find_spec("asyncpg") is None, reason="asyncpg not installed")
+
+
+def routes(async_db: bool) -> set[tuple[str, str]]:
+    app = create_app(async_db=async_db)
+    return {(method, r.path) for r in app.routes if isinstance(r, APIRoute) for method in r.methods or ()}
+
+
+@pytest.fixture
+def clients(request: pytest.FixtureRequest, client: TestClient) -> Iterator[tuple[TestClient, TestClient]]:
+    """(sync, async) clients against the same database: `client` and one on the other stack.
+
+    Never two async clients at once: each runs its own event loop, and they would share the
+    asyncpg pool, whose connections belong to the loop that opened them.
+    """
+    is_async = request.node.callspec.params["client"] == "async"
+    with TestClient(create_app(async_db=not is_async), base_url="http://testserver/api/v1") as other:
+        yield (other, client) if is_async else (client, other)
+
+
+def test_both_stacks_serve_the_same_routes() -> None:
+    assert routes(async_db=True) == routes(async_db=False)
+
+
+def test_writes_on_one_stack_read_the_same_on_the_other(clients: tuple[TestClient, TestClient]) -> None:
+    sync, async_ = clients
+    member: Json = async_.post("/members", json={"name": f"Member {uuid4().hex[:8]}"}).json()
+    book: Json = sync.post("/books", json={"title": f"Book {uuid4().hex[:8]}", "author": "Test Author"}).json()
+    copy: Json = async_.post(f"/books/{book['id']}/copies", json={"copy_code": uuid4().hex}).json()
+    loan = sync.post("/loans", json={"member_id": member["id"], "copy_id": copy["id"], "due_at": due_at()})
+    assert loan.status_code == 201, loan.text
+
+    for path in [
+        f"/members/{member['id']}",
+        f"/members/{member['id']}/summary",
+        f"/books/{book['id']}",
+        f"/books/{book['id']}/copies",
+        f"/books/search?q={book['title']}",
+        f"/loans/{loan.json()['id']}",
+        f"/loans?member_id={member['id']}",
+    ]:
+        expected, actual = sync.get(path), async_.get(path)
+        assert (actual.status_code, actual.json()) == (expected.status_code, expected.json()), path
+        assert actual.status_code == 200, path
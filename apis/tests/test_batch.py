@@ -0,0 +1,72 @@
+"""Batch checkout and return - one transaction, an outcome per item in request order."""
+
+from collections.abc import Callable
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+from helpers import Json, due_at
+
+
+def outcomes(response: Json) -> list[str]:
+    return [item["status"] for item in response["items"]]
+
+
+def test_batch_checkout_reports_each_copy(
+    client: TestClient,
+    make_member: Callable[[], Json],
+    make_book: Callable[..., tuple[Json, list[Json]]],
+    borrow: Callable[[Json, Json], Json],
+) -> None:
+    member = make_member()
+    book, copies = make_book(copies=3)
+    borrow(make_member(), copies[1])
+    unknown = str(uuid4())
+    copy_ids = [copies[0]["id"], copies[1]["id"], unknown, copies[2]["id"], copies[0]["id"]]
+
+    response = client.post("/loans/batch", json={"member_id": member["id"], "copy_ids": copy_ids, "due_at": due_at()})
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    # A repeated copy is reported once
+    assert [item["id"] for item in body["items"]] == [copies[0]["id"], copies[1]["id"], unknown, copies[2]["id"]]
+    assert outcomes(body) == ["ok", "conflict", "not_found", "ok"]
+    assert (body["succeeded"], body["failed"]) == (2, 2)
+    assert all(item["loan"]["member_id"] == member["id"] for item in body["items"] if item["status"] == "ok")
+    assert client.get(f"/books/{book['id']}").json()["copies_available"] == 0
+
+
+def test_batch_checkout_for_an_unknown_member_is_404(
+    client: TestClient, make_book: Callable[..., tuple[Json, list[Json]]]
+) -> None:
+    _, copies = make_book()
+    body = {"member_id": str(uuid4()), "copy_ids": [copies[0]["id"]], "due_at": due_at()}
+    response = client.post("/loans/batch", json=body)
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Member not found"}
+
+
+def test_batch_return_reports_each_loan(
+    client: TestClient,
+    make_member: Callable[[], Json],
+    make_book: Callable[..., tuple[Json, list[Json]]],
+    borrow: Callable[[Json, Json], Json],
+) -> None:
+    member = make_member()
+    book, copies = make_book(copies=2)
+    first, second = (borrow(member, copy) for copy in copies)
+    assert client.post(f"/loans/{second['id']}/return").status_code == 200
+    unknown = str(uuid4())
+
+    response = client.post("/loans/batch-return", json={"loan_ids": [first["id"], second["id"], unknown]})
+
+    assert response.status_code == 200, response.text
+    assert outcomes(response.json()) == ["ok", "conflict", "not_found"]
+    assert response.json()["items"][0]["loan"]["returned_at"] is not None
+    assert client.get(f"/books/{book['id']}").json()["copies_available"] == 2
+
+
+def test_empty_batches_are_422(client: TestClient, make_member: Callable[[], Json]) -> None:
+    member = make_member()
+    empty = {"member_id": member["id"], "copy_ids": [], "due_at": due_at()}
+    assert client.post("/loans/batch", json=empty).status_code == 422
+    assert client.post("/loans/batch-return", json={"loan_ids": []}).status_code == 422
@@ -0,0 +1,100 @@
+"""Borrow by book - a free copy is picked, lost races are retried within the route's query budget."""
+
+from collections.abc import Callable
+from uuid import UUID
+
+import pytest
+from fastapi.testclient import TestClient
+from helpers import Json, due_at
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.repositories import AsyncLoanRepository, LoanRepository
+from app.services.loan_service import ALLOCATION_ATTEMPTS
+
+
+def lose_races(monkeypatch: pytest.MonkeyPatch, taken: Json, times: int) -> None:
+    """The first `times` claims still run, but hand back `taken` (already on loan), as if another
+    request had loaned the claimed copy first."""
+    calls = 0
+    claim = LoanRepository.claim_available_copy_id
+    async_claim = AsyncLoanRepository.claim_available_copy_id
+
+    def lose(copy_id: UUID | None) -> UUID | None:
+        nonlocal calls
+        calls += 1
+        return UUID(taken["id"]) if calls <= times else copy_id
+
+    def patched(self: LoanRepository, db: Session, book_id: UUID) -> UUID | None:
+        return lose(claim(self, db, book_id))
+
+    async def async_patched(self: AsyncLoanRepository, db: AsyncSession, book_id: UUID) -> UUID | None:
+        return lose(await async_claim(self, db, book_id))
+
+    monkeypatch.setattr(LoanRepository, "claim_available_copy_id", patched)
+    monkeypatch.setattr(AsyncLoanRepository, "claim_available_copy_id", async_patched)
+
+
+def test_picks_a_copy_not_on_loan(
+    client: TestClient,
+    make_member: Callable[[], Json],
+    make_book: Callable[..., tuple[Json, list[Json]]],
+    borrow: Callable[[Json, Json], Json],
+) -> None:
+    member = make_member()
+    book, copies = make_book(copies=2)
+    borrow(member, copies[0])
+    response = client.post("/loans/by-book", json={"member_id": member["id"], "book_id": book["id"], "due_at": due_at()})
+    assert response.status_code == 201, response.text
+    assert response.json()["copy_id"] == copies[1]["id"]
+
+
+def test_no_free_copy_and_no_copies_are_400(
+    client: TestClient,
+    make_member: Callable[[], Json],
+    make_book: Callable[..., tuple[Json, list[Json]]],
+    borrow: Callable[[Json, Json], Json],
+) -> None:
+    member = make_member()
+    book, copies = make_book()
+    borrow(member, copies[0])
+    empty, _ = make_book(copies=0)
+    for book_id, detail in [
+        (book["id"], "No available copy for this book (all copies are on loan)"),
+        (empty["id"], "Book has no copies"),
+    ]:
+        response = client.post("/loans/by-book", json={"member_id": member["id"], "book_id": book_id, "due_at": due_at()})
+        assert response.status_code == 400
+        assert response.json() == {"detail": detail}
+
+
+def test_retries_lost_races_within_budget(
+    client: TestClient,
+    monkeypatch: pytest.MonkeyPatch,
+    make_member: Callable[[], Json],
+    make_book: Callable[..., tuple[Json, list[Json]]],
+    borrow: Callable[[Json, Json], Json],
+) -> None:
+    member = make_member()
+    book, copies = make_book(copies=2)
+    borrow(member, copies[0])
+    lose_races(monkeypatch, copies[0], times=ALLOCATION_ATTEMPTS - 1)
+    response = client.post("/loans/by-book", json={"member_id": member["id"], "book_id": book["id"], "due_at": due_at()})
+    assert response.status_code == 201, response.text
+    assert response.json()["copy_id"] == copies[1]["id"]
+
+
+def test_losing_every_race_is_400_within_budget(
+    client: TestClient,
+    monkeypatch: pytest.MonkeyPatch,
+    make_member: Callable[[], Json],
+    make_book: Callable[..., tuple[Json, list[Json]]],
+    borrow: Callable[[Json, Json], Json],
+) -> None:
+    member = make_member()
+    book, copies = make_book(copies=2)
+    borrow(member, copies[0])
+    lose_races(monkeypatch, copies[0], times=ALLOCATION_ATTEMPTS)
+    response = client.post("/loans/by-book", json={"member_id": member["id"], "book_id": book["id"], "due_at": due_at()})
+    assert response.status_code == 400
+    assert response.json() == {"detail": "No available copy for this book (all copies are on loan)"}
@@ -0,0 +1,91 @@
+"""Catalog cache - reads after writes are fresh, invalidation is targeted, other workers hear it."""
+
+import time
+from collections.abc import Callable, Iterator
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from helpers import Json
+
+from app.db.session import SessionLocal, engine
+from app.services.catalog_cache import CatalogCache
+
+
+@pytest.fixture
+def cache() -> Iterator[CatalogCache]:
+    cache = CatalogCache(max_entries=16, ttl=60)
+    yield cache
+    cache.stop_listener()
+
+
+def cached(cache: CatalogCache, key: tuple[object, ...]) -> bool:
+    """Whether `key` is served from the cache (a loader call means it was not)."""
+    return cache.get_or_load(key, lambda: "reloaded", store=False) != "reloaded"
+
+
+def test_reads_after_writes_are_fresh(
+    client: TestClient,
+    make_member: Callable[[], Json],
+    make_book: Callable[..., tuple[Json, list[Json]]],
+    borrow: Callable[[Json, Json], Json],
+) -> None:
+    book, copies = make_book()
+    path = f"/books/{book['id']}"
+    assert client.get(path).json()["copies_available"] == 1
+    assert len(client.get(f"{path}/copies").json()) == 1
+
+    client.put(path, json={"title": "Renamed"})
+    assert client.get(path).json()["title"] == "Renamed"
+
+    borrow(make_member(), copies[0])
+    assert client.get(path).json()["copies_available"] == 0
+
+    client.post(f"{path}/copies", json={"copy_code": uuid4().hex})
+    assert len(client.get(f"{path}/copies").json()) == 2
+    assert client.get(path).json()["copies_available"] == 1
+
+
+def test_invalidate_drops_only_the_changed_books(cache: CatalogCache) -> None:
+    changed, other = uuid4(), uuid4()
+    keys = [("book", changed), ("copies", changed), ("book", other), ("copies", other), ("books", 20, None, False)]
+    for key in keys:
+        cache.get_or_load(key, lambda: "loaded")
+
+    cache.invalidate(copy_book_ids=[changed])
+
+    assert [cached(cache, key) for key in keys] == [False, False, True, True, False]
+
+
+def test_a_load_overtaken_by_an_invalidation_is_not_stored(cache: CatalogCache) -> None:
+    book_id = uuid4()
+
+    def load() -> str:
+        cache.invalidate(book_ids=[book_id])
+        return "stale"
+
+    assert cache.get_or_load(("book", book_id), load) == "stale"
+    assert not cached(cache, ("book", book_id))
+
+
+@pytest.mark.usefixtures("database")
+def test_other_workers_drop_keys_a_commit_notifies(cache: CatalogCache) -> None:
+    changed, other = uuid4(), uuid4()
+    cache.start_listener(engine)
+
+    def notify(book_id: UUID) -> None:
+        with SessionLocal() as db:
+            cache.mark_changed(db, book_ids=[book_id])
+            db.commit()
+
+    # The listener clears everything when it connects, so only trust a drop that spared `other`
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        cache.get_or_load(("book", changed), lambda: "loaded")
+        cache.get_or_load(("book", other), lambda: "loaded")
+        notify(changed)
+        time.sleep(0.2)
+        if not cached(cache, ("book", changed)) and cached(cache, ("book", other)):
+            return
+        cache.clear()
+    pytest.fail("the listener never applied the notification")
@@ -0,0 +1,75 @@
+"""Conditional GETs - unchanged lists are a 304, writes they show change their ETag."""
+
+from collections.abc import Callable
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from helpers import Json
+from sqlalchemy import text
+
+from app.db.session import engine
+
+
+def etag(client: TestClient, path: str) -> str:
+    response = client.get(path)
+    assert response.status_code == 200, response.text
+    return response.headers["ETag"]
+
+
+def changed(client: TestClient, path: str, tag: str) -> bool:
+    return client.get(path, headers={"If-None-Match": tag}).status_code == 200
+
+
+@pytest.mark.parametrize("path", ["/books", "/members", "/loans"])
+def test_unchanged_list_is_304(client: TestClient, path: str, make_member: Callable[[], Json]) -> None:
+    make_member()
+    tag = etag(client, path)
+    response = client.get(path, headers={"If-None-Match": tag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == tag
+    assert response.content == b""
+
+
+def test_borrow_changes_loans_and_books_etags(
+    client: TestClient,
+    make_member: Callable[[], Json],
+    make_book: Callable[..., tuple[Json, list[Json]]],
+    borrow: Callable[[Json, Json], Json],
+) -> None:
+    member = make_member()
+    _, copies = make_book()
+    tags = {path: etag(client, path) for path in ["/loans", "/books"]}
+    borrow(member, copies[0])
+    assert all(changed(client, path, tag) for path, tag in tags.items())
+
+
+def test_member_rename_changes_loans_and_members_etags(
+    client: TestClient,
+    make_member: Callable[[], Json],
+    make_book: Callable[..., tuple[Json, list[Json]]],
+    borrow: Callable[[Json, Json], Json],
+) -> None:
+    member = make_member()
+    _, copies = make_book()
+    borrow(member, copies[0])
+    tags = {path: etag(client, path) for path in ["/loans", "/members"]}
+    response = client.put(f"/members/{member['id']}", json={"name": f"Renamed {uuid4().hex[:8]}"})
+    assert response.status_code == 200, response.text
+    assert all(changed(client, path, tag) for path, tag in tags.items())
+
+
+def test_commit_with_an_older_updated_at_changes_the_etag(client: TestClient, make_member: Callable[[], Json]) -> None:
+    """A transaction that started first but commits last writes an updated_at below the
+    list's newest one, with the row count unchanged; the ETag must still move."""
+    slow, fast = make_member(), make_member()
+    with engine.connect() as conn:
+        conn.execute(text("SELECT now()"))  # fixes this transaction's now() before `fast` is written
+        client.put(f"/members/{fast['id']}", json={"name": f"Fast {uuid4().hex[:8]}"})
+        tag = etag(client, "/members")
+        conn.execute(
+            text("UPDATE members SET name = :name, updated_at = now() WHERE id = :id"),
+            {"name": f"Slow {uuid4().hex[:8]}", "id": slow["id"]},
+        )
+        conn.commit()
+    assert changed(client, "/members", tag)
@@ -0,0 +1,51 @@
+"""Streaming exports - rows as NDJSON or CSV, time-range filters, inverted ranges are a 400."""
+
+import csv
+import io
+import json
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from helpers import Json
+
+
+def test_ndjson_export_has_every_loan(
+    client: TestClient,
+    make_member: Callable[[], Json],
+    make_book: Callable[..., tuple[Json, list[Json]]],
+    borrow: Callable[[Json, Json], Json],
+) -> None:
+    member = make_member()
+    book, copies = make_book()
+    loan = borrow(member, copies[0])
+    response = client.get("/exports/loans.ndjson")
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == 'attachment; filename="loans.ndjson"'
+    rows = {row["id"]: row for row in map(json.loads, response.text.splitlines())}
+    assert rows[loan["id"]]["member_name"] == member["name"]
+    assert rows[loan["id"]]["book_title"] == book["title"]
+
+
+def test_csv_export_has_a_header_and_the_member(client: TestClient, make_member: Callable[[], Json]) -> None:
+    member = make_member()
+    response = client.get("/exports/members.csv")
+    assert response.status_code == 200
+    rows = {row["id"]: row for row in csv.DictReader(io.StringIO(response.text))}
+    assert rows[member["id"]]["name"] == member["name"]
+
+
+def test_since_filters_out_older_rows(client: TestClient, make_book: Callable[..., tuple[Json, list[Json]]]) -> None:
+    book, _ = make_book()
+    later = (datetime.now(timezone.utc) + timedelta(minutes=1)).isoformat()
+    response = client.get("/exports/books.ndjson", params={"since": later})
+    assert response.status_code == 200
+    assert book["id"] not in {row["id"] for row in map(json.loads, response.text.splitlines())}
+
+
+@pytest.mark.parametrize("path", ["/exports/loans.ndjson", "/exports/books.csv", "/exports/members.ndjson"])
+def test_since_after_until_is_400(client: TestClient, path: str) -> None:
+    response = client.get(path, params={"since": "2024-02-01T00:00:00Z", "until": "2024-01-01T00:00:00Z"})
+    assert response.status_code == 400
+    assert response.json() == {"detail": "since must not be after until"}
@@ -0,0 +1,105 @@
+"""Idempotency-Key on loan writes - retries replay the first response, a reused key is a 422,
+a key still in progress is a 409 until its lease runs out."""
+
+from collections.abc import Callable
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from helpers import Json, due_at
+from sqlalchemy import text
+
+from app.api.idempotency import IDEMPOTENCY_HEADER, REPLAYED_HEADER
+from app.db.session import engine
+
+
+def test_retry_replays_the_first_response(
+    client: TestClient,
+    make_member: Callable[[], Json],
+    make_book: Callable[..., tuple[Json, list[Json]]],
+) -> None:
+    member = make_member()
+    book, _ = make_book(copies=2)
+    body = {"member_id": member["id"], "book_id": book["id"], "due_at": due_at()}
+    headers = {IDEMPOTENCY_HEADER: uuid4().hex}
+
+    first = client.post("/loans/by-book", json=body, headers=headers)
+    retry = client.post("/loans/by-book", json=body, headers=headers)
+
+    assert first.status_code == retry.status_code == 201
+    assert REPLAYED_HEADER not in first.headers
+    assert retry.headers[REPLAYED_HEADER] == "true"
+    assert retry.json() == first.json()
+    loans = client.get("/loans", params={"member_id": member["id"]}).json()
+    assert [loan["id"] for loan in loans] == [first.json()["id"]]
+
+
+def test_client_errors_are_replayed(client: TestClient, make_member: Callable[[], Json]) -> None:
+    body = {"member_id": make_member()["id"], "copy_id": str(uuid4()), "due_at": due_at()}
+    headers = {IDEMPOTENCY_HEADER: uuid4().hex}
+
+    first = client.post("/loans", json=body, headers=headers)
+    retry = client.post("/loans", json=body, headers=headers)
+
+    assert first.status_code == retry.status_code == 404
+    assert retry.headers[REPLAYED_HEADER] == "true"
+    assert retry.json() == first.json()
+
+
+def test_key_reused_for_another_request_is_422(
+    client: TestClient,
+    make_member: Callable[[], Json],
+    make_book: Callable[..., tuple[Json, list[Json]]],
+) -> None:
+    member = make_member()
+    _, copies = make_book(copies=2)
+    headers = {IDEMPOTENCY_HEADER: uuid4().hex}
+
+    first = client.post(
+        "/loans", json={"member_id": member["id"], "copy_id": copies[0]["id"], "due_at": due_at()}, headers=headers
+    )
+    other = client.post(
+        "/loans", json={"member_id": member["id"], "copy_id": copies[1]["id"], "due_at": due_at()}, headers=headers
+    )
+
+    assert first.status_code == 201
+    assert other.status_code == 422
+    assert other.json() == {"detail": "Idempotency-Key was already used for a different request"}
+
+
+def make_pending(key: str, lease_seconds: int) -> None:
+    """Turn the stored outcome of `key` back into a claim whose request is still running."""
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "UPDATE idempotency_keys SET status_code = NULL, body = NULL, "
+                "locked_until = now() + make_interval(secs => :lease) WHERE key = :key"
+            ),
+            {"key": key, "lease": lease_seconds},
+        )
+
+
+@pytest.mark.parametrize(("lease_seconds", "status_code"), [(60, 409), (-1, 201)], ids=["live", "lapsed"])
+def test_retry_of_a_pending_claim(
+    client: TestClient,
+    monkeypatch: pytest.MonkeyPatch,
+    make_member: Callable[[], Json],
+    make_book: Callable[..., tuple[Json, list[Json]]],
+    lease_seconds: int,
+    status_code: int,
+) -> None:
+    """While the lease is live a retry waits, then gives up with a 409; once it has lapsed
+    (the first request died) the retry claims the key and runs the request itself."""
+    monkeypatch.setenv("IDEMPOTENCY_WAIT", "0.2")
+    book, _ = make_book(copies=2)
+    body = {"member_id": make_member()["id"], "book_id": book["id"], "due_at": due_at()}
+    headers = {IDEMPOTENCY_HEADER: uuid4().hex}
+    assert client.post("/loans/by-book", json=body, headers=headers).status_code == 201
+    make_pending(headers[IDEMPOTENCY_HEADER], lease_seconds)
+
+    retry = client.post("/loans/by-book", json=body, headers=headers)
+
+    assert retry.status_code == status_code, retry.text
+    assert REPLAYED_HEADER not in retry.headers
+    if status_code == 409:
+        assert retry.json() == {"detail": "A request with this Idempotency-Key is still in progress"}
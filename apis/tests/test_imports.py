@@ -0,0 +1,90 @@
+"""Bulk imports - upserts report created/updated/unchanged per row, bad rows fail alone."""
+
+import json
+from collections.abc import Callable, Collection
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from helpers import Json
+from sqlalchemy.orm import Session
+
+from app.repositories import BookCopyRepository
+
+NDJSON = {"Content-Type": "application/x-ndjson"}
+
+
+def isbn() -> str:
+    return uuid4().hex[:13]
+
+
+def statuses(response: Json) -> list[str]:
+    return [row["status"] for row in response["rows"]]
+
+
+def test_book_import_upserts_on_isbn(client: TestClient) -> None:
+    book = {"title": "Imported", "author": "Author", "isbn": isbn()}
+    first = client.post("/imports/books", json=[book, {"title": "No isbn", "author": "Author"}])
+    assert first.status_code == 200, first.text
+    assert statuses(first.json()) == ["created", "created"]
+
+    again = client.post("/imports/books", json=[book, {**book, "isbn": isbn(), "title": ""}])
+    assert statuses(again.json()) == ["unchanged", "error"]
+    assert again.json()["rows"][0]["id"] == first.json()["rows"][0]["id"]
+
+    renamed = client.post("/imports/books", json=[{**book, "title": "Renamed"}]).json()
+    assert statuses(renamed) == ["updated"]
+    assert client.get(f"/books/{renamed['rows'][0]['id']}").json()["title"] == "Renamed"
+
+
+def test_member_csv_import_rejects_repeated_emails(client: TestClient) -> None:
+    email = f"{uuid4().hex[:8]}@example.com"
+    body = f"name,email,phone\nAda,{email},\nAda again,{email},\n"
+    response = client.post("/imports/members", content=body, headers={"Content-Type": "text/csv"})
+    assert response.status_code == 200, response.text
+    assert statuses(response.json()) == ["created", "error"]
+    assert response.json()["rows"][1]["error"] == "Duplicate email (same as row 0)"
+
+
+def test_copy_import_moves_a_code_between_books(
+    client: TestClient, make_book: Callable[..., tuple[Json, list[Json]]]
+) -> None:
+    old, copies = make_book()
+    new, _ = make_book(copies=0)
+    code = copies[0]["copy_code"]
+    client.get(f"/books/{old['id']}/copies")  # cached on the sync stack; the move must drop it
+
+    rows = [{"copy_code": code, "book_id": new["id"]}, {"copy_code": uuid4().hex, "book_id": str(uuid4())}]
+    response = client.post("/imports/copies", content="\n".join(map(json.dumps, rows)), headers=NDJSON)
+    assert response.status_code == 200, response.text
+    assert statuses(response.json()) == ["updated", "error"]
+    assert response.json()["rows"][1]["error"] == "Book not found"
+    assert client.get(f"/books/{old['id']}/copies").json() == []
+    assert [c["copy_code"] for c in client.get(f"/books/{new['id']}/copies").json()] == [code]
+
+
+def test_copy_added_by_another_import_meanwhile_is_unchanged(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch, make_book: Callable[..., tuple[Json, list[Json]]]
+) -> None:
+    """The copy exists, but the import's first look-up missed it (as if another import had
+    inserted it just after): it is reported unchanged with its id, not a 500."""
+    book, copies = make_book()
+    by_copy_code = BookCopyRepository.by_copy_code
+    calls = 0
+
+    def first_misses(self: BookCopyRepository, db: Session, codes: Collection[str]) -> dict[str, tuple[UUID, UUID]]:
+        nonlocal calls
+        calls += 1
+        return {} if calls == 1 else by_copy_code(self, db, codes)
+
+    monkeypatch.setattr(BookCopyRepository, "by_copy_code", first_misses)
+    row = {"copy_code": copies[0]["copy_code"], "book_id": book["id"]}
+    response = client.post("/imports/copies", json=[row])
+    assert response.status_code == 200, response.text
+    assert response.json()["rows"] == [{"row": 0, "status": "unchanged", "id": copies[0]["id"], "error": None}]
+
+
+@pytest.mark.parametrize(("content_type", "status_code"), [("application/x-ndjson", 400), ("application/xml", 415)])
+def test_unreadable_bodies_are_rejected(client: TestClient, content_type: str, status_code: int) -> None:
+    response = client.post("/imports/books", content="{not json", headers={"Content-Type": content_type})
+    assert response.status_code == status_code
@@ -0,0 +1,58 @@
+"""Member summary - loan counts and the newest active loans in one query."""
+
+from collections.abc import Callable
+from datetime import datetime
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+from helpers import Json, make_overdue
+
+from app.schemas.member import MAX_SUMMARY_LOANS
+
+
+def test_summary_counts_and_newest_active_loans(
+    client: TestClient,
+    make_member: Callable[[], Json],
+    make_book: Callable[..., tuple[Json, list[Json]]],
+    borrow: Callable[[Json, Json], Json],
+) -> None:
+    member = make_member()
+    book, copies = make_book(copies=4)
+    overdue, returned, older, newest = (borrow(member, copy) for copy in copies)
+    make_overdue(overdue, 3)
+    assert client.post(f"/loans/{returned['id']}/return").status_code == 200
+
+    response = client.get(f"/members/{member['id']}/summary", params={"recent": 2})
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert (body["lifetime_loans"], body["active_loans"], body["overdue_loans"]) == (4, 3, 1)
+    assert datetime.fromisoformat(body["next_due_at"]) < datetime.fromisoformat(older["due_at"])
+    assert [loan["id"] for loan in body["recent_active_loans"]] == [newest["id"], older["id"]]
+    assert body["recent_active_loans"][0]["book_title"] == book["title"]
+
+
+def test_summary_of_a_member_without_loans(client: TestClient, make_member: Callable[[], Json]) -> None:
+    member = make_member()
+    body = client.get(f"/members/{member['id']}/summary").json()
+    assert body == {
+        "member_id": member["id"],
+        "active_loans": 0,
+        "overdue_loans": 0,
+        "lifetime_loans": 0,
+        "next_due_at": None,
+        "recent_active_loans": [],
+    }
+
+
+def test_summary_of_an_unknown_member_is_404(client: TestClient) -> None:
+    response = client.get(f"/members/{uuid4()}/summary")
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Member not found"}
+
+
+def test_summary_recent_is_capped(client: TestClient, make_member: Callable[[], Json]) -> None:
+    member = make_member()
+    path = f"/members/{member['id']}/summary"
+    assert client.get(path, params={"recent": MAX_SUMMARY_LOANS}).status_code == 200
+    assert client.get(path, params={"recent": MAX_SUMMARY_LOANS + 1}).status_code == 422
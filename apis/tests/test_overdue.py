@@ -0,0 +1,61 @@
+"""Overdue loans - the list puts the longest overdue first, the sweep queues one notice per loan."""
+
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from helpers import Json, make_overdue, walk
+from sqlalchemy import func, select
+
+from app.db.session import SessionLocal
+from app.models import OverdueNotice
+from app.services.overdue_service import OverdueService
+
+
+@pytest.fixture
+def overdue_loans(
+    client: TestClient,
+    make_member: Callable[[], Json],
+    make_book: Callable[..., tuple[Json, list[Json]]],
+    borrow: Callable[[Json, Json], Json],
+) -> list[Json]:
+    """Three loans long overdue, most overdue first, plus one returned and one not yet due."""
+    member = make_member()
+    _, copies = make_book(copies=5)
+    loans = [borrow(member, copy) for copy in copies]
+    for loan, days in zip(loans, [3000, 2000, 1000, 2500]):
+        make_overdue(loan, days)
+    assert client.post(f"/loans/{loans[3]['id']}/return").status_code == 200
+    return loans[:3]
+
+
+def notices(loan_ids: list[str]) -> dict[str, int]:
+    with SessionLocal() as db:
+        rows = db.execute(
+            select(OverdueNotice.loan_id, func.count())
+            .where(OverdueNotice.loan_id.in_(loan_ids))
+            .group_by(OverdueNotice.loan_id)
+        ).all()
+    return {str(loan_id): n for loan_id, n in rows}
+
+
+def test_overdue_list_is_longest_overdue_first(client: TestClient, overdue_loans: list[Json]) -> None:
+    listed = [loan["id"] for loan in walk(client, "/loans/overdue", limit=2)]
+    ours = [loan["id"] for loan in overdue_loans]
+    assert [id for id in listed if id in ours] == ours
+
+
+def test_sweep_queues_each_overdue_loan_once(overdue_loans: list[Json]) -> None:
+    ids = [loan["id"] for loan in overdue_loans]
+    as_of = datetime.now(timezone.utc) - timedelta(days=500)
+    with SessionLocal() as db:
+        chunks = list(OverdueService(db).sweep(as_of=as_of, chunk_size=2))
+        assert all(scanned <= 2 for scanned, _ in chunks)
+        assert notices(ids) == {id: 1 for id in ids}
+
+        # A re-run finds the same loans and queues nothing new
+        again = list(OverdueService(db).sweep(as_of=as_of, chunk_size=2))
+    assert sum(scanned for scanned, _ in again) == sum(scanned for scanned, _ in chunks)
+    assert sum(queued for _, queued in again) == 0
+    assert notices(ids) == {id: 1 for id in ids}
@@ -0,0 +1,55 @@
+"""Keyset pagination - cursors round-trip, pages cover every row once, bad cursors are a 400."""
+
+from collections.abc import Callable
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from helpers import Json, walk
+
+from app.repositories.pagination import InvalidCursorError, decode_cursor, encode_cursor, parse_datetime, parse_uuid
+
+
+def test_cursor_round_trip() -> None:
+    at, id = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc), uuid4()
+    borrowed_at, loan_id = decode_cursor(encode_cursor(at, id), 2)
+    assert (parse_datetime(borrowed_at), parse_uuid(loan_id)) == (at, id)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not a cursor!",
+        encode_cursor("only-one-value"),
+        encode_cursor("2024-05-01T00:00:00", "x", "y"),
+    ],
+)
+def test_decode_rejects_malformed_cursors(cursor: str) -> None:
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, 2)
+
+
+@pytest.mark.parametrize("path", ["/books", "/members", "/loans"])
+def test_pages_cover_the_full_list(
+    client: TestClient,
+    path: str,
+    make_member: Callable[[], Json],
+    make_book: Callable[..., tuple[Json, list[Json]]],
+    borrow: Callable[[Json, Json], Json],
+) -> None:
+    member = make_member()
+    for _ in range(3):
+        _, copies = make_book()
+        borrow(member, copies[0])
+    full = client.get(path)
+    assert full.status_code == 200
+    assert [row["id"] for row in walk(client, path, limit=2)] == [row["id"] for row in full.json()]
+
+
+@pytest.mark.parametrize("path", ["/books", "/members", "/loans", "/loans/overdue"])
+@pytest.mark.parametrize("cursor", ["garbage", encode_cursor("not-a-date", "not-a-uuid")])
+def test_invalid_cursor_is_400(client: TestClient, path: str, cursor: str) -> None:
+    response = client.get(path, params={"limit": 2, "cursor": cursor})
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid cursor"}
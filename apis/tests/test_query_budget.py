@@ -0,0 +1,59 @@
+"""Query budgets - loan writes stay within the statement counts their routes declare."""
+
+from collections.abc import Callable
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from helpers import Json, due_at
+
+from app.db.config import get_trace_settings
+from app.db.query_trace import QueryBudgetExceeded, set_query_budget, trace_queries
+from app.db.session import SessionLocal
+from app.services import LoanService
+from app.services.catalog_cache import catalog_cache
+
+
+def test_batch_return_with_unknown_ids_is_within_budget(
+    client: TestClient,
+    make_member: Callable[[], Json],
+    make_book: Callable[..., tuple[Json, list[Json]]],
+    borrow: Callable[[Json, Json], Json],
+) -> None:
+    member = make_member()
+    _, copies = make_book(copies=2)
+    loans = [borrow(member, copy) for copy in copies]
+    unknown = str(uuid4())
+
+    # Worst case: the UPDATE, the returned copies' books, the cache notification and the unknown-id lookup
+    response = client.post("/loans/batch-return", json={"loan_ids": [loan["id"] for loan in loans] + [unknown]})
+
+    assert response.status_code == 200, response.text
+    assert response.json()["succeeded"] == 2
+    assert response.json()["failed"] == 1
+
+
+def test_batch_checkout_with_unknown_copies_is_within_budget(
+    client: TestClient,
+    make_member: Callable[[], Json],
+    make_book: Callable[..., tuple[Json, list[Json]]],
+) -> None:
+    member = make_member()
+    _, first = make_book()
+    _, second = make_book()
+    copy_ids = [first[0]["id"], second[0]["id"], str(uuid4())]
+
+    response = client.post("/loans/batch", json={"member_id": member["id"], "copy_ids": copy_ids, "due_at": due_at()})
+
+    assert response.status_code == 200, response.text
+    assert response.json()["succeeded"] == 2
+
+
+@pytest.mark.usefixtures("database")
+def test_budget_overrun_is_not_reported_as_a_service_error() -> None:
+    """Services turn failures into (None, message), which routes answer with a 400; an
+    exceeded budget must instead reach the handler that answers 500."""
+    with SessionLocal() as db, trace_queries("test", get_trace_settings()):
+        set_query_budget(0)
+        with pytest.raises(QueryBudgetExceeded):
+            LoanService(db, cache=catalog_cache).return_many([uuid4()])
@@ -0,0 +1,42 @@
+"""Catalog search - full-text first, trigram fallback, pages that keep every tied score."""
+
+import random
+import string
+
+import pytest
+from fastapi.testclient import TestClient
+from helpers import walk
+
+
+def word() -> str:
+    return "".join(random.choices(string.ascii_lowercase, k=12))
+
+
+@pytest.fixture
+def tied_books(client: TestClient) -> tuple[str, list[str]]:
+    """Five books with the same title, so any query ranks them all with one score; returns (title, ids)."""
+    title = f"{word()} {word()}"
+    ids = []
+    for _ in range(5):
+        response = client.post("/books", json={"title": title, "author": "Tied Author"})
+        assert response.status_code == 201, response.text
+        ids.append(response.json()["id"])
+    return title, ids
+
+
+@pytest.mark.parametrize("typo", [False, True], ids=["fts", "fuzzy"])
+def test_pages_keep_every_tied_score(client: TestClient, tied_books: tuple[str, list[str]], typo: bool) -> None:
+    title, ids = tied_books
+    # Changing one letter of the first word leaves no full-text match, so search falls back to trigrams
+    q = ("x" if title[0] != "x" else "y") + title[1:] if typo else title
+    full = client.get("/books/search", params={"q": q, "limit": 100}).json()
+    assert sorted(hit["id"] for hit in full) == sorted(ids)
+    assert len({hit["score"] for hit in full}) == 1
+
+    paged = walk(client, "/books/search", limit=2, q=q)
+    assert [hit["id"] for hit in paged] == [hit["id"] for hit in full]
+
+
+def test_invalid_cursor_is_400(client: TestClient) -> None:
+    response = client.get("/books/search", params={"q": "anything", "cursor": "garbage"})
+    assert response.status_code == 400
@@ -0,0 +1,70 @@
+"""Circulation stats - read from materialized views, current as of the last refresh."""
+
+from collections.abc import Callable
+from datetime import date, datetime, timedelta
+from itertools import count
+
+import pytest
+import refresh_stats
+from fastapi.testclient import TestClient
+from helpers import Json, backdate_return
+
+from app.schemas.stats import MAX_STATS_ROWS
+
+# Each run borrows in its own month, 150 days back and then 40 more per run, clear of
+# the months the other test modules backdate loans into
+DAYS_AGO = count(150, 40)
+
+
+def row(client: TestClient, path: str, key: str, id: str) -> Json | None:
+    response = client.get(path, params={"limit": MAX_STATS_ROWS})
+    assert response.status_code == 200, response.text
+    return next((r for r in response.json() if r[key] == id), None)
+
+
+def test_stats_follow_a_refresh(
+    client: TestClient,
+    make_member: Callable[[], Json],
+    make_book: Callable[..., tuple[Json, list[Json]]],
+    borrow: Callable[[Json, Json], Json],
+) -> None:
+    member = make_member()
+    book, copies = make_book(copies=3)
+    loans = [borrow(member, copy) for copy in copies]
+    days = next(DAYS_AGO)
+    for loan in loans[:2]:
+        backdate_return(loan, days)
+    assert row(client, "/stats/top-books", "book_id", book["id"]) is None
+
+    refresh_stats.main()
+
+    assert row(client, "/stats/top-books", "book_id", book["id"]) == {
+        "book_id": book["id"],
+        "title": book["title"],
+        "author": book["author"],
+        "loans": 3,
+        "last_borrowed_at": loans[2]["borrowed_at"],
+    }
+    assert row(client, "/stats/top-members", "member_id", member["id"]) == {
+        "member_id": member["id"],
+        "name": member["name"],
+        "loans": 3,
+        "active_loans": 1,
+        "last_borrowed_at": loans[2]["borrowed_at"],
+    }
+
+    borrowed = datetime.fromisoformat(client.get(f"/loans/{loans[0]['id']}").json()["borrowed_at"])
+    month = borrowed.date().replace(day=1)
+    months = {"since": month.isoformat(), "until": (month + timedelta(days=31)).isoformat()}
+    per_month = client.get("/stats/loans-per-month", params=months)
+    assert per_month.json() == [{"month": month.isoformat(), "loans": 2, "returned": 2, "average_days": 7.0}]
+    duration = client.get("/stats/loan-duration", params=months)
+    assert duration.json() == {"returned": 2, "average_days": 7.0}
+
+
+@pytest.mark.parametrize("path", ["/stats/loans-per-month", "/stats/loan-duration"])
+def test_since_after_until_is_400(client: TestClient, path: str) -> None:
+    today = date.today()
+    response = client.get(path, params={"since": today.isoformat(), "until": (today - timedelta(days=40)).isoformat()})
+    assert response.status_code == 400
+    assert response.json() == {"detail": "since must not be after until"}